@@ -0,0 +1,44 @@
+"""헤드리스 엔진 import 시간 벤치마크.
+
+새 인터프리터에서 모듈을 import 하는 데 걸린 시간을 재고,
+pandas/plotly/streamlit 이 함께 올라왔는지 확인합니다. eyekit 은 표/차트를
+실제로 만들 때만 pandas/plotly 를 불러오므로 헤드리스 경로에는 없어야 합니다.
+
+    python benchmarks/import_time.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = ["eyekit", "eyekit.cli", "views"]
+HEAVY = ["pandas", "plotly", "streamlit"]
+
+
+def import_once(module):
+    """(import 시간 ms, 함께 올라온 무거운 모듈 목록)."""
+    probe = (f"import sys, time; t = time.perf_counter(); import {module}; "
+             f"print((time.perf_counter() - t) * 1000); "
+             f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    ms, loaded = proc.stdout.splitlines()
+    return float(ms), [m for m in loaded.split(",") if m]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'모듈':<16}{'import (중앙값)':>16}  함께 로드된 의존성")
+    for module in TARGETS:
+        runs = [import_once(module) for _ in range(args.repeat)]
+        ms = statistics.median(r[0] for r in runs)
+        print(f"{module:<16}{ms:>14.1f}ms  {', '.join(runs[0][1]) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
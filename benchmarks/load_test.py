@@ -0,0 +1,161 @@
+"""로컬 채점 서비스 부하 테스트.
+
+동시 연결 수(concurrency)별로 keep-alive 연결마다 요청을 쉬지 않고 보내
+지연 p50/p99 와 초당 요청 수를 잽니다. --url 을 주지 않으면 배치 창
+(--windows) 마다 서비스를 하위 프로세스로 띄워 비교합니다 (0 = 같은 이벤트 루프
+차례에 도착한 요청만 묶음).
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --concurrency 1,16,64,256 --windows 0,2,5 --duration 5
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --endpoint validate
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_CONCURRENCY = [1, 8, 32, 128]
+DEFAULT_WINDOWS = [0.0, 2.0]
+DEFAULT_DURATION = 3.0  # 초
+
+PAYLOADS = {
+    "negotiate": {
+        "market_avg_price": 0.50, "offer_price": 0.58, "supplier_avg_margin": 5,
+        "market_trend": "▼ 하락 (Drop)", "forecast_trend": "↗️ 상승 (Rise)",
+        "risk_factors": [], "opp_factors": ["환율 호재"],
+    },
+    "validate": {
+        "volume_trend": "↗️ 성장세 (Growth)", "destinations": ["High-Standard (미국/유럽/일본)"],
+        "buyer_tier": "Global Tier 1 (대기업)", "export_history": "✅ 최근 1년 내 있음",
+        "dependency": "🟢 낮음 (분산됨)",
+    },
+}
+
+
+def _request(host, path, body=b"", method="POST"):
+    return (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+
+async def _read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _worker(host, port, request, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            status, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, path, payload, concurrency, duration):
+    """동시 연결 concurrency 개로 duration 초 동안 부하를 주고 지표 dict 를 반환합니다."""
+    request = _request(host, path, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(_worker(host, port, request, deadline, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": len(ms),
+        "rps": len(ms) / elapsed,
+        "p50_ms": statistics.median(ms),
+        "p99_ms": ms[min(len(ms) - 1, int(len(ms) * 0.99))],
+        "errors": len(errors),
+    }
+
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_request(host, "/stats", method="GET"))
+    _, body = await _read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_service(window_ms):
+    """서비스를 하위 프로세스로 띄우고 포트가 연결을 받을 때까지 기다립니다."""
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "eyekit", "serve", "--port", str(port),
+                             "--window-ms", str(window_ms)], cwd=ROOT, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return proc, port
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("채점 서비스가 시작되지 않았습니다")
+
+
+def report(label, host, port, path, payload, levels, duration):
+    print(f"\n[{label}] {path}")
+    print(f"{'동시성':>6}{'요청 수':>10}{'req/s':>10}{'p50':>10}{'p99':>10}{'오류':>6}")
+    for concurrency in levels:
+        r = asyncio.run(run_level(host, port, path, payload, concurrency, duration))
+        print(f"{r['concurrency']:>6}{r['requests']:>10,}{r['rps']:>10,.0f}"
+              f"{r['p50_ms']:>8.2f}ms{r['p99_ms']:>8.2f}ms{r['errors']:>6}")
+    stats = asyncio.run(fetch_stats(host, port))[path]
+    print(f"배치 {stats['batches']:,}회 · 평균 {stats['mean_batch']:.1f}건 · 최대 {stats['largest']:,}건")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="이미 떠 있는 서비스 주소 (생략 시 --windows 별로 직접 띄움)")
+    parser.add_argument("--endpoint", choices=sorted(PAYLOADS), default="negotiate")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)))
+    parser.add_argument("--windows", default=",".join(f"{w:g}" for w in DEFAULT_WINDOWS), help="배치 창 ms 목록")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="동시성 단계당 시간 (초)")
+    args = parser.parse_args(argv)
+
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+    path, payload = f"/{args.endpoint}", PAYLOADS[args.endpoint]
+    if args.url:
+        url = urlsplit(args.url)
+        report(args.url, url.hostname, url.port or 80, path, payload, levels, args.duration)
+        return 0
+    for window in (float(w) for w in args.windows.split(",") if w):
+        proc, port = start_service(window)
+        try:
+            report(f"배치 창 {window:g}ms", "127.0.0.1", port, path, payload, levels, args.duration)
+        finally:
+            proc.terminate()
+            proc.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
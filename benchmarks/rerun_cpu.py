@@ -0,0 +1,90 @@
+"""상호작용당 서버 CPU 시간 벤치마크 (Tool 1 단건 분석 화면).
+
+폼/fragment 도입 전에는 위젯을 하나 바꿀 때마다 app.py 전체가 다시 실행됐습니다.
+지금은 폼 안의 입력 변경은 서버 재실행이 없고, 결과 섹션은 fragment 단위로만
+다시 실행됩니다. 이 스크립트는 두 비용을 나란히 잽니다.
+
+- 전체 재실행: Streamlit AppTest 로 결과가 표시된 상태의 app.py 를 다시 실행
+- fragment 재실행: views 의 결과 섹션 함수 본문을 같은 입력으로 직접 실행 (bare mode)
+
+    python benchmarks/rerun_cpu.py --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_OFFER = dict(
+    market_avg_price=0.50, offer_price=0.58, supplier_avg_margin=5,
+    market_trend="▼ 하락 (Drop)", forecast_trend="↗️ 상승 (Rise)",
+    risk_factors=[], opp_factors=["환율 호재"],
+)
+
+
+def cpu_ms(fn, repeat):
+    """fn 을 repeat 번 실행한 CPU 시간(ms)의 중앙값."""
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        samples.append((time.process_time() - start) * 1000)
+    return statistics.median(samples)
+
+
+def full_rerun_ms(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+    at.session_state["tool1_committed"] = {"offer": SAMPLE_OFFER, "forecast_price": 0.55, "target_date": ""}
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return cpu_ms(at.run, repeat)
+
+
+def _body(fragment):
+    """st.fragment 는 스크립트 실행 컨텍스트 밖에서는 본문을 건너뛰므로 원래 함수를 꺼냅니다."""
+    return getattr(fragment, "__wrapped__", fragment)
+
+
+def fragment_ms(repeat):
+    import views
+
+    o = SAMPLE_OFFER
+    result = views.analyze_offer(**o)
+    table = views.trend_table(o["market_trend"], o["forecast_trend"], o["risk_factors"], o["opp_factors"])
+    fig = views.waterfall_figure(o["market_avg_price"], o["offer_price"], result["fair_price"], result["gap"])
+    sections = {
+        "analysis_bundle (캐시 미스)": lambda: (views.ANALYSIS_CACHE.clear(), views.analysis_bundle(o)),
+        "analysis_bundle (캐시 적중)": lambda: views.analysis_bundle(o),
+        "verdict_card": lambda: _body(views.verdict_card)(result),
+        "trend_matrix": lambda: _body(views.trend_matrix)(table),
+        "price_waterfall": lambda: _body(views.price_waterfall)(fig, result["gap"], result["gap_pct"]),
+        "strategy_guide": lambda: _body(views.strategy_guide)(result["strategy"], 0.55),
+    }
+    return {name: cpu_ms(fn, repeat) for name, fn in sections.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    from streamlit.logger import set_log_level
+
+    set_log_level("error")
+
+    full = full_rerun_ms(args.repeat)
+    sections = fragment_ms(args.repeat)
+    print(f"{'상호작용':<32}{'이전 (전체 재실행)':>18}{'현재':>12}")
+    print(f"{'입력 위젯 변경 (폼 내부)':<32}{full:>16.1f}ms{0:>10.1f}ms")
+    print(f"{'분석 실행 (폼 제출)':<32}{full:>16.1f}ms{full:>10.1f}ms")
+    for name, ms in sections.items():
+        print(f"{'섹션: ' + name:<32}{full:>16.1f}ms{ms:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
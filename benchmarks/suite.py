@@ -0,0 +1,494 @@
+"""성능 회귀 벤치마크 모음.
+
+세 그룹을 잽니다.
+
+- engine: Tool 1 판정(analyze_offer/analyze_offers)과 Tool 2 채점
+  (validate_supplier/validate_suppliers) — 단건 호출과 1k/100k/1M 행 일괄
+- charts: 가격 구조 분해 go.Figure 생성·직렬화(페이로드 크기 포함), 정적 SVG, 3D 트렌드 매트릭스 DataFrame 생성
+- pages: Streamlit AppTest 로 각 페이지를 결과가 표시된 상태에서 다시 실행
+- prices: 시세 저장소 (5,000 시리즈 × 104주) 주차 추가와 품목/국가 조회
+- directory: 공급사 디렉터리 (1M 곳) 색인 생성과 이름 퍼지 검색
+- history: 분석 이력 SQLite — record() 지연, 쓰기 스레드 처리량, 1M 행에서 조건별 페이지 조회
+- grid: 일괄 결과 그리드 (1k/100k/1M 행) — 필터·정렬 행 번호 계산, 페이지 꺼내기, 케이스별 집계
+- reports: 보고서 일괄 내보내기 (제안 500건 → zip) — 보고서 1건, 워커 1개 / 전체 코어
+- stream: 감시 폴더 (제안 100k 건 / 파일 100개) 에서 제안 파일 1개·시세 1건이 바뀔 때 증분 재판정
+
+결과는 JSON 으로 저장하고, --baseline 을 주면 같은 항목끼리 중앙값을 비교해
+--threshold % 이상 느려진 항목을 회귀로 표시합니다 (회귀가 있으면 종료 코드 1).
+
+    python benchmarks/suite.py -o baseline.json
+    python benchmarks/suite.py -o current.json --baseline baseline.json --threshold 15
+    python benchmarks/suite.py --groups engine --sizes 1000,100000
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+GROUPS = ["engine", "charts", "pages", "prices", "directory", "stream", "history", "grid", "reports"]
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_THRESHOLD = 10  # %
+SEED = 7
+PRICE_SERIES = 5_000
+PRICE_WEEKS = 104
+DIRECTORY_ROWS = 1_000_000
+STREAM_FILES = 100
+STREAM_ROWS = 1_000     # 파일당 제안 수
+STREAM_MARKETS = 500
+HISTORY_ROWS = 1_000_000
+HISTORY_WRITES = 100_000
+REPORTS = 500
+DIRECTORY_QUERIES = ["golden sun", "roya", "pacfic fresh", "tropical harvest fruits 1234 ltd", "g"]
+
+SAMPLE_OFFER = dict(
+    market_avg_price=0.50, offer_price=0.58, supplier_avg_margin=5,
+    market_trend="▼ 하락 (Drop)", forecast_trend="↗️ 상승 (Rise)",
+    risk_factors=[], opp_factors=["환율 호재"],
+)
+SAMPLE_SUPPLIER = dict(
+    volume_trend="↗️ 성장세 (Growth)", destinations=["High-Standard (미국/유럽/일본)"],
+    buyer_tier="Global Tier 1 (대기업)", export_history="✅ 최근 1년 내 있음", dependency="🟢 낮음 (분산됨)",
+)
+
+
+def measure(fn, repeat, warmup=1):
+    """fn 실행 시간(ms)의 중앙값/최솟값."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "repeat": repeat}
+
+
+def _repeat_for(rows, repeat):
+    """큰 입력은 반복 횟수를 줄입니다 (1M 행은 최소 3회)."""
+    return max(3, repeat * 1_000 // max(rows, 1_000)) if rows > 1_000 else repeat
+
+
+# --- 합성 입력 ---
+def offer_frame(rows, seed=SEED):
+    import numpy as np
+    import pandas as pd
+
+    from eyekit.factors import FACTOR_SEP
+    from eyekit.negotiation import FORECAST_TRENDS, MARKET_TRENDS, OPP_FACTORS, RISK_FACTORS
+
+    rng = np.random.default_rng(seed)
+    risks = ["", RISK_FACTORS[0], RISK_FACTORS[2], FACTOR_SEP.join(RISK_FACTORS[3:])]
+    opps = ["", OPP_FACTORS[0], FACTOR_SEP.join(OPP_FACTORS[1:3])]
+    return pd.DataFrame({
+        "market_avg_price": rng.uniform(0.3, 0.7, rows),
+        "offer_price": rng.uniform(0.3, 0.9, rows),
+        "supplier_avg_margin": rng.integers(0, 21, rows),
+        "market_trend": rng.choice(MARKET_TRENDS, rows),
+        "forecast_trend": rng.choice(FORECAST_TRENDS, rows),
+        "risk_factors": rng.choice(risks, rows),
+        "opp_factors": rng.choice(opps, rows),
+    })
+
+
+def supplier_frame(rows, seed=SEED):
+    import numpy as np
+    import pandas as pd
+
+    from eyekit.factors import FACTOR_SEP
+    from eyekit.partner import BUYER_TIERS, DEPENDENCIES, DESTINATIONS, EXPORT_HISTORIES, VOLUME_TRENDS
+
+    rng = np.random.default_rng(seed)
+    dests = DESTINATIONS + [FACTOR_SEP.join(DESTINATIONS[:2])]
+    return pd.DataFrame({
+        "volume_trend": rng.choice(VOLUME_TRENDS, rows),
+        "destinations": rng.choice(dests, rows),
+        "buyer_tier": rng.choice(BUYER_TIERS, rows),
+        "export_history": rng.choice(EXPORT_HISTORIES, rows),
+        "dependency": rng.choice(DEPENDENCIES, rows),
+    })
+
+
+# --- 그룹별 벤치마크 ---
+def bench_engine(sizes, repeat):
+    from eyekit.negotiation import analyze_offer, analyze_offers
+    from eyekit.partner import validate_supplier, validate_suppliers
+
+    results = {
+        "engine.analyze_offer.single": measure(lambda: analyze_offer(**SAMPLE_OFFER), repeat * 100),
+        "engine.validate_supplier.single": measure(lambda: validate_supplier(**SAMPLE_SUPPLIER), repeat * 100),
+    }
+    for rows in sizes:
+        offers, suppliers = offer_frame(rows), supplier_frame(rows)
+        n = _repeat_for(rows, repeat)
+        results[f"engine.analyze_offers.{rows}"] = measure(lambda: analyze_offers(offers), n)
+        results[f"engine.validate_suppliers.{rows}"] = measure(lambda: validate_suppliers(suppliers), n)
+    return results
+
+
+def plotly_payload(fig):
+    """st.plotly_chart 가 브라우저로 보내는 JSON (검증 + 직렬화 경로 그대로)."""
+    import plotly.io as pio
+    import plotly.tools
+
+    return pio.to_json(plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True), validate=False)
+
+
+def bench_charts(sizes, repeat):
+    from eyekit.charts import trend_table, waterfall_figure, waterfall_svg
+    from eyekit.negotiation import analyze_offer
+
+    o = SAMPLE_OFFER
+    result = analyze_offer(**o)
+    args = (o["market_avg_price"], o["offer_price"], result["fair_price"], result["gap"])
+    return {
+        "charts.waterfall_figure": measure(lambda: waterfall_figure(*args), repeat * 10),
+        "charts.waterfall_serialize": dict(measure(lambda: plotly_payload(waterfall_figure(*args)), repeat * 10),
+                                           bytes=len(plotly_payload(waterfall_figure(*args)).encode("utf-8"))),
+        "charts.waterfall_svg": dict(measure(lambda: waterfall_svg(*args), repeat * 10),
+                                     bytes=len(waterfall_svg(*args).encode("utf-8"))),
+        "charts.trend_table": measure(
+            lambda: trend_table(o["market_trend"], o["forecast_trend"], o["risk_factors"], o["opp_factors"]),
+            repeat * 10),
+    }
+
+
+def _submit(at, label):
+    [b for b in at.button if label in b.label][0].click().run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+
+
+def bench_pages(sizes, repeat):
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    set_log_level("error")
+    script = os.path.join(ROOT, "app.py")
+    results = {"pages.first_run": measure(lambda: AppTest.from_file(script, default_timeout=60).run(), repeat)}
+    at = AppTest.from_file(script, default_timeout=60).run()
+
+    # 각 페이지는 결과가 표시된 상태(폼 제출 후)에서 전체 재실행 시간을 잽니다
+    pages = [
+        ("tool1", "Tool 1. 협상 & 타이밍 마스터", "Analyze"),
+        ("tool2", "Tool 2. 파트너 검증기", "Validate"),
+        ("guide", "📘 사용 가이드", None),
+    ]
+    for name, label, submit in pages:
+        at.sidebar.radio[0].set_value(label).run()
+        if submit:
+            _submit(at, submit)
+        results[f"pages.{name}.rerun"] = measure(at.run, repeat)
+    return results
+
+
+def bench_prices(sizes, repeat):
+    import numpy as np
+
+    from eyekit.prices import PriceStore
+
+    rng = np.random.default_rng(SEED)
+    keys = [(f"product-{i % 500}", f"country-{i // 500}") for i in range(PRICE_SERIES)]
+    walk = rng.uniform(0.3, 2.0, PRICE_SERIES) * np.exp(np.cumsum(rng.normal(0, 0.03, (PRICE_WEEKS, PRICE_SERIES)), 0))
+    weeks = np.datetime64("2024-01-01") + np.arange(PRICE_WEEKS) * 7
+
+    with tempfile.TemporaryDirectory() as root:
+        store = PriceStore.open(root)
+        for week, prices in zip(weeks, walk):
+            store.append(week, keys, prices)
+        store.flush()
+        probe = [keys[i] for i in rng.integers(0, PRICE_SERIES, 1_000)]
+        readonly = PriceStore.open(root, readonly=True)
+
+        def append_week():
+            week = np.datetime64("2024-01-01") + int(store.length.max()) * 7
+            store.append(week, keys, walk[-1])
+
+        return {
+            f"prices.append_week.{PRICE_SERIES}": measure(append_week, repeat),
+            "prices.summary.1000": measure(lambda: [readonly.summary(*k) for k in probe], repeat),
+            "prices.open": measure(lambda: PriceStore.open(root, readonly=True), repeat),
+        }
+
+
+def directory_frame(rows, seed=SEED):
+    """흔한 단어 조합 이름 — 트라이그램 행 목록이 길어지는 나쁜 경우에 가깝습니다."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    words = np.array("Golden Sun Green Valley Pacific Fresh Tropical Harvest Royal Star Blue Ocean "
+                     "Agro Fruit Global Prime Delta River Mountain Sunrise Eagle Lotus".split())
+    kinds = np.array("Export Trading Farms Produce Foods Agri Fruits Growers Partners Holdings".split())
+    suffixes = np.array(["Co.", "Ltd.", "S.A.", "LLC", "Inc.", "JSC", "GmbH"])
+    parts = [words[rng.integers(0, len(words), rows)], words[rng.integers(0, len(words), rows)],
+             kinds[rng.integers(0, len(kinds), rows)], rng.integers(1, 10_000, rows).astype(str),
+             suffixes[rng.integers(0, len(suffixes), rows)]]
+    df = supplier_frame(rows, seed)
+    df.insert(0, "name", pd.Series(parts[0]).str.cat([pd.Series(p) for p in parts[1:]], sep=" "))
+    return df
+
+
+def bench_directory(sizes, repeat):
+    from eyekit.directory import SupplierDirectory
+
+    df = directory_frame(DIRECTORY_ROWS)
+    started = time.perf_counter()
+    directory = SupplierDirectory.from_frame(df)
+    results = {f"directory.build.{DIRECTORY_ROWS}": {
+        "median_ms": (time.perf_counter() - started) * 1000, "min_ms": None, "repeat": 1}}
+    for query in DIRECTORY_QUERIES:
+        results[f"directory.search.{query}"] = measure(lambda: directory.search(query), repeat)
+    return results
+
+
+def bench_stream(sizes, repeat):
+    import numpy as np
+
+    from eyekit.negotiation import MARKET_TRENDS
+    from eyekit.stream import VerdictStream
+
+    rng = np.random.default_rng(SEED)
+    markets = [(f"product-{i % 50}", f"country-{i // 50}") for i in range(STREAM_MARKETS)]
+    snapshot = offer_frame(STREAM_MARKETS)[["market_avg_price", "market_trend"]]
+    snapshot.insert(0, "product", [p for p, _ in markets])
+    snapshot.insert(1, "country", [c for _, c in markets])
+
+    with tempfile.TemporaryDirectory() as folder:
+        def write(name, df):
+            df.to_csv(os.path.join(folder, name), index=False)
+
+        for f in range(STREAM_FILES):
+            offers = offer_frame(STREAM_ROWS, seed=SEED + f)
+            link = rng.integers(0, STREAM_MARKETS, STREAM_ROWS)
+            offers.insert(0, "offer_id", [f"{f}-{i}" for i in range(STREAM_ROWS)])
+            offers["product"] = [markets[k][0] for k in link]
+            offers["country"] = [markets[k][1] for k in link]
+            write(f"offers-{f:03d}.csv", offers)
+        write("market.csv", snapshot)
+
+        stream = VerdictStream(folder, settle=0)
+        started = time.perf_counter()
+        stream.poll()
+        total = STREAM_FILES * STREAM_ROWS
+        results = {f"stream.baseline.{total}": {
+            "median_ms": (time.perf_counter() - started) * 1000, "min_ms": None, "repeat": 1}}
+
+        edited = offer_frame(STREAM_ROWS, seed=SEED)
+        edited.insert(0, "offer_id", [f"0-{i}" for i in range(STREAM_ROWS)])
+        edited["product"], edited["country"] = markets[0]
+        step = iter(range(10 ** 9))
+
+        def offer_file_change():
+            # 파일 하나에서 10행의 제안가만 바꿉니다
+            edited.loc[:9, "offer_price"] = 0.3 + next(step) % 7 * 0.1
+            write("offers-000.csv", edited)
+            stream.poll()
+
+        def market_change():
+            # 시세 1건의 추세를 바꿉니다 (연결된 제안만 재판정)
+            snapshot.loc[1, "market_trend"] = MARKET_TRENDS[next(step) % len(MARKET_TRENDS)]
+            write("market.csv", snapshot)
+            stream.poll()
+
+        results["stream.offer_file_change.10"] = measure(offer_file_change, repeat)
+        results["stream.market_change.1"] = measure(market_change, repeat)
+        results["stream.idle_poll"] = measure(stream.poll, repeat)
+        return results
+
+
+def history_rows(rows, seed=SEED, start=None):
+    """공급사 5,000곳 × 품목 300개, 1년에 걸친 분석 이력 행."""
+    import numpy as np
+
+    from eyekit.history import analysis_row
+
+    rng = np.random.default_rng(seed)
+    start = time.time() - 365 * 86400 if start is None else start
+    created = np.sort(rng.uniform(start, start + 365 * 86400, rows)).tolist()
+    suppliers, products = rng.integers(0, 5_000, rows).tolist(), rng.integers(0, 300, rows).tolist()
+    return [analysis_row("tool1", {"offer_price": 0.58}, supplier=f"Supplier {s}", product=f"Product {p}",
+                         verdict="Case 4", target_price=0.58, created=c)
+            for c, s, p in zip(created, suppliers, products)]
+
+
+def bench_history(sizes, repeat):
+    from contextlib import closing
+
+    from eyekit.history import HistoryWriter, _INSERT, connect, query_history
+
+    with tempfile.TemporaryDirectory() as root:
+        # 쓰기: record() 는 큐에 넣기만 하므로 화면 재실행이 기다리는 시간은 µs 단위입니다
+        writes = history_rows(HISTORY_WRITES)
+        writer = HistoryWriter(os.path.join(root, "writes.sqlite3"))
+        it = iter(writes)
+        results = {"history.record": measure(lambda: writer.record(next(it)), repeat * 100)}
+        started = time.perf_counter()
+        for row in it:
+            while not writer.record(row):
+                writer.flush()
+        writer.flush()
+        results[f"history.writer.{HISTORY_WRITES}"] = {
+            "median_ms": (time.perf_counter() - started) * 1000, "min_ms": None, "repeat": 1}
+        writer.close()
+
+        # 조회: 1M 행에서 조건별 첫 페이지와 깊은 페이지 (키셋)
+        path = os.path.join(root, "history.sqlite3")
+        rows = history_rows(HISTORY_ROWS)
+        with closing(connect(path)) as conn, conn:
+            conn.executemany(_INSERT, rows)
+        day = 86400
+        start = rows[0][0]
+        with closing(connect(path, readonly=True)) as conn:
+            cases = {
+                "latest": {},
+                "supplier": {"supplier": "Supplier 42"},
+                "product": {"product": "Product 7"},
+                "supplier_range": {"supplier": "Supplier 42", "since": start + 100 * day, "until": start + 200 * day},
+                "range": {"since": start + 300 * day, "until": start + 301 * day},
+            }
+            for name, filters in cases.items():
+                results[f"history.query.{name}"] = measure(lambda: query_history(conn, **filters), repeat)
+            after = None
+            for _ in range(100):
+                _, after = query_history(conn, after=after)
+            results["history.query.page_100"] = measure(lambda: query_history(conn, after=after), repeat)
+        return results
+
+
+def bench_grid(sizes, repeat):
+    from eyekit.grid import ResultGrid
+    from eyekit.negotiation import CASE_CODES, analyze_offers
+
+    results = {}
+    for rows in sizes:
+        grid = ResultGrid.from_pandas(analyze_offers(offer_frame(rows)), {"case": CASE_CODES})
+        n = _repeat_for(rows, repeat)
+
+        def view(*args):
+            grid._views.clear()  # 캐시 없이 매번 계산
+            return grid.view(*args)
+
+        def summarize(rows):
+            grid._summaries.clear()
+            return grid.summarize(rows, "case", ["gap_pct", "target_price"])
+
+        results[f"grid.view.sort.{rows}"] = measure(lambda: view({}, "gap_pct", True), n)
+        results[f"grid.view.filter_sort.{rows}"] = measure(
+            lambda: view({"case": ["Case 1", "Case 4"]}, "case", False), n)
+        order = grid.view({}, "gap_pct", True)
+        filtered = grid.view({"case": ["Case 1", "Case 4"]}, "gap_pct", True)
+        last = max(len(order) // 100 - 1, 0)
+        results[f"grid.page.{rows}"] = measure(lambda: grid.page(order, last), repeat * 10)
+        results[f"grid.summarize.{rows}"] = measure(lambda: summarize(order), n)
+        results[f"grid.summarize.filtered.{rows}"] = measure(lambda: summarize(filtered), n)
+    return results
+
+
+def bench_reports(sizes, repeat):
+    from eyekit.montecarlo import default_workers
+    from eyekit.reports import export_reports, offer_report, report_records, warm_assets
+
+    records = report_records("offers", offer_frame(REPORTS))
+    warm_assets()
+    results = {"reports.offer_report.single": measure(lambda: offer_report(records[0]), repeat * 100)}
+    with tempfile.TemporaryDirectory() as root:
+        dest = os.path.join(root, "reports.zip")
+        for workers in sorted({1, default_workers()}):
+            results[f"reports.export.{REPORTS}.workers_{workers}"] = measure(
+                lambda: export_reports("offers", records, dest, workers=workers), repeat)
+    return results
+
+
+BENCHES = {
+    "engine": bench_engine, "charts": bench_charts, "pages": bench_pages,
+    "prices": bench_prices, "directory": bench_directory, "stream": bench_stream,
+    "history": bench_history, "grid": bench_grid, "reports": bench_reports,
+}
+
+
+# --- 결과 저장 / 비교 ---
+def environment():
+    import numpy as np
+
+    versions = {"python": platform.python_version(), "numpy": np.__version__}
+    for module in ("pandas", "plotly", "streamlit"):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "versions": versions,
+    }
+
+
+def compare(current, baseline, threshold):
+    """항목별 (이름, 기준 ms, 현재 ms, 변화 %, 회귀 여부) 목록. 한쪽에만 있는 항목은 건너뜁니다."""
+    rows = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = (cur["median_ms"] / base["median_ms"] - 1) * 100 if base["median_ms"] > 0 else 0.0
+        rows.append((name, base["median_ms"], cur["median_ms"], change, change > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="결과 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 중앙값 증가율 (%%)")
+    parser.add_argument("--groups", default=",".join(GROUPS), help=f"실행할 그룹 ({','.join(GROUPS)})")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="일괄 판정 행 수")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    groups = [g for g in args.groups.split(",") if g]
+    unknown = [g for g in groups if g not in BENCHES]
+    if unknown:
+        parser.error(f"알 수 없는 그룹: {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    results = {}
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as scratch:
+        # pages 그룹이 띄우는 앱의 분석 이력은 임시 폴더에 씁니다 (실행 위치에 data/ 를 남기지 않도록)
+        os.environ["EYEKIT_HISTORY_DB"] = os.path.join(scratch, "history.sqlite3")
+        for group in groups:
+            results.update(BENCHES[group](sizes, args.repeat))
+
+    for name, r in results.items():
+        low = f"min {r['min_ms']:.3f}ms, " if r["min_ms"] is not None else ""
+        size = f", {r['bytes']:,} bytes" if "bytes" in r else ""
+        print(f"{name:<40}{r['median_ms']:>12.3f}ms  ({low}n={r['repeat']}{size})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, ensure_ascii=False, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    rows = compare(results, baseline, args.threshold)
+    print(f"\n{'항목':<40}{'기준':>12}{'현재':>12}{'변화':>10}")
+    for name, base, cur, change, regressed in rows:
+        flag = "  ⚠️ 회귀" if regressed else ""
+        print(f"{name:<40}{base:>10.3f}ms{cur:>10.3f}ms{change:>+9.1f}%{flag}")
+    regressions = [r for r in rows if r[-1]]
+    print(f"\n회귀 {len(regressions)}건 (기준 +{args.threshold:g}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""Tridge Eye Action Kit 로직 엔진 (Streamlit 화면과 분리된 판정 규칙).
+
+numpy 만으로 import 되며, pandas/plotly 는 DataFrame 이나 차트를 실제로 만들 때
+불러옵니다. 명령줄 일괄 채점은 ``python -m eyekit`` (eyekit.cli) 입니다.
+"""
+from eyekit.negotiation import analyze_offer, analyze_offers
+from eyekit.partner import grade_supplier_file, validate_supplier, validate_suppliers
@@ -0,0 +1,6 @@
+"""python -m eyekit — 명령줄 일괄 채점 진입점."""
+import sys
+
+from eyekit.cli import main
+
+sys.exit(main())
@@ -0,0 +1,96 @@
+"""프로세스 공유 메모이제이션 캐시 (LRU + TTL).
+
+모듈 수준 인스턴스로 두면 같은 서버 프로세스의 모든 세션이 공유합니다.
+저장한 값은 여러 세션이 함께 읽으므로 꺼낸 뒤 수정하지 않아야 합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL = 600  # 초
+
+
+def normalize(value):
+    """캐시 키용 정규화: 실수는 반올림, 리스트/집합은 정렬된 튜플, dict 는 정렬된 항목 튜플."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [normalize(v) for v in value]
+        return tuple(items if isinstance(value, tuple) else sorted(items, key=repr))
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+class LRUCache:
+    """최대 항목 수와 TTL 이 있는 스레드 안전 LRU 캐시."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (저장 시각, 값)
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl and self._clock() - entry[0] > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        """캐시에 있으면 꺼내고, 없으면 compute() 결과를 저장해 반환합니다."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def configure(self, max_entries=None, ttl=None):
+        """운영 중에 최대 항목 수/TTL 을 바꿉니다 (줄이면 즉시 정리)."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl is not None:
+                self.ttl = ttl
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _evict(self):
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,136 @@
+"""Tool 1 결과 표/차트 빌더.
+
+Streamlit 없이도 쓸 수 있도록 화면과 분리했습니다. pandas/plotly 는 무거운
+의존성이므로 표나 차트를 실제로 만들 때만 함수 안에서 불러옵니다.
+"""
+import functools
+import math
+
+
+def trend_rows(market_trend, forecast_trend, risk_factors, opp_factors):
+    """3D 트렌드 매트릭스 컬럼 dict (화면 표와 보고서 HTML 표가 함께 씁니다)."""
+    return {
+        "구분": ["과거 (Trend)", "미래 (Forecast)", "심리 (Context)"],
+        "방향성": [
+            market_trend.split(' ')[0],
+            forecast_trend.split(' ')[0],
+            "⚠️" if risk_factors else "✅" if opp_factors else "➖"
+        ],
+        "핵심 해석 (Key Insight)": [
+            f"산지 가격이 {market_trend.split(' ')[1]} 추세입니다.",
+            f"향후 시장은 {forecast_trend.split(' ')[1]}될 전망입니다.",
+            f"{', '.join(risk_factors) if risk_factors else ', '.join(opp_factors) if opp_factors else '특이사항 없음'} 이슈가 있습니다."
+        ]
+    }
+
+
+def trend_table(market_trend, forecast_trend, risk_factors, opp_factors):
+    """3D 트렌드 매트릭스 표 데이터 (DataFrame)."""
+    import pandas as pd
+
+    return pd.DataFrame(trend_rows(market_trend, forecast_trend, risk_factors, opp_factors))
+
+
+def waterfall_bars(market_avg_price, offer_price, fair_price, gap):
+    """waterfall 막대 목록: (x 라벨, 시작값, 높이, 색, 표시 문자열, 시리즈 이름)."""
+    bars = [
+        ("시장 평균가 (Standard)", 0.0, market_avg_price, "#adb5bd", f"${market_avg_price:.2f}", "시장 평균가"),
+        ("인정 프리미엄 (Premium)", market_avg_price, fair_price - market_avg_price, "#28a745",
+         f"+${fair_price - market_avg_price:.2f}", "인정 프리미엄"),
+    ]
+    if gap > 0:
+        bars.append(("설명 안되는 마진 (Bubble)", fair_price, gap, "#dc3545", f"+${gap:.2f}", "설명 안되는 마진"))
+    bars.append(("최종 제안가 (Offer)", 0.0, offer_price, "#004e66", f"${offer_price:.2f}", "최종 제안가"))
+    return bars
+
+
+@functools.lru_cache(maxsize=1)
+def waterfall_layout():
+    """가격 구조 분해 차트 레이아웃 틀 (프로세스에서 한 번만 만들고 모든 차트가 공유).
+
+    template 은 비워 둡니다. st.plotly_chart 가 Streamlit 테마를 입히므로 plotly 기본
+    템플릿(~7KB)을 차트마다 브라우저로 보낼 필요가 없습니다 (Streamlit 밖에서 fig.show()
+    로 열면 plotly 기본 배경·격자 없이 그려집니다).
+    """
+    import plotly.graph_objects as go
+
+    return go.Layout(
+        title="가격 구조 분해 (Logic of Price)",
+        showlegend=False,
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20),
+        yaxis=dict(title="단가 ($/kg)"),
+        template=go.layout.Template(),
+    )
+
+
+def waterfall_figure(market_avg_price, offer_price, fair_price, gap):
+    """가격 구조 분해 (Logic of Price) 차트 (plotly Figure).
+
+    막대마다 이름·색이 있는 Bar trace 하나씩을 dict 로 적어 한 번에 Figure 로 만들고,
+    레이아웃은 미리 만든 틀(waterfall_layout)을 씁니다. Figure 는 분석 캐시에 결과와
+    함께 담기므로 분석마다 새로 만듭니다 (공유 Figure 를 고쳐 쓰지 않음).
+    """
+    import plotly.graph_objects as go
+
+    bars = waterfall_bars(market_avg_price, offer_price, fair_price, gap)
+    return go.Figure({
+        "data": [{"type": "bar", "name": name, "x": [label], "y": [height], "base": [base] if base else None,
+                  "marker": {"color": color}, "text": text, "textposition": "auto"}
+                 for label, base, height, color, text, name in bars],
+        "layout": waterfall_layout(),
+    })
+
+
+# --- 정적 SVG (보고서·일괄 화면용, plotly.js 없이 열림) ---
+SVG_WIDTH = 640
+SVG_HEIGHT = 350
+_SVG_MARGIN = dict(l=60, r=20, t=40, b=40)
+
+
+def _nice_step(span, ticks=5):
+    """눈금 간격 (1/2/5 × 10^n)."""
+    raw = span / ticks if span > 0 else 1.0
+    power = 10 ** math.floor(math.log10(raw))
+    return next(m * power for m in (1, 2, 5, 10) if m * power >= raw)
+
+
+def waterfall_svg(market_avg_price, offer_price, fair_price, gap, width=SVG_WIDTH, height=SVG_HEIGHT):
+    """waterfall_figure 와 같은 가격 구조 분해 차트를 정적 SVG 문자열로 만듭니다."""
+    from html import escape
+
+    bars = waterfall_bars(market_avg_price, offer_price, fair_price, gap)
+    m = _SVG_MARGIN
+    plot_w, plot_h = width - m["l"] - m["r"], height - m["t"] - m["b"]
+    ends = [v for _, base, h, *_ in bars for v in (base, base + h)]
+    lo, hi = min(0.0, *ends), max(ends)
+    step = _nice_step(hi - lo)
+    bottom, top = math.floor(lo / step) * step, (math.floor(hi / step) + 1) * step
+
+    def y(value):
+        return m["t"] + plot_h * (top - value) / (top - bottom)
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="{width}" '
+             f'height="{height}" font-family="sans-serif" font-size="12">',
+             f'<text x="{m["l"]}" y="24" font-size="16" fill="#444">가격 구조 분해 (Logic of Price)</text>']
+    tick = bottom
+    while tick <= top + step / 2:
+        ty = y(tick)
+        parts.append(f'<line x1="{m["l"]}" x2="{width - m["r"]}" y1="{ty:.1f}" y2="{ty:.1f}" stroke="#e9ecef"/>'
+                     f'<text x="{m["l"] - 6}" y="{ty + 4:.1f}" text-anchor="end" fill="#666">{tick:g}</text>')
+        tick = round(tick + step, 10)
+    parts.append(f'<text transform="translate(14 {m["t"] + plot_h / 2:.1f}) rotate(-90)" text-anchor="middle" '
+                 f'fill="#666">단가 ($/kg)</text>')
+
+    slot = plot_w / len(bars)
+    for i, (label, base, value, color, text, _) in enumerate(bars):
+        x = m["l"] + slot * i + slot * 0.1
+        y0, y1 = sorted((y(base), y(base + value)))
+        parts.append(f'<rect x="{x:.1f}" y="{y0:.1f}" width="{slot * 0.8:.1f}" height="{max(y1 - y0, 0.5):.1f}" '
+                     f'fill="{color}"/>'
+                     f'<text x="{x + slot * 0.4:.1f}" y="{y0 - 5:.1f}" text-anchor="middle" fill="#333">'
+                     f'{escape(text)}</text>'
+                     f'<text x="{x + slot * 0.4:.1f}" y="{height - m["b"] + 18}" text-anchor="middle" '
+                     f'font-size="11" fill="#444">{escape(label)}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
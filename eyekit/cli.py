@@ -0,0 +1,240 @@
+"""명령줄 일괄 채점 (Streamlit 없이 실행).
+
+    python -m eyekit offers offers.csv -o scored.csv
+    python -m eyekit suppliers suppliers.parquet -o graded.parquet --chunksize 100000
+    python -m eyekit prices import weekly_prices.csv --store data/prices
+    python -m eyekit prices show Mango Vietnam
+    python -m eyekit directory build exporters.parquet -o data/supplier_directory.npz
+    python -m eyekit directory search "golden sun"
+    python -m eyekit watch data/inbox --interval 2
+    python -m eyekit serve --port 8765 --window-ms 2
+    python -m eyekit history --supplier "ABC Export Co." --since 2025-01-01 --limit 20
+    python -m eyekit report offers offers.csv -o reports.zip --workers 8
+
+offers 는 OFFER_COLUMNS, suppliers 는 SUPPLIER_COLUMNS, prices import 는
+PRICE_COLUMNS (product, country, week, price), directory build 는 DIRECTORY_COLUMNS
+(name + SUPPLIER_COLUMNS) 컬럼을 가진 파일을 받습니다. watch 는 폴더에 들어오는 제안/시세
+스냅샷 파일을 감시해 판정이 바뀐 제안을 JSON 한 줄씩 출력합니다 (eyekit.stream).
+history 는 앱이 남긴 분석 이력(SQLite)을 조건으로 조회해 CSV 로 씁니다. serve 는
+/negotiate, /validate JSON 엔드포인트를 여는 로컬 채점 서비스입니다 (eyekit.service).
+report 는 제안/공급사 파일(판정 전 입력이나 offers/suppliers 결과)의 행마다 1페이지
+보고서를 만들어 zip 으로 묶습니다 (eyekit.reports).
+복수 요인은 ';' 로 구분합니다. -o 를 생략하면 결과 CSV 를 표준 출력으로 씁니다.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from contextlib import closing
+
+from eyekit.directory import DEFAULT_DIRECTORY, SupplierDirectory
+from eyekit.history import DEFAULT_HISTORY, HISTORY_COLUMNS, connect, day_bounds, query_history
+from eyekit.negotiation import CASE_CODES, analyze_offers
+from eyekit.partner import DEFAULT_CHUNKSIZE, GRADE_ORDER, grade_supplier_file
+from eyekit.prices import DEFAULT_STORE, PriceStore
+from eyekit.reports import REPORT_FORMATS, REPORT_KINDS, export_reports, report_records
+from eyekit.service import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WINDOW_MS, MAX_BATCH, serve
+from eyekit.stream import DEFAULT_INTERVAL, DEFAULT_WATCH_FOLDER, SETTLE_SECONDS, VerdictStream
+
+
+def _summary(label, counts, rows, seconds):
+    parts = ", ".join(f"{k} {counts.get(k, 0):,}" for k in label)
+    rate = rows / seconds if seconds > 0 else 0.0
+    return f"{rows:,}행 / {seconds:.2f}초 ({rate:,.0f}행/초) — {parts}"
+
+
+def score_offers(args):
+    import pandas as pd
+
+    started = time.perf_counter()
+    scored = analyze_offers(pd.read_csv(args.source))
+    if args.output:
+        scored.to_csv(args.output, index=False, encoding="utf-8-sig")
+    else:
+        scored.to_csv(sys.stdout, index=False)
+    counts = scored["case"].value_counts().to_dict()
+    return _summary(CASE_CODES, counts, len(scored), time.perf_counter() - started)
+
+
+def score_suppliers(args):
+    stats = grade_supplier_file(args.source, args.output or sys.stdout, chunksize=args.chunksize)
+    return _summary(GRADE_ORDER, stats["grade_counts"], stats["rows"], stats["seconds"])
+
+
+def import_prices(args):
+    import pandas as pd
+
+    started = time.perf_counter()
+    reader = pd.read_parquet if args.source.lower().endswith((".parquet", ".pq")) else pd.read_csv
+    store = PriceStore.open(args.store)
+    weeks = store.import_frame(reader(args.source))
+    store.flush()
+    return f"{weeks:,}개 주차 / 시리즈 {len(store):,}개 → {args.store} ({time.perf_counter() - started:.2f}초)"
+
+
+def show_price(args):
+    store = PriceStore.open(args.store, readonly=True)
+    summary = store.summary(args.product, args.country)
+    if summary is None:
+        raise ValueError(f"시세가 없습니다: {args.product} / {args.country}")
+    print(f"{args.product} / {args.country}")
+    for key, value in summary.items():
+        print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+    return f"최근 {store.window}주 창 기준"
+
+
+def build_directory(args):
+    started = time.perf_counter()
+    directory = SupplierDirectory.load(args.source)
+    directory.save(args.output)
+    return (f"공급사 {len(directory):,}곳 / 색인 {directory.nbytes() / 1e6:,.1f}MB → {args.output} "
+            f"({time.perf_counter() - started:.2f}초)")
+
+
+def search_directory(args):
+    directory = SupplierDirectory.load(args.directory)
+    started = time.perf_counter()
+    matches = directory.search(args.query, limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    for i, score in matches:
+        record = directory.record(i)
+        print(f"{score:.3f}  {record.pop('name')}  {record}")
+    return f"{len(directory):,}곳 중 {len(matches)}건 ({elapsed:.1f}ms)"
+
+
+def watch_folder(args):
+    stream = VerdictStream(args.folder, settle=args.settle)
+    stream.poll()  # 기준선: 현재 폴더 내용
+    print(f"{args.folder} 감시 중 — 제안 {len(stream):,}건 (Ctrl+C 로 종료)", file=sys.stderr)
+    changes = 0
+    try:
+        for events in stream.follow(args.interval):
+            for event in events:
+                print(json.dumps(event, ensure_ascii=False), flush=True)
+            changes += len(events)
+            for error in stream.errors:
+                print(f"건너뜀: {error['file']} — {error['error']}", file=sys.stderr)
+            stream.errors.clear()
+    except KeyboardInterrupt:
+        pass
+    return f"판정 변경 {changes:,}건 / 폴링 {stream.polls:,}회"
+
+
+def show_history(args):
+    since, until = day_bounds(args.since, args.until)
+    with closing(connect(args.db, readonly=True)) as conn:
+        rows, _ = query_history(conn, tool=args.tool, supplier=args.supplier, product=args.product,
+                                since=since, until=until, limit=args.limit)
+    writer = csv.DictWriter(sys.stdout, fieldnames=HISTORY_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return f"{len(rows):,}건 (최신순, 최대 {args.limit:,}건)"
+
+
+def run_service(args):
+    def ready(address):
+        print(f"채점 서비스: http://{address[0]}:{address[1]} (배치 창 {args.window_ms:g}ms, Ctrl+C 로 종료)",
+              file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port, args.window_ms, args.max_batch, ready=ready))
+    except KeyboardInterrupt:
+        pass
+    return "채점 서비스 종료"
+
+
+def export_report_zip(args):
+    import pandas as pd
+
+    reader = pd.read_parquet if args.source.lower().endswith((".parquet", ".pq")) else pd.read_csv
+    records = report_records(args.kind, reader(args.source))
+    stats = export_reports(args.kind, records, args.output, fmt=args.format, workers=args.workers,
+                           compress=args.compress)
+    return (f"보고서 {stats['reports']:,}건 → {args.output} ({stats['bytes'] / 1e6:,.1f}MB, "
+            f"{stats['seconds']:.2f}초, {stats['reports_per_sec']:,.0f}건/초, 프로세스 {stats['workers']}개)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m eyekit", description="Tridge Eye Action Kit 일괄 채점")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    offers = sub.add_parser("offers", help="공급사 제안 CSV 를 협상 케이스로 판정 (Tool 1)")
+    offers.add_argument("source", help="입력 CSV 경로")
+    offers.add_argument("-o", "--output", help="결과 CSV 경로 (생략 시 표준 출력)")
+    offers.set_defaults(run=score_offers)
+
+    suppliers = sub.add_parser("suppliers", help="공급사 마스터를 S~C/F 등급으로 채점 (Tool 2)")
+    suppliers.add_argument("source", help="입력 CSV/Parquet 경로")
+    suppliers.add_argument("-o", "--output", help="결과 경로 (.parquet 이면 Parquet, 생략 시 CSV 표준 출력)")
+    suppliers.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="청크당 행 수")
+    suppliers.set_defaults(run=score_suppliers)
+
+    prices = sub.add_parser("prices", help="주간 시세 저장소 (시장 평균가/추세 자동 입력)")
+    prices_sub = prices.add_subparsers(dest="action", required=True)
+    load = prices_sub.add_parser("import", help="주간 시세 CSV/Parquet 을 저장소 끝에 붙이기")
+    load.add_argument("source", help="입력 CSV/Parquet 경로")
+    load.set_defaults(run=import_prices)
+    show = prices_sub.add_parser("show", help="품목/국가의 시장 평균가와 추세 조회")
+    show.add_argument("product")
+    show.add_argument("country")
+    show.set_defaults(run=show_price)
+    for p in (load, show):
+        p.add_argument("--store", default=DEFAULT_STORE, help=f"저장소 디렉터리 (기본 {DEFAULT_STORE})")
+
+    directory = sub.add_parser("directory", help="공급사 디렉터리 색인 (Tool 2 이름 검색)")
+    directory_sub = directory.add_subparsers(dest="action", required=True)
+    build = directory_sub.add_parser("build", help="CSV/Parquet 에서 색인을 만들어 .npz 로 저장")
+    build.add_argument("source", help="입력 CSV/Parquet 경로")
+    build.add_argument("-o", "--output", default=DEFAULT_DIRECTORY, help=f"색인 경로 (기본 {DEFAULT_DIRECTORY})")
+    build.set_defaults(run=build_directory)
+    search = directory_sub.add_parser("search", help="공급사명 퍼지 검색")
+    search.add_argument("query")
+    search.add_argument("--directory", default=DEFAULT_DIRECTORY, help="색인(.npz) 또는 CSV/Parquet 경로")
+    search.add_argument("--limit", type=int, default=10)
+    search.set_defaults(run=search_directory)
+
+    watch = sub.add_parser("watch", help="감시 폴더의 새 제안/시세 파일로 판정을 증분 재평가 (Tool 1)")
+    watch.add_argument("folder", nargs="?", default=DEFAULT_WATCH_FOLDER, help=f"감시 폴더 (기본 {DEFAULT_WATCH_FOLDER})")
+    watch.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="폴링 간격 (초)")
+    watch.add_argument("--settle", type=float, default=SETTLE_SECONDS, help="수정 후 이 시간이 지난 파일만 읽기 (초)")
+    watch.set_defaults(run=watch_folder)
+
+    service = sub.add_parser("serve", help="로컬 JSON 채점 서비스 (/negotiate, /validate)")
+    service.add_argument("--host", default=DEFAULT_HOST)
+    service.add_argument("--port", type=int, default=DEFAULT_PORT)
+    service.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS,
+                         help="요청을 모아 한 번에 평가할 대기 시간 (0 이면 같은 이벤트 루프 차례에 도착한 것만)")
+    service.add_argument("--max-batch", type=int, default=MAX_BATCH, help="배치 최대 레코드 수")
+    service.set_defaults(run=run_service)
+
+    report = sub.add_parser("report", help="행마다 1페이지 보고서(HTML/PDF)를 만들어 zip 으로 묶기")
+    report.add_argument("kind", choices=REPORT_KINDS, help="offers (Tool 1) 또는 suppliers (Tool 2)")
+    report.add_argument("source", help="입력 CSV/Parquet 경로")
+    report.add_argument("-o", "--output", default="reports.zip", help="zip 경로 (기본 reports.zip)")
+    report.add_argument("--format", choices=REPORT_FORMATS, default="html", help="pdf 는 weasyprint 필요")
+    report.add_argument("--workers", type=int, help="프로세스 수 (기본: 사용 가능한 CPU 수)")
+    report.add_argument("--compress", action="store_true", help="zip 을 deflate 로 압축 (느리지만 절반 크기)")
+    report.set_defaults(run=export_report_zip)
+
+    history = sub.add_parser("history", help="분석 이력 조회 (Tool 1/Tool 2 결과)")
+    history.add_argument("--db", default=DEFAULT_HISTORY, help=f"이력 DB 경로 (기본 {DEFAULT_HISTORY})")
+    history.add_argument("--tool", choices=["tool1", "tool2"])
+    history.add_argument("--supplier", help="공급사명 (정확히 일치)")
+    history.add_argument("--product", help="품목 / 타겟 스펙 (정확히 일치)")
+    history.add_argument("--since", help="시작일 YYYY-MM-DD")
+    history.add_argument("--until", help="종료일 YYYY-MM-DD (포함)")
+    history.add_argument("--limit", type=int, default=100)
+    history.set_defaults(run=show_history)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        summary = args.run(args)
+    except (OSError, ValueError) as exc:
+        print(f"오류: {exc}", file=sys.stderr)
+        return 1
+    print(summary, file=sys.stderr)
+    return 0
@@ -0,0 +1,224 @@
+"""공급사 디렉터리 (Tool 2 공급사명 검색 + 진단 입력 자동 채움).
+
+수백만 건을 프로세스당 한 번 올려 모든 세션이 공유하므로, 행마다 dict 를 두지 않고
+배열 컬럼으로 보관합니다.
+
+- 이름: UTF-8 바이트 한 덩어리 + 오프셋 배열
+- 진단 입력: SUPPLIER_COLUMNS 순서의 uint8 코드 행렬 (수출 대상국은 비트마스크)
+- 접두어 색인: 정규화한 이름 순서의 행 번호 배열 (이진 탐색)
+- 트라이그램 색인: 32비트 트라이그램 해시(정렬) → 행 번호 목록 (CSR)
+
+검색은 두 단계입니다. 검색어 트라이그램 중 드문 것부터 행 목록을 모아(최대
+MAX_HITS 건) 공유 개수로 후보를 좁히고, 후보만 실제 트라이그램 자카드 유사도에
+접두어 일치 가산점을 더해 다시 순위를 매깁니다. 흔한 트라이그램(" co", "ltd")이
+많은 검색어도 조회 비용이 MAX_HITS 로 묶입니다.
+"""
+import bisect
+import os
+import re
+import zipfile
+
+import numpy as np
+
+from eyekit.factors import encode, factor_mask, factor_text, fill_blank, label_code
+from eyekit.partner import BUYER_TIERS, DEPENDENCIES, DESTINATIONS, EXPORT_HISTORIES, SUPPLIER_COLUMNS, VOLUME_TRENDS
+
+DEFAULT_DIRECTORY = os.environ.get("EYEKIT_SUPPLIER_DIRECTORY", os.path.join("data", "supplier_directory.npz"))
+DIRECTORY_COLUMNS = ["name"] + SUPPLIER_COLUMNS
+DEFAULT_LIMIT = 10
+PREFIX_BONUS = 1.0   # 정규화 이름이 검색어로 시작하면 더하는 점수
+PREFIX_CAP = 100     # 접두어 후보 최대 개수 (짧은 검색어 대비)
+MAX_HITS = 150_000   # 후보 수집 시 읽을 행 목록 길이 상한
+RERANK = 100         # 공유 트라이그램 수 상위 몇 개를 정확한 유사도로 다시 매길지
+
+# 단일 선택 컬럼의 선택지 (destinations 는 비트마스크)
+LABELS = {
+    "volume_trend": VOLUME_TRENDS,
+    "buyer_tier": BUYER_TIERS,
+    "export_history": EXPORT_HISTORIES,
+    "dependency": DEPENDENCIES,
+}
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name):
+    """검색용 이름: 소문자화, 기호 → 공백, 공백 정리."""
+    return _NON_WORD.sub(" ", str(name).casefold()).strip()
+
+
+def _trigram_keys(codepoints):
+    """코드포인트 배열의 연속 3글자 → 32비트 해시 키. 구분자(0)를 포함한 조합은 제외.
+
+    세 글자(21비트씩)를 63비트로 묶은 뒤 피보나치 해싱으로 상위 32비트를 씁니다.
+    드문 해시 충돌은 후보를 조금 늘릴 뿐이고, 순위는 실제 트라이그램으로 다시 매깁니다.
+    """
+    c = codepoints.astype(np.uint64)
+    c0, c1, c2 = c[:-2], c[1:-1], c[2:]
+    valid = (c0 != 0) & (c1 != 0) & (c2 != 0)
+    packed = (c0 << np.uint64(42)) | (c1 << np.uint64(21)) | c2
+    return (packed * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32), valid
+
+
+def _codepoints(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _padded(norm):
+    return "  " + norm + " "
+
+
+def _trigram_set(norm):
+    padded = _padded(norm)
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SupplierDirectory:
+    """배열 기반 공급사 디렉터리. from_frame()/load() 로 만듭니다."""
+
+    def __init__(self, blob, offsets, codes, order, tri_keys, tri_offsets, postings):
+        self.blob = blob
+        self.offsets = offsets
+        self.codes = codes
+        self.order = order
+        self.tri_keys = tri_keys
+        self.tri_offsets = tri_offsets
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # --- 생성 ---
+    @classmethod
+    def from_frame(cls, df):
+        """DIRECTORY_COLUMNS 컬럼 DataFrame 으로 디렉터리와 색인을 만듭니다."""
+        missing = [c for c in DIRECTORY_COLUMNS if c not in df.columns]
+        if missing:
+            raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+        names = df["name"].fillna("").astype(str).tolist()
+        encoded = [n.encode("utf-8") for n in names]
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        codes = np.empty((len(df), len(SUPPLIER_COLUMNS)), dtype=np.uint8)
+        for j, col in enumerate(SUPPLIER_COLUMNS):
+            if col == "destinations":
+                codes[:, j] = encode(factor_text(df[col]), lambda s: factor_mask(s, DESTINATIONS))
+            else:
+                codes[:, j] = encode(fill_blank(df[col]).astype(str), lambda s, labels=LABELS[col]: label_code(s, labels))
+
+        sub = _NON_WORD.sub
+        norms = [sub(" ", n.casefold()).strip() for n in names]  # normalize_name 과 같음 (호출 비용 절약)
+        order = np.array(sorted(range(len(norms)), key=norms.__getitem__), dtype=np.int32)
+        return cls(blob, offsets, codes, order, *cls._build_trigrams(norms))
+
+    @staticmethod
+    def _build_trigrams(norms):
+        if not norms:
+            return np.empty(0, dtype=np.uint32), np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32)
+        padded = [_padded(n) for n in norms]
+        cps = _codepoints("\0".join(padded))
+        owner = np.repeat(np.arange(len(padded), dtype=np.uint64), [len(p) + 1 for p in padded])[:len(cps)]
+        keys, valid = _trigram_keys(cps)
+
+        # (키 << 32 | 행) 하나로 묶어 제자리 정렬 → 중복 제거 → 키별로 묶기
+        pairs = (keys[valid] << np.uint64(32)) | owner[:-2][valid]
+        pairs.sort()
+        pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+        keys = (pairs >> np.uint64(32)).astype(np.uint32)
+        owner = (pairs & np.uint64(0xFFFFFFFF)).astype(np.int32)
+
+        tri_keys, starts = np.unique(keys, return_index=True)
+        tri_offsets = np.append(starts, len(keys)).astype(np.int64)
+        return tri_keys, tri_offsets, owner
+
+    @classmethod
+    def load(cls, path):
+        """.npz (save() 결과), .parquet, 또는 CSV 파일에서 디렉터리를 엽니다.
+
+        읽을 수 없거나 형식이 맞지 않는 파일은 ValueError.
+        """
+        try:
+            if str(path).lower().endswith(".npz"):
+                with np.load(path) as data:
+                    return cls(*(data[k] for k in ("blob", "offsets", "codes", "order", "tri_keys",
+                                                    "tri_offsets", "postings")))
+            import pandas as pd
+
+            if str(path).lower().endswith((".parquet", ".pq")):
+                df = pd.read_parquet(path, columns=DIRECTORY_COLUMNS)
+            else:
+                df = pd.read_csv(path, usecols=DIRECTORY_COLUMNS, dtype={c: "category" for c in SUPPLIER_COLUMNS})
+        except (OSError, KeyError, zipfile.BadZipFile, ValueError) as e:
+            raise ValueError(f"공급사 디렉터리 파일을 읽을 수 없습니다: {path} ({e})") from e
+        return cls.from_frame(df)
+
+    def save(self, path):
+        """색인까지 포함해 .npz 로 저장합니다 (다음 기동 시 색인 생성 생략)."""
+        np.savez(path, blob=self.blob, offsets=self.offsets, codes=self.codes, order=self.order,
+                 tri_keys=self.tri_keys, tri_offsets=self.tri_offsets, postings=self.postings)
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.blob, self.offsets, self.codes, self.order,
+                                      self.tri_keys, self.tri_offsets, self.postings))
+
+    # --- 조회 ---
+    def name(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def record(self, i):
+        """행 i 의 이름과 진단 입력 (validate_supplier 인자 형식). 선택지에 없던 값은 None."""
+        row = self.codes[i]
+        record = {"name": self.name(i)}
+        for j, col in enumerate(SUPPLIER_COLUMNS):
+            if col == "destinations":
+                record[col] = [label for b, label in enumerate(DESTINATIONS) if row[j] >> b & 1]
+            else:
+                labels = LABELS[col]
+                record[col] = labels[row[j]] if row[j] < len(labels) else None
+        return record
+
+    def _prefix_range(self, norm):
+        key = lambda i: normalize_name(self.name(i))
+        lo = bisect.bisect_left(self.order, norm, key=key)
+        hi = bisect.bisect_left(self.order, norm + "\U0010ffff", lo=lo, key=key)
+        return self.order[lo:min(hi, lo + PREFIX_CAP)]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """검색어와 비슷한 공급사 [(행 번호, 점수)] 를 점수 내림차순으로 돌려줍니다."""
+        norm = normalize_name(query)
+        if not norm or not len(self):
+            return []
+        keys, valid = _trigram_keys(_codepoints(_padded(norm)))
+        keys = np.unique(keys[valid]).astype(np.uint32)
+        pos = np.minimum(np.searchsorted(self.tri_keys, keys), len(self.tri_keys) - 1)
+        pos = pos[self.tri_keys[pos] == keys]
+
+        # 1단계: 드문 트라이그램부터 MAX_HITS 까지 행 목록을 모아 공유 개수로 후보 선정
+        candidates = self._prefix_range(norm)
+        if len(pos):
+            sizes = self.tri_offsets[pos + 1] - self.tri_offsets[pos]
+            pos, sizes = pos[np.argsort(sizes)], np.sort(sizes)
+            pos = pos[:max(1, int(np.searchsorted(np.cumsum(sizes), MAX_HITS, side="right")))]
+            # 행 번호를 정렬해 같은 값의 길이로 공유 개수를 셉니다 (디렉터리 크기와 무관)
+            hits = np.sort(np.concatenate([self.postings[self.tri_offsets[p]:self.tri_offsets[p + 1]] for p in pos]))
+            starts = np.flatnonzero(np.concatenate([[True], hits[1:] != hits[:-1]]))
+            ids, shared = hits[starts], np.diff(np.append(starts, len(hits)))
+            if len(ids) > RERANK:
+                ids = ids[np.argpartition(-shared, RERANK)[:RERANK]]
+            candidates = np.union1d(candidates, ids)
+
+        # 2단계: 후보만 실제 자카드 유사도 + 접두어 가산점으로 순위
+        query_set = _trigram_set(norm)
+        scored = []
+        for i in candidates.tolist():
+            name = normalize_name(self.name(i))
+            tri = _trigram_set(name)
+            score = len(query_set & tri) / len(query_set | tri)
+            if name.startswith(norm):
+                score += PREFIX_BONUS
+            scored.append((-score, i))
+        scored.sort()
+        return [(i, -neg) for neg, i in scored[:limit]]
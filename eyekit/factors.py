@@ -0,0 +1,62 @@
+"""멀티셀렉트 요인(리스크/호재/수출 대상국) 및 범주형 라벨 컬럼 공통 처리."""
+import numpy as np
+
+# CSV 에서 복수 요인을 한 칸에 적을 때의 구분자
+FACTOR_SEP = ";"
+
+
+def fill_blank(col):
+    """빈 칸(NaN)을 "" 로 채웁니다. 범주형(category) 컬럼은 값 컬럼으로 풀어서 채웁니다."""
+    if hasattr(col, "cat"):
+        col = col.astype(object)
+    return col.fillna("")
+
+
+def factor_text(col):
+    """요인 컬럼을 ';' 구분 문자열 Series 로 정규화합니다 (리스트 값도 허용)."""
+    col = fill_blank(col)
+    sample = col[col.astype(bool)]
+    if len(sample) and isinstance(sample.iloc[0], (list, tuple, set)):
+        col = col.map(lambda v: FACTOR_SEP.join(v) if v else "")
+    return col.astype(str)
+
+
+def split_factors(value):
+    """요인 한 칸(리스트 또는 ';' 구분 문자열, 빈 값/NaN 포함) → 요인 목록."""
+    if isinstance(value, (list, tuple, set)):
+        return [str(v) for v in value]
+    if not isinstance(value, str):
+        return []
+    return [f.strip() for f in value.split(FACTOR_SEP) if f.strip()]
+
+
+def factor_mask(factors, labels):
+    """선택된 요인을 비트마스크로 바꿉니다 (labels[i] 선택 시 i 번째 비트).
+
+    factors 는 리스트 또는 ';' 구분 문자열입니다.
+    """
+    if isinstance(factors, str):
+        factors = [f.strip() for f in factors.split(FACTOR_SEP)]
+    chosen = set(factors)
+    return sum(1 << i for i, label in enumerate(labels) if label in chosen)
+
+
+def encode(col, code_of):
+    """컬럼 값을 정수 코드 배열로 바꿉니다.
+
+    고유값마다 code_of 를 한 번만 호출하므로 행 수가 많아도 파이썬 호출은
+    고유값 개수만큼만 일어납니다.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(fill_blank(col))
+    lookup = np.fromiter((code_of(u) for u in uniques), dtype=np.int64, count=len(uniques))
+    return lookup[codes]
+
+
+def label_code(label, labels):
+    """선택지 목록 안의 순번. 목록에 없는 라벨은 len(labels) ('그 외') 입니다."""
+    try:
+        return labels.index(label)
+    except ValueError:
+        return len(labels)
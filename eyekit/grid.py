@@ -0,0 +1,201 @@
+"""대용량 일괄 결과 그리드 (Arrow 기반, 서버 측 정렬/필터/집계).
+
+일괄 판정/채점 결과를 pyarrow Table 하나로 들고, 필터·정렬은 행 번호 배열만
+만들어 둡니다. 화면에는 page() 로 꺼낸 한 페이지 분량의 Arrow 조각만 보내므로
+10만 행 결과도 브라우저로는 수십 행만 직렬화됩니다. 집계(케이스별 건수, 등급별
+평균 등)도 Arrow group_by 로 서버에서 계산합니다.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_PAGE_SIZE = 100
+VIEW_CACHE = 8  # 그리드마다 기억할 (필터, 정렬) 조합 수
+
+
+class ResultGrid:
+    """일괄 결과 Arrow 표와 (필터, 정렬) → 행 번호 캐시.
+
+    orders 는 컬럼 → 값 순서 목록으로, 정렬과 집계 행 순서에 씁니다
+    (예: grade 를 사전순 대신 S → C/F 순으로). max_bytes 를 주면 표와 캐시된 행 번호
+    배열 합이 그 안에 들도록 오래된 view 부터 버립니다 (방금 만든 view 는 남김).
+    """
+
+    def __init__(self, table, orders=None, max_bytes=None):
+        self.table = table
+        self.orders = dict(orders or {})
+        self.max_bytes = max_bytes
+        self._views = OrderedDict()
+        self._summaries = OrderedDict()
+
+    @classmethod
+    def from_pandas(cls, df, orders=None):
+        import pyarrow as pa
+
+        return cls(pa.Table.from_pandas(df, preserve_index=False), orders)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def columns(self):
+        return self.table.column_names
+
+    @property
+    def nbytes(self):
+        """표와 캐시된 행 번호 배열 크기 합 (세션 메모리 한도 계산용)."""
+        return self.table.nbytes + sum(rows.nbytes for rows in self._views.values())
+
+    @property
+    def min_bytes(self):
+        """표 + 전체 행 view 하나 크기. max_bytes 가 이보다 작으면 지킬 수 없습니다."""
+        return self.table.nbytes + 8 * len(self)
+
+    def limit(self, max_bytes):
+        """max_bytes 를 바꾸고 바로 그 안으로 view 캐시를 줄입니다."""
+        self.max_bytes = max_bytes
+        self._trim()
+
+    def choices(self, column):
+        """필터 선택지: 컬럼에 있는 값 (orders 순서, 없으면 정렬)."""
+        import pyarrow.compute as pc
+
+        present = set(pc.unique(self._plain(column)).to_pylist()) - {None}
+        order = self.orders.get(column)
+        if order is None:
+            return sorted(present)
+        return [v for v in order if v in present] + sorted(present - set(order))
+
+    def view(self, filters=None, sort=None, descending=False):
+        """조건에 맞는 행 번호 (정렬 순). filters 는 컬럼 → 허용 값 목록이고, 빈 목록은 무시합니다."""
+        filters = {c: tuple(v) for c, v in (filters or {}).items() if v}
+        key = (tuple(sorted(filters.items())), sort, descending)
+        if key in self._views:
+            self._views.move_to_end(key)
+            return self._views[key]
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        mask = None
+        for column, values in filters.items():
+            hit = pc.is_in(self._plain(column), value_set=pa.array(values, type=pa.string()))
+            mask = hit if mask is None else pc.and_(mask, hit)
+        rows = (pa.array(np.arange(len(self), dtype=np.int64)) if mask is None
+                else pc.indices_nonzero(pc.fill_null(mask, False)).cast(pa.int64()))
+        if sort is not None:
+            keys = self._sort_key(sort).take(rows)
+            order = pc.array_sort_indices(keys, order="descending" if descending else "ascending",
+                                          null_placement="at_end")
+            rows = rows.take(order)
+
+        self._views[key] = rows
+        self._trim()
+        return rows
+
+    def _trim(self):
+        """VIEW_CACHE 개수와 max_bytes 를 넘으면 오래된 view (와 그 집계) 부터 버립니다."""
+        while len(self._views) > VIEW_CACHE or (
+                self.max_bytes is not None and len(self._views) > 1 and self.nbytes > self.max_bytes):
+            _, dropped = self._views.popitem(last=False)
+            for key in [k for k, (rows, _) in self._summaries.items() if rows is dropped]:
+                del self._summaries[key]
+
+    def page(self, rows, page, page_size=DEFAULT_PAGE_SIZE):
+        """view() 결과의 page 번째 (0부터) 페이지 Arrow 조각."""
+        return self.table.take(rows.slice(page * page_size, page_size))
+
+    def summarize(self, rows, by, values=()):
+        """by 값별 건수와 values 컬럼 평균 (행 목록 dict, orders 순). 같은 view 는 다시 계산하지 않습니다."""
+        key = (id(rows), by, tuple(values))
+        cached = self._summaries.get(key)
+        if cached is not None and cached[0] is rows:
+            return cached[1]
+
+        subset = self.table.select([by, *values])
+        if len(rows) < len(self):  # 필터가 없으면 순서만 다르므로 전체 표로 집계
+            subset = subset.take(rows)
+        subset = subset.set_column(0, by, self._plain(by, subset))
+        grouped = subset.group_by(by).aggregate([(by, "count")] + [(v, "mean") for v in values])
+        stats = {r[by]: r for r in grouped.to_pylist()}
+        summary = [{by: value, "count": stats[value][f"{by}_count"],
+                    **{f"{v}_mean": stats[value][f"{v}_mean"] for v in values}}
+                   for value in self.choices(by) if value in stats]
+
+        self._summaries[key] = (rows, summary)
+        if len(self._summaries) > VIEW_CACHE:
+            self._summaries.popitem(last=False)
+        return summary
+
+    def records(self, rows):
+        """행 번호 순서대로 행 dict 목록 (보고서 내보내기 등)."""
+        return self.table.take(rows).to_pylist()
+
+    def to_csv(self, rows=None):
+        """(필터/정렬된) 결과 CSV bytes. 엑셀 호환을 위해 utf-8-sig."""
+        import io
+
+        import pyarrow.csv as pacsv
+
+        table = self.table if rows is None else self.table.take(rows)
+        table = table.cast(_plain_schema(table.schema))
+        out = io.BytesIO()
+        out.write(b"\xef\xbb\xbf")
+        pacsv.write_csv(table, out)
+        return out.getvalue()
+
+    def _plain(self, column, table=None):
+        """사전 인코딩(pandas Categorical) 컬럼은 값 배열로 풀어 비교합니다."""
+        import pyarrow as pa
+
+        array = (self.table if table is None else table).column(column)
+        if pa.types.is_dictionary(array.type):
+            array = array.cast(array.type.value_type)
+        return array
+
+    def _sort_key(self, column):
+        """정렬 키 배열. orders 가 있는 컬럼은 그 순번으로 (목록에 없는 값은 뒤로)."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        array = self._plain(column)
+        order = self.orders.get(column)
+        if order is not None:
+            array = pc.index_in(array, value_set=pa.array(order))
+        return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+
+
+def read_results(path, orders=None, max_rows=None):
+    """결과 파일(csv/parquet) → ResultGrid. pandas 를 거치지 않고 Arrow 로 바로 읽습니다.
+
+    max_rows 를 주면 앞에서부터 그 행 수까지만 배치 단위로 읽습니다 (화면용 표본).
+    """
+    import pyarrow as pa
+
+    if str(path).lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        source = pq.ParquetFile(path)
+        if max_rows is None or source.metadata.num_rows <= max_rows:
+            return ResultGrid(source.read(), orders)
+        schema, batches = source.schema_arrow, source.iter_batches()
+    else:
+        import pyarrow.csv as pacsv
+
+        if max_rows is None:
+            return ResultGrid(pacsv.read_csv(path), orders)
+        source = pacsv.open_csv(path)
+        schema, batches = source.schema, source
+    taken, rows = [], 0
+    for batch in batches:
+        taken.append(batch)
+        rows += batch.num_rows
+        if rows >= max_rows:
+            break
+    return ResultGrid(pa.Table.from_batches(taken, schema=schema).slice(0, max_rows), orders)
+
+
+def _plain_schema(schema):
+    import pyarrow as pa
+
+    return pa.schema([f.with_type(f.type.value_type) if pa.types.is_dictionary(f.type) else f for f in schema])
@@ -0,0 +1,204 @@
+"""분석 이력 저장소 (SQLite, WAL).
+
+Tool 1 분석/Tool 2 검증 결과를 한 행씩 남깁니다. 화면 재실행은 record() 로 큐에
+넣기만 하고, 백그라운드 쓰기 스레드가 모아 둔 행을 트랜잭션 하나로 기록하므로
+디스크를 기다리지 않습니다. 읽기는 WAL 덕분에 쓰기와 동시에 진행됩니다.
+
+조회는 공급사/품목/기간 색인을 타고, 페이지는 OFFSET 대신 마지막 행의
+(created, id) 다음부터 읽는 키셋 방식이라 수백만 행에서도 페이지 비용이 일정합니다.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_HISTORY = os.environ.get("EYEKIT_HISTORY_DB", os.path.join("data", "history.sqlite3"))
+BATCH_SIZE = 500        # 트랜잭션당 최대 행 수
+FLUSH_INTERVAL = 0.5    # 첫 행을 받은 뒤 이 시간(초) 안에 모인 행을 함께 기록
+QUEUE_SIZE = 10_000     # 대기 행 상한 (넘치면 버리고 dropped 로 셉니다)
+DEFAULT_PAGE_SIZE = 50
+
+HISTORY_COLUMNS = ["id", "created", "tool", "supplier", "product", "country",
+                   "verdict", "target_price", "score", "grade", "inputs"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id           INTEGER PRIMARY KEY,
+    created      REAL NOT NULL,     -- epoch 초
+    tool         TEXT NOT NULL,     -- 'tool1' | 'tool2'
+    supplier     TEXT,
+    product      TEXT,
+    country      TEXT,
+    verdict      TEXT,              -- Tool 1 케이스 ID
+    target_price REAL,
+    score        INTEGER,           -- Tool 2 점수
+    grade        TEXT,              -- Tool 2 등급
+    inputs       TEXT               -- 입력값 JSON
+);
+CREATE INDEX IF NOT EXISTS analyses_created ON analyses (created);
+CREATE INDEX IF NOT EXISTS analyses_supplier ON analyses (supplier, created);
+CREATE INDEX IF NOT EXISTS analyses_product ON analyses (product, created);
+"""
+_INSERT = (f"INSERT INTO analyses ({', '.join(HISTORY_COLUMNS[1:])}) "
+           f"VALUES ({', '.join('?' * (len(HISTORY_COLUMNS) - 1))})")
+_STOP = object()
+
+
+def connect(path=DEFAULT_HISTORY, readonly=False):
+    """WAL 모드 연결. 쓰기 연결은 스키마를 만들고, 읽기 전용 연결은 파일이 없으면 OSError."""
+    if readonly:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"분석 이력이 없습니다: {path}")
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL 에서는 체크포인트 때만 fsync
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def analysis_row(tool, inputs, supplier=None, product=None, country=None, verdict=None,
+                 target_price=None, score=None, grade=None, created=None):
+    """record() 에 넘길 행 (HISTORY_COLUMNS 에서 id 를 뺀 순서)."""
+    return (time.time() if created is None else created, tool, supplier or None, product or None,
+            country or None, verdict, target_price, score, grade,
+            json.dumps(inputs, ensure_ascii=False, default=str))
+
+
+class HistoryWriter:
+    """백그라운드 스레드 하나가 큐의 행을 BATCH_SIZE / FLUSH_INTERVAL 단위로 기록합니다."""
+
+    def __init__(self, path=DEFAULT_HISTORY, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_queue=QUEUE_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        connect(path).close()  # 스키마는 여기서 만들어 둡니다 (첫 조회가 빈 DB 를 보지 않도록)
+        self._thread = threading.Thread(target=self._run, name="eyekit-history", daemon=True)
+        self._thread.start()
+
+    def record(self, row):
+        """행을 큐에 넣습니다 (기다리지 않음). 큐가 가득 차 있으면 버리고 False."""
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self):
+        """지금까지 넣은 행이 모두 기록될 때까지 기다립니다."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return {"written": self.written, "batches": self.batches, "pending": self.pending(),
+                "dropped": self.dropped, "errors": self.errors, "last_error": self.last_error}
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())  # 이미 쌓인 행은 대기 없이
+                continue
+            except queue.Empty:
+                pass
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = connect(self.path)
+        try:
+            while True:
+                batch = self._next_batch()
+                rows = [r for r in batch if r is not _STOP]
+                try:
+                    if rows:
+                        with conn:
+                            conn.executemany(_INSERT, rows)
+                        self.written += len(rows)
+                        self.batches += 1
+                except sqlite3.Error as exc:
+                    self.errors += len(rows)
+                    self.last_error = str(exc)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(rows) < len(batch):
+                    return
+        finally:
+            conn.close()
+
+
+# --- 조회 ---
+def day_bounds(start=None, end=None):
+    """날짜(date/문자열) 범위 → [시작일 0시, 종료일 다음날 0시) 의 epoch 초 (현지 시각)."""
+    def epoch(day):
+        return time.mktime(time.strptime(str(day), "%Y-%m-%d"))
+    return (None if start is None else epoch(start),
+            None if end is None else epoch(end) + 86400)
+
+
+def _history_sql(tool=None, supplier=None, product=None, since=None, until=None, after=None):
+    where, params = [], []
+    for column, value in (("tool", tool), ("supplier", supplier), ("product", product)):
+        if value:
+            where.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        where.append("created >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("created < ?")
+        params.append(until)
+    if after is not None:
+        where.append("(created, id) < (?, ?)")
+        params.extend(after)
+    sql = (f"SELECT {', '.join(HISTORY_COLUMNS)} FROM analyses"
+           + (f" WHERE {' AND '.join(where)}" if where else "")
+           + " ORDER BY created DESC, id DESC LIMIT ?")
+    return sql, params
+
+
+def query_history(conn, tool=None, supplier=None, product=None, since=None, until=None,
+                  after=None, limit=DEFAULT_PAGE_SIZE):
+    """조건에 맞는 이력을 최신순으로 limit 개 읽습니다.
+
+    supplier/product 는 정확히 일치, since/until 은 epoch 초 [since, until) 입니다.
+    after 는 이전 페이지 마지막 행의 (created, id) 로, 그 다음 행부터 읽습니다.
+    (행 dict 목록, 다음 페이지 after 또는 None) 을 반환합니다.
+    """
+    sql, params = _history_sql(tool, supplier, product, since, until, after)
+    rows = [dict(zip(HISTORY_COLUMNS, r)) for r in conn.execute(sql, params + [limit + 1]).fetchall()]
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, ((rows[-1]["created"], rows[-1]["id"]) if more else None)
+
+
+def explain(conn, **filters):
+    """query_history 실행 계획 (EXPLAIN QUERY PLAN) — 색인을 타는지 확인용."""
+    sql, params = _history_sql(**filters)
+    return "\n".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params + [1]))
@@ -0,0 +1,110 @@
+"""Tool 1 목표가 몬테카를로 시뮬레이션.
+
+market_avg_price 와 forecast_price 를 불확실한 값(로그정규, 평균 보존)으로 보고
+시나리오를 대량으로 뽑아 판정 엔진에 통과시킵니다. 난수는 고정 크기 블록마다
+SeedSequence 로 파생하므로, 같은 seed 면 프로세스 수와 무관하게 결과가 같습니다.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from eyekit.negotiation import CASE_CODES, GREED_GAP_PCT, case_pair, target_prices
+
+DEFAULT_SCENARIOS = 100_000
+DEFAULT_SEED = 42
+BLOCK_SIZE = 1 << 16  # 블록당 시나리오 수 (난수 스트림 단위)
+
+
+def _lognormal(rng, mean, vol_pct, size):
+    """평균이 mean 이고 변동성이 vol_pct% 인 로그정규 표본."""
+    sigma = vol_pct / 100
+    return mean * np.exp(sigma * rng.standard_normal(size) - sigma ** 2 / 2)
+
+
+def _simulate_block(seed, size, market_avg_price, offer_price, supplier_avg_margin, pair,
+                    market_vol_pct, forecast_price, forecast_vol_pct):
+    rng = np.random.default_rng(seed)
+    market = _lognormal(rng, market_avg_price, market_vol_pct, size)
+    forecast = _lognormal(rng, forecast_price, forecast_vol_pct, size)
+
+    fair = market * (1 + supplier_avg_margin / 100)
+    gap = offer_price - fair
+    gap_pct = np.divide(gap, fair, out=np.zeros_like(gap), where=fair > 0) * 100
+    codes = pair[(gap_pct > GREED_GAP_PCT).astype(np.intp)]
+    return codes, target_prices(codes, market, offer_price, fair), forecast
+
+
+def _simulate_blocks(args):
+    """프로세스 풀 작업 단위: 연속 블록 여러 개를 한 번에 처리합니다."""
+    blocks, common = args
+    parts = [_simulate_block(seed, size, *common) for seed, size in blocks]
+    return tuple(np.concatenate(col) for col in zip(*parts))
+
+
+def simulate_offer(market_avg_price, offer_price, supplier_avg_margin, market_trend, forecast_trend,
+                   risk_factors=(), opp_factors=(), market_vol_pct=10, forecast_price=0.0,
+                   forecast_vol_pct=15, n=DEFAULT_SCENARIOS, seed=DEFAULT_SEED, workers=1):
+    """시나리오 n 개의 케이스 코드, 목표가, 예측가 표본을 계산합니다.
+
+    workers > 1 이면 블록을 프로세스 풀에 나눠 보냅니다. 반환값은
+    case_code / target_price / forecast_price 배열을 담은 dict 입니다. n 이 1 보다
+    작으면 ValueError.
+    """
+    if n < 1:
+        raise ValueError(f"시나리오 수는 1 이상이어야 합니다: {n}")
+    pair = case_pair(market_trend, forecast_trend, risk_factors, opp_factors)
+    common = (market_avg_price, offer_price, supplier_avg_margin, pair,
+              market_vol_pct, forecast_price, forecast_vol_pct)
+    sizes = [min(BLOCK_SIZE, n - start) for start in range(0, n, BLOCK_SIZE)]
+    blocks = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+    workers = max(1, min(workers, len(blocks)))
+    if workers == 1:
+        codes, target, forecast = _simulate_blocks((blocks, common))
+    else:
+        per_worker = -(-len(blocks) // workers)
+        jobs = [(blocks[i:i + per_worker], common) for i in range(0, len(blocks), per_worker)]
+        with process_pool(workers) as pool:
+            parts = list(pool.map(_simulate_blocks, jobs))
+        codes, target, forecast = (np.concatenate(col) for col in zip(*parts))
+    return {"case_code": codes, "target_price": target, "forecast_price": forecast}
+
+
+def summarize_simulation(sim, offer_price, bins=40):
+    """시뮬레이션 결과를 화면용 요약 통계로 줄입니다 (분포는 히스토그램으로만 전달)."""
+    codes, target, forecast = sim["case_code"], sim["target_price"], sim["forecast_price"]
+    savings = offer_price - target
+    wait_savings = offer_price - forecast
+    counts, edges = np.histogram(target, bins=bins)
+    shares = np.bincount(codes, minlength=len(CASE_CODES)) / codes.size
+    return {
+        "n": int(codes.size),
+        "case_shares": dict(zip(CASE_CODES, shares.tolist())),
+        "target_mean": float(target.mean()),
+        "target_p5": float(np.percentile(target, 5)),
+        "target_p50": float(np.percentile(target, 50)),
+        "target_p95": float(np.percentile(target, 95)),
+        "expected_savings": float(savings.mean()),
+        "p_savings": float((savings > 0).mean()),
+        "wait_expected_savings": float(wait_savings.mean()),
+        "p_wait_better": float((wait_savings > savings).mean()),
+        "target_hist": (counts, edges),
+    }
+
+
+def default_workers():
+    """프로세스 풀 기본 크기 (사용 가능한 CPU 수)."""
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def process_pool(workers, initializer=None):
+    """spawn 으로 워커를 띄우는 프로세스 풀.
+
+    Streamlit 서버는 멀티스레드라 Linux 기본값인 fork 로 띄우면 다른 스레드가 잡고 있던
+    락을 자식이 물려받아 멈출 수 있습니다. 워커 함수와 initializer 는 pickle 되도록
+    모듈 수준 함수여야 합니다.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=initializer)
@@ -0,0 +1,302 @@
+"""Tool 1 협상 & 타이밍 마스터 로직 엔진.
+
+단건(위젯 입력)과 일괄(DataFrame) 판정이 같은 규칙을 공유합니다.
+"""
+from itertools import product
+
+import numpy as np
+
+from eyekit.factors import encode, factor_mask, factor_text, label_code
+
+# --- 입력 선택지 (app.py 위젯과 동일) ---
+FORECAST_TRENDS = ["↗️ 상승 (Rise)", "➡️ 보합 (Stable)", "↘️ 하락 (Fall)"]
+MARKET_TRENDS = ["▲ 급등 (Surge)", "↗️ 상승 (Rise)", "➖ 보합 (Stable)", "▼ 하락 (Drop)"]
+RISK_FACTORS = ["작황 부진/기상 악화", "질병/해충", "물류 대란/항만 적체", "관세/규제", "원부자재 상승"]
+OPP_FACTORS = ["풍작 (Bumper Crop)", "수요 감소/재고 과잉", "환율 호재", "신규 공급처 진입"]
+
+# 리스크 플래그 기준
+SUPPLY_RISKS = ["작황 부진/기상 악화", "질병/해충", "관세/규제"]
+LOGISTICS_RISK = "물류 대란/항만 적체"
+BUMPER = "풍작 (Bumper Crop)"
+GREED_GAP_PCT = 10  # Case 1 판정 기준 (설명 안되는 마진 %)
+
+# --- 케이스별 판정 카드 ---
+VERDICTS = {
+    "Case 3": {  # 구조적 급등
+        "icon": "🔵",
+        "title": "물량 선확보 (Secure Volume)",
+        "desc": "가격 협상보다 물량 확보가 시급합니다. 지금 안 사면 나중에 못 살 수 있습니다.",
+        "color": "#e3f2fd",  # Light Blue
+        "timing": "즉시 (Now)",
+        "leverage": "20 : 80 (공급자 우위)",
+        "strategy": "단가 수용하되, 향후 3개월치 물량 Lock-in 제안 (재고 확보 우선)",
+    },
+    "Case 2": {  # 리스크형 인상
+        "icon": "🟡",
+        "title": "조건부 협상 (Conditional)",
+        "desc": "가격 거품이 있으나 납기 리스크가 더 큽니다. 단가를 조금 양보하고 '선적 보장'을 받으세요.",
+        "color": "#fff9db",  # Light Yellow
+        "timing": "계약 조건 확인 후",
+        "leverage": "40 : 60 (약간 불리)",
+        "strategy": "가격 인하 대신 '선적 우선순위(Priority Shipping)' 및 '지체상금' 조항 삽입",
+    },
+    "Case 1": {  # 탐욕형 인상
+        "icon": "🔴",
+        "title": "강력 인하 요구 (Strong Push)",
+        "desc": "명분 없는 인상입니다. 시장 트렌드와 미래 전망 모두 귀하의 편입니다.",
+        "color": "#ffe3e3",  # Light Red
+        "timing": "협상 완료 시까지 보류",
+        "leverage": "90 : 10 (구매자 절대 우위)",
+        "strategy": "원가 하락 데이터 제시하며 프리미엄 제거 요구. 미수용 시 공급처 변경 압박.",
+    },
+    "Case 4": {  # 저점 매수
+        "icon": "🟢",
+        "title": "골든 타임 (Strike Price)",
+        "desc": "지금이 최저가일 확률이 높습니다. 스팟을 멈추고 장기 계약으로 전환하세요.",
+        "color": "#d3f9d8",  # Light Green
+        "timing": "즉시 (Best Timing)",
+        "leverage": "60 : 40 (구매자 우위)",
+        "strategy": "물량을 3배 늘리는 조건으로 대량 구매 할인(Volume Discount) 및 연간 계약 제안",
+    },
+    "Case 5": {  # 하락장 진입
+        "icon": "⚪",
+        "title": "구매 보류 (Wait & See)",
+        "desc": "떨어지는 칼날입니다. 급한 물량이 아니라면 구매를 최대한 미루세요.",
+        "color": "#f1f3f5",  # Gray
+        "timing": "2주 후 (대기)",
+        "leverage": "80 : 20 (구매자 우위)",
+        "strategy": "재고 소진하며 관망. 필요 시 스팟성으로만 최소량 구매.",
+    },
+    "Default": {
+        "icon": "⚖️",
+        "title": "일반 협상 (Negotiate)",
+        "desc": "통상적인 수준의 줄다리기가 필요합니다. 적정 마진 범위를 논의하세요.",
+        "color": "#e6f7ff",  # Teal Light
+        "timing": "협상 중",
+        "leverage": "50 : 50 (대등)",
+        "strategy": "시장 평균가와 당사 인정 프리미엄을 근거로 합리적 가격 조정 요청",
+    },
+}
+
+# if/elif 평가 순서 (앞선 케이스가 우선)
+CASE_ORDER = ["Case 3", "Case 2", "Case 1", "Case 4", "Case 5"]
+DEFAULT_CASE = "Default"
+
+# 일괄 분석 CSV 필수 컬럼
+OFFER_COLUMNS = [
+    "market_avg_price", "offer_price", "supplier_avg_margin",
+    "market_trend", "forecast_trend", "risk_factors", "opp_factors",
+]
+
+
+# --- 단건 분석 (Single Offer) ---
+def price_gap(market_avg_price, offer_price, supplier_avg_margin):
+    """적정가, 설명 안되는 마진, 마진 비율(%)을 계산합니다."""
+    fair_price = market_avg_price * (1 + supplier_avg_margin / 100)  # 적정가
+    gap = offer_price - fair_price  # 설명 안되는 마진
+    gap_pct = (gap / fair_price) * 100 if fair_price > 0 else 0
+    return fair_price, gap, gap_pct
+
+
+def classify_offer(market_trend, forecast_trend, risk_factors, opp_factors, gap_pct):
+    """Case 1~5 규칙을 순서대로 적용해 케이스 ID를 돌려줍니다."""
+    has_supply_risk = any(r in SUPPLY_RISKS for r in risk_factors)
+    has_logistics_risk = LOGISTICS_RISK in risk_factors
+    has_bumper = BUMPER in opp_factors
+
+    if has_supply_risk or "▲ 급등" in market_trend:
+        return "Case 3"
+    elif has_logistics_risk:
+        return "Case 2"
+    elif "▼ 하락" in market_trend and gap_pct > GREED_GAP_PCT:
+        return "Case 1"
+    elif "▼ 하락" in market_trend and "↗️ 상승" in forecast_trend:
+        return "Case 4"
+    elif "↘️ 하락" in forecast_trend or has_bumper:
+        return "Case 5"
+    return DEFAULT_CASE
+
+
+def target_price_for(case_id, market_avg_price, offer_price, fair_price):
+    """케이스별 적정 목표가."""
+    if case_id in ("Case 3", "Case 4"):
+        return offer_price
+    elif case_id == "Case 2":
+        return fair_price * 1.03
+    elif case_id == "Case 1":
+        return market_avg_price
+    elif case_id == "Case 5":
+        return market_avg_price * 0.9
+    return fair_price
+
+
+# --- 조회 테이블 (Compiled Rule Table) ---
+# 범주형 입력(추세 라벨, 요인 비트마스크)과 gap_pct 임계 여부로 만든 모든 조합에 대해
+# 위 if/elif 체인을 시작 시 한 번만 평가해 둡니다. 판정은 인덱스 조회 한 번이고,
+# 실행 중에 계산하는 것은 gap_pct > GREED_GAP_PCT 비교뿐입니다.
+CASE_CODES = CASE_ORDER + [DEFAULT_CASE]
+
+
+def market_code(label):
+    """시장 추세 라벨 → 코드. 규칙이 보는 '▲ 급등'/'▼ 하락' 포함 여부를 보존합니다."""
+    if "▲ 급등" in label:
+        return MARKET_TRENDS.index("▲ 급등 (Surge)")
+    if "▼ 하락" in label:
+        return MARKET_TRENDS.index("▼ 하락 (Drop)")
+    return label_code(label, MARKET_TRENDS)
+
+
+def forecast_code(label):
+    """예측 방향 라벨 → 코드. 규칙이 보는 '↗️ 상승'/'↘️ 하락' 포함 여부를 보존합니다."""
+    if "↗️ 상승" in label:
+        return FORECAST_TRENDS.index("↗️ 상승 (Rise)")
+    if "↘️ 하락" in label:
+        return FORECAST_TRENDS.index("↘️ 하락 (Fall)")
+    return label_code(label, FORECAST_TRENDS)
+
+
+def _subsets(labels):
+    return [[l for i, l in enumerate(labels) if mask >> i & 1] for mask in range(1 << len(labels))]
+
+
+def _compile_case_table():
+    markets = MARKET_TRENDS + [""]  # 마지막 칸: 목록에 없는 라벨
+    forecasts = FORECAST_TRENDS + [""]
+    risks = _subsets(RISK_FACTORS)
+    opps = _subsets(OPP_FACTORS)
+    gaps = (GREED_GAP_PCT, GREED_GAP_PCT + 1)  # 임계 이하 / 초과
+    code_of = {case_id: i for i, case_id in enumerate(CASE_CODES)}
+    # 원소 단위 대입 대신 리스트로 모아 한 번에 배열로 만듭니다 (import 시간 절반)
+    codes = [code_of[classify_offer(m, f, r, o, g)] for g, m, f, r, o in product(gaps, markets, forecasts, risks, opps)]
+    table = np.array(codes, dtype=np.uint8).reshape(len(gaps), len(markets), len(forecasts), len(risks), len(opps))
+    table.flags.writeable = False
+    return table
+
+
+CASE_TABLE = _compile_case_table()
+
+
+def lookup_case(market_trend, forecast_trend, risk_factors, opp_factors, gap_pct):
+    """classify_offer 와 같은 결과를 조회 테이블에서 꺼냅니다."""
+    code = CASE_TABLE[
+        int(gap_pct > GREED_GAP_PCT),
+        market_code(market_trend),
+        forecast_code(forecast_trend),
+        factor_mask(risk_factors, RISK_FACTORS),
+        factor_mask(opp_factors, OPP_FACTORS),
+    ]
+    return CASE_CODES[code]
+
+
+def analyze_offer(market_avg_price, offer_price, supplier_avg_margin,
+                  market_trend, forecast_trend, risk_factors=(), opp_factors=()):
+    """공급사 제안 1건을 판정합니다. 판정 카드 필드를 포함한 dict 를 반환합니다."""
+    fair_price, gap, gap_pct = price_gap(market_avg_price, offer_price, supplier_avg_margin)
+    case_id = lookup_case(market_trend, forecast_trend, risk_factors, opp_factors, gap_pct)
+    result = dict(VERDICTS[case_id])
+    result.update(
+        case=case_id,
+        fair_price=fair_price,
+        gap=gap,
+        gap_pct=gap_pct,
+        target_price=target_price_for(case_id, market_avg_price, offer_price, fair_price),
+    )
+    return result
+
+
+def case_pair(market_trend, forecast_trend, risk_factors=(), opp_factors=()):
+    """범주형 입력을 고정했을 때 가능한 두 케이스 코드 [gap_pct 임계 이하, 초과].
+
+    스윕/시뮬레이션처럼 가격만 바뀌는 대량 평가에서 pair[gap_pct > GREED_GAP_PCT] 로 씁니다.
+    """
+    return CASE_TABLE[:, market_code(market_trend), forecast_code(forecast_trend),
+                      factor_mask(risk_factors, RISK_FACTORS), factor_mask(opp_factors, OPP_FACTORS)]
+
+
+# --- 일괄 분석 (Portfolio) ---
+def case_codes(market_codes, forecast_codes, risk_masks, opp_masks, gap_pct):
+    """인코딩된 입력 배열 → CASE_CODES 인덱스 배열 (팬시 인덱싱 한 번)."""
+    return CASE_TABLE[(gap_pct > GREED_GAP_PCT).astype(np.intp), market_codes, forecast_codes, risk_masks, opp_masks]
+
+
+def target_prices(codes, market, offer, fair):
+    """케이스 코드 배열별 적정 목표가 (target_price_for 의 컬럼 버전)."""
+    candidates = np.stack(np.broadcast_arrays(offer, fair * 1.03, market, offer, market * 0.9, fair))
+    return np.take_along_axis(candidates, codes[np.newaxis].astype(np.intp), axis=0)[0]
+
+
+def analyze_offers(df):
+    """제안 DataFrame 전체를 컬럼 연산으로 판정합니다.
+
+    입력 컬럼은 OFFER_COLUMNS 를 따르며, 복수 요인은 ';' 로 구분합니다.
+    원본 컬럼 뒤에 fair_price, gap, gap_pct, case, verdict, target_price,
+    timing, leverage 컬럼을 붙여 반환합니다.
+    """
+    import pandas as pd
+
+    missing = [c for c in OFFER_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    market = df["market_avg_price"].to_numpy(dtype=float)
+    offer = df["offer_price"].to_numpy(dtype=float)
+    margin = df["supplier_avg_margin"].to_numpy(dtype=float)
+
+    # 1. 가격 계산
+    fair = market * (1 + margin / 100)
+    gap = offer - fair
+    gap_pct = np.divide(gap, fair, out=np.zeros_like(gap), where=fair > 0) * 100
+
+    # 2. 케이스 분류 (범주형 입력 인코딩 → 조회 테이블)
+    codes = case_codes(
+        encode(df["market_trend"].astype(str), market_code),
+        encode(df["forecast_trend"].astype(str), forecast_code),
+        encode(factor_text(df["risk_factors"]), lambda s: factor_mask(s, RISK_FACTORS)),
+        encode(factor_text(df["opp_factors"]), lambda s: factor_mask(s, OPP_FACTORS)),
+        gap_pct,
+    )
+    case = pd.Categorical.from_codes(codes, categories=CASE_CODES)
+
+    out = df.copy()
+    out["fair_price"] = fair
+    out["gap"] = gap
+    out["gap_pct"] = gap_pct
+    out["case"] = np.asarray(CASE_CODES, dtype=object)[codes]
+    out["verdict"] = case.map({k: v["title"] for k, v in VERDICTS.items()})
+    out["target_price"] = target_prices(codes, market, offer, fair)
+    out["timing"] = case.map({k: v["timing"] for k, v in VERDICTS.items()})
+    out["leverage"] = case.map({k: v["leverage"] for k, v in VERDICTS.items()})
+    return out
+
+
+def analyze_offer_records(offers):
+    """analyze_offer 인자 dict 목록을 한 번에 판정합니다 (HTTP 마이크로 배치 등).
+
+    pandas 없이 가격 계산과 조회 테이블 인덱싱을 배열 연산 한 번으로 처리하고,
+    입력 순서대로 analyze_offer 와 같은 dict 목록을 반환합니다.
+    """
+    n = len(offers)
+    market = np.fromiter((o["market_avg_price"] for o in offers), dtype=float, count=n)
+    offer = np.fromiter((o["offer_price"] for o in offers), dtype=float, count=n)
+    margin = np.fromiter((o["supplier_avg_margin"] for o in offers), dtype=float, count=n)
+
+    fair = market * (1 + margin / 100)
+    gap = offer - fair
+    gap_pct = np.divide(gap, fair, out=np.zeros_like(gap), where=fair > 0) * 100
+    codes = case_codes(
+        np.fromiter((market_code(o["market_trend"]) for o in offers), dtype=np.intp, count=n),
+        np.fromiter((forecast_code(o["forecast_trend"]) for o in offers), dtype=np.intp, count=n),
+        np.fromiter((factor_mask(o.get("risk_factors", ()), RISK_FACTORS) for o in offers), dtype=np.intp, count=n),
+        np.fromiter((factor_mask(o.get("opp_factors", ()), OPP_FACTORS) for o in offers), dtype=np.intp, count=n),
+        gap_pct,
+    )
+    targets = target_prices(codes, market, offer, fair)
+
+    results = []
+    for code, f, g, g_pct, t in zip(codes.tolist(), fair.tolist(), gap.tolist(), gap_pct.tolist(), targets.tolist()):
+        case_id = CASE_CODES[code]
+        result = dict(VERDICTS[case_id])
+        result.update(case=case_id, fair_price=f, gap=g, gap_pct=g_pct, target_price=t)
+        results.append(result)
+    return results
+
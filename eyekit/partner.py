@@ -0,0 +1,298 @@
+"""Tool 2 파트너 검증기 로직 엔진.
+
+단건 검증과 공급사 마스터 일괄 재평가(청크 스트리밍)가 같은 점수/등급 규칙을 공유합니다.
+"""
+import os
+import time
+
+import numpy as np
+
+from eyekit.factors import encode, factor_mask, factor_text, label_code
+
+# --- 입력 선택지 (app.py 위젯과 동일) ---
+VOLUME_TRENDS = ["↗️ 성장세 (Growth)", "➡️ 유지 (Stable)", "↘️ 하락세 (Decline)"]
+DESTINATIONS = ["High-Standard (미국/유럽/일본)", "Middle (중국/동남아)", "Low (기타)"]
+BUYER_TIERS = ["Global Tier 1 (대기업)", "Regional Tier 2 (중견/도매)", "Unknown (소규모)"]
+EXPORT_HISTORIES = ["✅ 최근 1년 내 있음", "⚠️ 과거 이력만 있음", "❌ 없음 (첫 거래)"]
+DEPENDENCIES = ["🟢 낮음 (분산됨)", "🔴 높음 (50% 이상 집중)"]
+
+# --- 배점 ---
+VOLUME_POINTS = {"↗️ 성장세 (Growth)": 30, "➡️ 유지 (Stable)": 20}
+HIGH_STANDARD = "High-Standard (미국/유럽/일본)"
+HIGH_STANDARD_POINTS = 20
+BUYER_POINTS = {"Global Tier 1 (대기업)": 30, "Regional Tier 2 (중견/도매)": 15}
+HISTORY_POINTS = {"✅ 최근 1년 내 있음": 20, "⚠️ 과거 이력만 있음": 10}
+LOW_DEPENDENCY = "🟢 낮음 (분산됨)"
+HIGH_DEPENDENCY = "🔴 높음 (50% 이상 집중)"
+DEPENDENCY_PENALTY = 20
+
+# --- 등급별 리포트 카드 ---
+GRADES = {
+    "S": {
+        "title": "Grade S (전략적 파트너)",
+        "color": "#d3f9d8",  # Green
+        "text_color": "#0b7285",
+        "strategy_title": "Lock-in & Grow",
+        "strategy_desc": "성장성, 품질, 안정성 모두 완벽합니다. 단가보다 '물량 확보'와 '장기 계약'을 우선하세요.",
+    },
+    "A-": {
+        "title": "Grade A- (조건부 파트너)",
+        "color": "#fff9db",  # Yellow
+        "text_color": "#e67700",
+        "strategy_title": "Penalty & Assurance",
+        "strategy_desc": "실력은 좋으나 바쁜 업체입니다. 우리 물량이 밀릴 수 있으니 '납기 보장 조항'을 반드시 넣으세요.",
+    },
+    "A": {
+        "title": "Grade A (우수 파트너)",
+        "color": "#e3f2fd",  # Blue
+        "text_color": "#1864ab",
+        "strategy_title": "Competition",
+        "strategy_desc": "신뢰할 수 있는 표준 업체입니다. 경쟁 입찰을 통해 단가 경쟁을 유도하세요.",
+    },
+    "B": {
+        "title": "Grade B (검역 주의)",
+        "color": "#ffe8cc",  # Orange
+        "text_color": "#d9480f",
+        "strategy_title": "Quality First, Safety Check",
+        "strategy_desc": "한국 통관 경험이 부족할 수 있습니다. 샘플 테스트 및 검역 서류 확인이 필수입니다.",
+    },
+    "C/F": {
+        "title": "Grade C/F (위험군)",
+        "color": "#ffe3e3",  # Red
+        "text_color": "#c92a2a",
+        "strategy_title": "Do Not Trade",
+        "strategy_desc": "부실 위험이 높습니다. 소싱 대상에서 제외하거나 블랙리스트에 등록하세요.",
+    },
+}
+GRADE_ORDER = ["S", "A", "A-", "B", "C/F"]
+
+# 일괄 감사 파일 필수 컬럼 (destinations 는 ';' 로 구분)
+SUPPLIER_COLUMNS = ["volume_trend", "destinations", "buyer_tier", "export_history", "dependency"]
+DEFAULT_CHUNKSIZE = 50_000
+
+
+# --- 단건 검증 (Single Supplier) ---
+def score_supplier(volume_trend, destinations, buyer_tier, export_history, dependency):
+    """실력/평판/리스크 배점을 합산한 종합 점수."""
+    score = VOLUME_POINTS.get(volume_trend, 0)
+    if HIGH_STANDARD in destinations:
+        score += HIGH_STANDARD_POINTS
+    score += BUYER_POINTS.get(buyer_tier, 0)
+    score += HISTORY_POINTS.get(export_history, 0)
+    if dependency != LOW_DEPENDENCY:
+        score -= DEPENDENCY_PENALTY
+    return score
+
+
+def grade_for(score, dependency):
+    """점수 구간으로 등급을 정합니다. 70점대 이상은 의존도에 따라 A / A- 로 나뉩니다."""
+    if score >= 90:
+        return "S"
+    elif score >= 70:
+        return "A-" if dependency == HIGH_DEPENDENCY else "A"
+    elif score >= 50:
+        return "B"
+    return "C/F"
+
+
+# --- 조회 테이블 (Compiled Rule Table) ---
+# 모든 입력이 범주형이므로 점수와 등급 전체를 시작 시 한 번 계산해 둡니다.
+# 각 축의 마지막 칸은 목록에 없는 라벨, 수출 대상국 축은 DESTINATIONS 비트마스크입니다.
+def _compile_grade_tables():
+    volumes = VOLUME_TRENDS + [""]
+    buyers = BUYER_TIERS + [""]
+    histories = EXPORT_HISTORIES + [""]
+    dependencies = DEPENDENCIES + [""]
+    shape = (len(volumes), 1 << len(DESTINATIONS), len(buyers), len(histories), len(dependencies))
+    scores = np.empty(shape, dtype=np.int16)
+    grades = np.empty(shape, dtype=np.uint8)
+    for v, d, b, h, dep in np.ndindex(shape):
+        dests = [l for i, l in enumerate(DESTINATIONS) if d >> i & 1]
+        score = score_supplier(volumes[v], dests, buyers[b], histories[h], dependencies[dep])
+        scores[v, d, b, h, dep] = score
+        grades[v, d, b, h, dep] = GRADE_ORDER.index(grade_for(score, dependencies[dep]))
+    scores.flags.writeable = False
+    grades.flags.writeable = False
+    return scores, grades
+
+
+SCORE_TABLE, GRADE_TABLE = _compile_grade_tables()
+
+
+def supplier_index(volume_trend, destinations, buyer_tier, export_history, dependency):
+    """단건 입력 → 조회 테이블 인덱스."""
+    return (
+        label_code(volume_trend, VOLUME_TRENDS),
+        factor_mask(destinations, DESTINATIONS),
+        label_code(buyer_tier, BUYER_TIERS),
+        label_code(export_history, EXPORT_HISTORIES),
+        label_code(dependency, DEPENDENCIES),
+    )
+
+
+def validate_supplier(volume_trend, destinations, buyer_tier, export_history, dependency):
+    """공급사 1곳을 검증합니다. 리포트 카드 필드를 포함한 dict 를 반환합니다."""
+    idx = supplier_index(volume_trend, destinations, buyer_tier, export_history, dependency)
+    score = int(SCORE_TABLE[idx])
+    grade = GRADE_ORDER[GRADE_TABLE[idx]]
+    result = dict(GRADES[grade])
+    result.update(score=score, grade=grade)
+    return result
+
+
+def validate_supplier_records(suppliers):
+    """validate_supplier 인자 dict 목록을 조회 테이블 인덱싱 한 번으로 검증합니다.
+
+    입력 순서대로 validate_supplier 와 같은 dict 목록을 반환합니다.
+    """
+    if not suppliers:
+        return []
+    idx = tuple(np.array(axis, dtype=np.intp) for axis in zip(*(
+        supplier_index(*(s[c] for c in SUPPLIER_COLUMNS)) for s in suppliers)))
+    results = []
+    for score, code in zip(SCORE_TABLE[idx].tolist(), GRADE_TABLE[idx].tolist()):
+        grade = GRADE_ORDER[code]
+        result = dict(GRADES[grade])
+        result.update(score=score, grade=grade)
+        results.append(result)
+    return results
+
+
+# --- 일괄 검증 (Supplier Master) ---
+def validate_suppliers(df):
+    """공급사 DataFrame 전체를 컬럼 연산으로 채점합니다.
+
+    원본 컬럼 뒤에 score, grade, strategy 컬럼을 붙여 반환합니다.
+    """
+    import pandas as pd
+
+    missing = [c for c in SUPPLIER_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    idx = (
+        encode(df["volume_trend"].astype(str), lambda s: label_code(s, VOLUME_TRENDS)),
+        encode(factor_text(df["destinations"]), lambda s: factor_mask(s, DESTINATIONS)),
+        encode(df["buyer_tier"].astype(str), lambda s: label_code(s, BUYER_TIERS)),
+        encode(df["export_history"].astype(str), lambda s: label_code(s, EXPORT_HISTORIES)),
+        encode(df["dependency"].astype(str), lambda s: label_code(s, DEPENDENCIES)),
+    )
+    codes = GRADE_TABLE[idx]
+    grade = pd.Categorical.from_codes(codes, categories=GRADE_ORDER)
+
+    out = df.copy()
+    out["score"] = SCORE_TABLE[idx]
+    out["grade"] = np.asarray(GRADE_ORDER, dtype=object)[codes]
+    out["strategy"] = grade.map({k: v["strategy_title"] for k, v in GRADES.items()})
+    return out
+
+
+# --- 청크 스트리밍 (Bulk Audit) ---
+def _is_parquet(name):
+    return str(name).lower().endswith((".parquet", ".pq"))
+
+
+def _size_of(handle):
+    pos = handle.tell()
+    handle.seek(0, os.SEEK_END)
+    size = handle.tell()
+    handle.seek(pos)
+    return size
+
+
+def iter_supplier_chunks(source, chunksize=DEFAULT_CHUNKSIZE, parquet=None):
+    """공급사 파일을 고정 크기 청크로 읽어 (chunk, 진행률 0~1) 을 순서대로 내보냅니다.
+
+    source 는 경로 또는 바이너리 파일 객체(업로드 파일 등)입니다. 한 번에
+    chunksize 행만 메모리에 올리므로 파일 크기와 무관하게 메모리 사용량이 일정합니다.
+    """
+    import pandas as pd
+
+    if parquet is None:
+        parquet = _is_parquet(getattr(source, "name", source))
+
+    if parquet:
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(source)
+        total = max(pf.metadata.num_rows, 1)
+        done = 0
+        for batch in pf.iter_batches(batch_size=chunksize):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / total
+        return
+
+    handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        total = max(_size_of(handle), 1)
+        for chunk in pd.read_csv(handle, chunksize=chunksize):
+            yield chunk, min(handle.tell() / total, 1.0)
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def _output_table(graded):
+    """채점 결과 청크 → Arrow 표. score 는 int64, 나머지(입력 컬럼 포함)는 문자열로 고정합니다.
+
+    첫 청크에서 타입을 추론하면 그 청크에 빈 값만 있던 컬럼이 다음 청크와 어긋나므로
+    청크와 무관한 스키마를 씁니다 (CSV 결과와 같은 값).
+    """
+    import pyarrow as pa
+
+    frame = graded.astype({c: "int64" if c == "score" else "string" for c in graded.columns})
+    schema = pa.schema([(c, pa.int64() if c == "score" else pa.string()) for c in frame.columns])
+    return pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+
+def grade_supplier_file(source, dest, chunksize=DEFAULT_CHUNKSIZE, parquet=None, on_progress=None):
+    """공급사 파일을 청크 단위로 채점해 dest 에 바로 이어 씁니다.
+
+    dest 확장자가 .parquet 이면 Parquet, 그 외에는 CSV 로 기록합니다. dest 가
+    텍스트 파일 객체(sys.stdout 등)이면 CSV 를 그대로 이어 쓰고 닫지 않습니다.
+    on_progress(rows, fraction, rows_per_sec) 가 청크마다 호출됩니다.
+    처리 행 수, 소요 시간, 등급별 건수를 담은 dict 를 반환합니다.
+    """
+    import pandas as pd
+
+    started = time.perf_counter()
+    rows = 0
+    grade_counts = pd.Series(0, index=GRADE_ORDER, dtype=np.int64)
+    writer = None
+    out_csv = None
+
+    try:
+        for chunk, fraction in iter_supplier_chunks(source, chunksize, parquet):
+            graded = validate_suppliers(chunk)
+            if _is_parquet(dest):
+                import pyarrow.parquet as pq
+
+                table = _output_table(graded)
+                if writer is None:
+                    writer = pq.ParquetWriter(dest, table.schema)
+                writer.write_table(table)
+            else:
+                if out_csv is None:
+                    out_csv = dest if hasattr(dest, "write") else open(dest, "w", encoding="utf-8-sig", newline="")
+                    graded.to_csv(out_csv, index=False)
+                else:
+                    graded.to_csv(out_csv, index=False, header=False)
+
+            rows += len(graded)
+            grade_counts = grade_counts.add(graded["grade"].value_counts(), fill_value=0)
+            if on_progress is not None:
+                elapsed = time.perf_counter() - started
+                on_progress(rows, fraction, rows / elapsed if elapsed > 0 else 0.0)
+    finally:
+        if writer is not None:
+            writer.close()
+        if out_csv is not None and out_csv is not dest:
+            out_csv.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+        "grade_counts": grade_counts.reindex(GRADE_ORDER, fill_value=0).astype(np.int64).to_dict(),
+    }
@@ -0,0 +1,270 @@
+"""주간 시세 저장소 (품목 × 국가별 산지/도매가 시계열).
+
+가격은 memmap 한 NumPy 행렬(시리즈 × 주차)에 두고, 시리즈마다 최근 window 주의
+합계(Σy, Σt·y)를 따로 유지합니다. 새 주차를 붙일 때는 창에서 빠지는 값과 들어오는
+값만으로 합계를 갱신하므로, 시장 평균가/추세 조회는 전체 이력을 다시 읽지 않습니다.
+
+디렉터리 구성:
+    series.json   [[품목, 국가], ...] (순번 = 시리즈 id)
+    prices.npy    float32 (시리즈 용량 × 주차 용량) memmap, 미기록 칸은 NaN
+    state.npz     시리즈별 시작 주, 기록 주 수, 창 합계, 창 크기
+"""
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_STORE = os.environ.get("EYEKIT_PRICE_STORE", os.path.join("data", "prices"))
+DEFAULT_WINDOW = 4  # 추세 판단 창 (주) — 가이드의 '최근 1달'
+PRICE_COLUMNS = ["product", "country", "week", "price"]
+
+# 창 기울기(주당, 창 평균 대비 %) 기준
+SURGE_PCT = 3.0
+RISE_PCT = 0.5
+DROP_PCT = -0.5
+
+WEEK = 7  # 일
+_INITIAL_SHAPE = (64, 64)
+
+
+def week_day(week):
+    """날짜(문자열/date/datetime64, 배열 가능) → 그 주 월요일의 epoch 일수."""
+    days = np.asarray(week, dtype="datetime64[D]").astype(np.int64)
+    return days - (days - 4) % WEEK  # 1970-01-01 은 목요일
+
+
+def window_slope(s0, s1, n):
+    """t = 0..n-1 에 대한 최소제곱 기울기 (Σy = s0, Σt·y = s1). 점이 2개 미만이면 0."""
+    n = np.asarray(n, dtype=np.float64)
+    st = n * (n - 1) / 2
+    stt = (n - 1) * n * (2 * n - 1) / 6
+    den = n * stt - st ** 2
+    return np.divide(n * s1 - st * s0, den, out=np.zeros(np.broadcast(s0, n).shape), where=den > 0)
+
+
+def classify_trend(slope_pct):
+    """주당 기울기(%) → MARKET_TRENDS 라벨."""
+    if slope_pct >= SURGE_PCT:
+        return "▲ 급등 (Surge)"
+    elif slope_pct >= RISE_PCT:
+        return "↗️ 상승 (Rise)"
+    elif slope_pct <= DROP_PCT:
+        return "▼ 하락 (Drop)"
+    return "➖ 보합 (Stable)"
+
+
+@contextmanager
+def _replacing(path, mode, **kwargs):
+    """path 대신 임시 파일을 열어 주고, 다 쓰면 os.replace 로 바꿔 끼웁니다 (실패하면 지움)."""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class PriceStore:
+    """품목 × 국가 주간 시세 저장소. open() 으로 열고, 기록 후 flush() 로 저장합니다."""
+
+    def __init__(self, root, readonly=False, window=DEFAULT_WINDOW):
+        self.root = root
+        self.readonly = readonly
+        self._prices_path = os.path.join(root, "prices.npy")
+        self._state_path = os.path.join(root, "state.npz")
+        self._series_path = os.path.join(root, "series.json")
+
+        if os.path.exists(self._series_path):
+            with open(self._series_path, encoding="utf-8") as f:
+                self.keys = [tuple(k) for k in json.load(f)]
+            with np.load(self._state_path) as state:
+                self.window = int(state["window"])
+                self.start, self.length, self.count = state["start"], state["length"], state["count"]
+                self.s0, self.s1 = state["s0"], state["s1"]
+            del self.keys[len(self.length):]  # flush() 도중이면 state.npz 에 아직 없는 시리즈
+            self.prices = np.lib.format.open_memmap(self._prices_path, mode="r" if readonly else "r+")
+        elif readonly:
+            raise FileNotFoundError(f"시세 저장소가 없습니다: {root}")
+        else:
+            os.makedirs(root, exist_ok=True)
+            self.keys = []
+            self.window = window
+            self.start = np.zeros(0, dtype=np.int64)
+            self.length = np.zeros(0, dtype=np.int64)
+            self.count = np.zeros(0, dtype=np.int64)
+            self.s0 = np.zeros(0)
+            self.s1 = np.zeros(0)
+            self.prices = np.lib.format.open_memmap(self._prices_path, mode="w+", dtype=np.float32,
+                                                    shape=_INITIAL_SHAPE)
+            self.prices[:] = np.nan
+        self._ids = {k: i for i, k in enumerate(self.keys)}
+
+    @classmethod
+    def open(cls, root=DEFAULT_STORE, readonly=False, window=DEFAULT_WINDOW):
+        return cls(root, readonly=readonly, window=window)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def products(self):
+        return sorted({p for p, _ in self.keys})
+
+    def countries(self, product):
+        return sorted(c for p, c in self.keys if p == product)
+
+    # --- 기록 ---
+    def append(self, week, keys, prices):
+        """week 주차의 시세를 시리즈들 끝에 붙입니다.
+
+        keys 는 (품목, 국가) 목록, prices 는 같은 길이의 가격입니다. 마지막 기록 뒤로
+        빠진 주가 있으면 직전 가격으로 채웁니다. 가격이 NaN/무한대인 항목은 그 주 기록이
+        없는 것으로 건너뜁니다 (창 합계에 한 번 들어가면 빠지지 않습니다). 이미 기록된
+        주차 이전이면 ValueError.
+        """
+        if self.readonly:
+            raise ValueError("읽기 전용으로 연 시세 저장소입니다")
+        keys = [tuple(k) for k in keys]
+        if len(set(keys)) != len(keys):
+            raise ValueError("같은 주차에 중복된 품목/국가가 있습니다")
+        # 창 합계는 저장된 값(float32)과 같은 값으로 더하고 빼야 오차가 쌓이지 않습니다
+        y = np.asarray(prices, dtype=np.float32).astype(np.float64)
+        if len(y) != len(keys):
+            raise ValueError("품목/국가 수와 가격 수가 다릅니다")
+        finite = np.isfinite(y)
+        if not finite.all():
+            keys, y = [k for k, ok in zip(keys, finite) if ok], y[finite]
+            if not keys:
+                return
+        day = int(week_day(week))
+        ids = self._ensure_ids(keys, day)
+
+        next_day = self.start[ids] + self.length[ids] * WEEK
+        if (next_day > day).any():
+            stale = [keys[i] for i in np.flatnonzero(next_day > day)[:3]]
+            raise ValueError(f"이미 기록된 주차입니다: {np.datetime64(day, 'D')} {stale}")
+        steps = (day - next_day) // WEEK + 1  # 빈 주 채움 + 이번 주
+        self._reserve(len(self.keys), int((self.length[ids] + steps).max()))
+
+        for k in range(1, int(steps.max())):
+            gap = ids[steps > k]
+            self._push(gap, self.prices[gap, self.length[gap] - 1].astype(np.float64))
+        self._push(ids, y)
+
+    def _ensure_ids(self, keys, day):
+        new = [k for k in keys if k not in self._ids]
+        if new:
+            for k in new:
+                self._ids[k] = len(self.keys)
+                self.keys.append(k)
+            n = len(new)
+            self.start = np.concatenate([self.start, np.full(n, day, dtype=np.int64)])
+            self.length = np.concatenate([self.length, np.zeros(n, dtype=np.int64)])
+            self.count = np.concatenate([self.count, np.zeros(n, dtype=np.int64)])
+            self.s0 = np.concatenate([self.s0, np.zeros(n)])
+            self.s1 = np.concatenate([self.s1, np.zeros(n)])
+        return np.fromiter((self._ids[k] for k in keys), dtype=np.intp, count=len(keys))
+
+    def _push(self, ids, y):
+        """시리즈 ids 끝에 y 를 쓰고 창 합계를 한 칸 밀어 갱신합니다."""
+        w = self.window
+        n, c = self.length[ids], self.count[ids]
+        self.prices[ids, n] = y
+        full = c == w
+        y_old = np.where(full, self.prices[ids, np.maximum(n - w, 0)], 0.0)
+        s0, s1 = self.s0[ids], self.s1[ids]
+        # 창이 찼으면 가장 오래된 값을 빼고 나머지의 t 를 1씩 당김, 아니면 t = c 로 추가
+        self.s1[ids] = np.where(full, s1 - (s0 - y_old) + (w - 1) * y, s1 + c * y)
+        self.s0[ids] = s0 - y_old + y
+        self.count[ids] = np.minimum(c + 1, w)
+        self.length[ids] = n + 1
+
+    def _reserve(self, rows, cols):
+        """prices 행렬이 rows × cols 를 담도록 (필요하면 두 배씩) 키웁니다."""
+        old_rows, old_cols = self.prices.shape
+        if rows <= old_rows and cols <= old_cols:
+            return
+        shape = (max(rows, old_rows * 2 if rows > old_rows else old_rows),
+                 max(cols, old_cols * 2 if cols > old_cols else old_cols))
+        tmp = self._prices_path + ".tmp"
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=shape)
+        grown[:] = np.nan
+        grown[:old_rows, :old_cols] = self.prices
+        grown.flush()
+        del grown
+        self.prices = None
+        os.replace(tmp, self._prices_path)
+        self.prices = np.lib.format.open_memmap(self._prices_path, mode="r+")
+
+    def import_frame(self, df):
+        """PRICE_COLUMNS 컬럼 DataFrame 을 주차 순서대로 붙입니다. 붙인 주차 수를 반환합니다.
+
+        같은 주·품목·국가에 여러 행이 있으면 평균을 씁니다.
+        """
+        missing = [c for c in PRICE_COLUMNS if c not in df.columns]
+        if missing:
+            raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+        df = df[df["price"].notna()]  # 빈 가격 칸은 기록 없음 (append 가 직전 가격으로 채움)
+        df = df.assign(day=week_day(df["week"].astype(str).to_numpy()))
+        weekly = df.groupby(["day", "product", "country"], sort=True)["price"].mean().reset_index()
+        weeks = 0
+        for day, rows in weekly.groupby("day", sort=True):
+            self.append(np.datetime64(int(day), "D"), zip(rows["product"], rows["country"]), rows["price"])
+            weeks += 1
+        return weeks
+
+    def flush(self):
+        if self.readonly:
+            return
+        self.prices.flush()
+        # 파일마다 임시 파일에 쓴 뒤 바꿔 끼웁니다. series.json 을 먼저 두므로 중간에 읽는
+        # 쪽은 state.npz 보다 시리즈가 많을 수만 있고, 그 차이는 열 때 잘라 냅니다.
+        with _replacing(self._series_path, "w", encoding="utf-8") as f:
+            json.dump(self.keys, f, ensure_ascii=False)
+        with _replacing(self._state_path, "wb") as f:
+            np.savez(f, window=self.window, start=self.start, length=self.length,
+                     count=self.count, s0=self.s0, s1=self.s1)
+
+    # --- 조회 ---
+    def summary(self, product, country):
+        """시장 평균가(최신 주 가격)와 창 기울기로 분류한 market_trend. 시리즈가 없으면 None."""
+        i = self._ids.get((product, country))
+        if i is None:
+            return None
+        n = self.count[i]
+        mean = self.s0[i] / n
+        slope = float(window_slope(self.s0[i], self.s1[i], n))
+        slope_pct = slope / mean * 100 if mean > 0 else 0.0
+        last = self.length[i] - 1
+        return {
+            "market_avg_price": float(self.prices[i, last]),
+            "window_mean": float(mean),
+            "slope_pct": slope_pct,
+            "market_trend": classify_trend(slope_pct),
+            "weeks": int(self.length[i]),
+            "last_week": str(np.datetime64(int(self.start[i] + last * WEEK), "D")),
+        }
+
+    def history(self, product, country):
+        """(주 시작일 datetime64 배열, 가격 배열) — 가격은 memmap 뷰입니다."""
+        i = self._ids[(product, country)]
+        n = int(self.length[i])
+        weeks = (self.start[i] + np.arange(n) * WEEK).astype("datetime64[D]")
+        return weeks, self.prices[i, :n]
+
+    def check_window_stats(self):
+        """증분 창 합계가 전체 이력에서 다시 계산한 값과 같은지 대조합니다 (최대 오차 반환).
+
+        창 안의 가격이나 합계가 유한하지 않으면 ValueError.
+        """
+        err = 0.0
+        for i in range(len(self.keys)):
+            n, c = int(self.length[i]), int(self.count[i])
+            y = self.prices[i, n - c:n].astype(np.float64)
+            if not (np.isfinite(y).all() and np.isfinite(self.s0[i]) and np.isfinite(self.s1[i])):
+                raise ValueError(f"창 합계에 유한하지 않은 값이 있습니다: {self.keys[i]}")
+            err = max(err, abs(y.sum() - self.s0[i]), abs((np.arange(c) * y).sum() - self.s1[i]))
+        return err
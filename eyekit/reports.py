@@ -0,0 +1,251 @@
+"""공급사별 1페이지 보고서 일괄 내보내기 (HTML / PDF → zip).
+
+Tool 1 보고서는 판정 카드, 가격 구조 분해 차트, 3D 트렌드 매트릭스, 전략 가이드를,
+Tool 2 보고서는 등급 카드, 입체 분석, 등급별 전략을 담습니다. 차트는 정적 SVG 라
+plotly.js 없이 열리고 PDF 변환기도 그대로 읽습니다.
+
+보고서는 프로세스 풀에서 REPORT_CHUNK 개씩 나눠 만들고, 끝난 묶음부터 zip 에
+바로 이어 씁니다. CSS/페이지 틀과 케이스·등급별 고정 HTML 조각은 워커마다 한 번만
+만들어 두고 보고서마다 값만 채웁니다.
+"""
+import functools
+import os
+import re
+import time
+import zipfile
+from html import escape
+from string import Template
+
+from eyekit.charts import trend_rows, waterfall_svg
+from eyekit.factors import split_factors
+from eyekit.montecarlo import default_workers, process_pool
+from eyekit.negotiation import VERDICTS
+from eyekit.partner import GRADES
+
+REPORT_KINDS = ["offers", "suppliers"]
+REPORT_FORMATS = ["html", "pdf"]
+REPORT_CHUNK = 32          # 워커 작업 단위 (보고서 수)
+NAME_COLUMNS = ["supplier_name", "supplier", "name", "offer_id"]  # 보고서 제목/파일명에 쓸 컬럼 (앞선 것 우선)
+
+REPORT_CSS = """
+@page { size: A4; margin: 14mm; }
+body { font-family: "Noto Sans KR", "Malgun Gothic", sans-serif; color: #333; max-width: 820px; margin: 24px auto; }
+h1 { color: #004e66; font-size: 1.5em; margin: 0 0 4px; }
+h2 { color: #004e66; font-size: 1.1em; margin: 22px 0 8px; }
+.meta { color: #777; font-size: 0.85em; margin-bottom: 16px; }
+.result-card { padding: 20px; border-radius: 12px; border-left: 5px solid #004e66; }
+.verdict-header { font-size: 1.5em; font-weight: 800; margin-bottom: 8px; }
+.verdict-sub { color: #555; line-height: 1.5; }
+.metrics { display: flex; justify-content: space-between; margin-top: 12px; padding-top: 12px;
+           border-top: 1px solid rgba(0,0,0,0.1); text-align: center; }
+.metric-label { font-size: 0.85em; color: #777; font-weight: 600; }
+.metric-value { font-size: 1.15em; font-weight: bold; margin-top: 4px; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9em; }
+th, td { border: 1px solid #dee2e6; padding: 6px 8px; text-align: left; }
+th { background: #f1f3f5; }
+.columns { display: flex; gap: 16px; }
+.columns > div { flex: 1; background: #f8f9fa; border-radius: 8px; padding: 10px 12px; }
+.risk-high { background: #ffe3e3 !important; }
+.risk-low { background: #d3f9d8 !important; }
+svg { max-width: 100%; height: auto; }
+"""
+
+
+# --- 워커별 고정 자산 (한 번만 만들고 재사용) ---
+@functools.lru_cache(maxsize=None)
+def page_template():
+    """보고서 페이지 틀 (CSS 는 공백을 줄여 한 번만 넣어 둠)."""
+    css = re.sub(r"\s+", " ", REPORT_CSS).strip()
+    return Template(
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>$title</title>'
+        f"<style>{css}</style></head><body><h1>$title</h1><div class=\"meta\">$meta</div>$body</body></html>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _verdict_card(case):
+    verdict = VERDICTS[case]
+    return Template(
+        f'<div class="result-card" style="background-color: {verdict["color"]};">'
+        f'<div class="verdict-header">{verdict["icon"]} {escape(verdict["title"])}</div>'
+        f'<div class="verdict-sub">{escape(verdict["desc"])}</div><div class="metrics">'
+        '<div><div class="metric-label">🎯 적정 목표가</div><div class="metric-value">$$$target</div></div>'
+        f'<div><div class="metric-label">⏱️ 구매 타이밍</div><div class="metric-value">{escape(verdict["timing"])}</div></div>'
+        f'<div><div class="metric-label">⚖️ 협상 우위</div><div class="metric-value">{escape(verdict["leverage"])}</div></div>'
+        "</div></div>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _grade_card(grade):
+    info = GRADES[grade]
+    return Template(
+        f'<div class="result-card" style="background-color: {info["color"]}; border-left-color: {info["text_color"]};">'
+        f'<div class="verdict-header" style="color: {info["text_color"]};">{escape(info["title"])}</div>'
+        '<div class="verdict-sub">종합 점수: <strong>$score / 100</strong></div></div>'
+        f'<h2>🎯 전략: {escape(info["strategy_title"])}</h2><p>{escape(info["strategy_desc"])}</p>'
+    )
+
+
+def warm_assets():
+    """워커 시작 시 고정 자산을 미리 만들어 둡니다 (프로세스 풀 initializer)."""
+    page_template()
+    for case in VERDICTS:
+        _verdict_card(case)
+    for grade in GRADES:
+        _grade_card(grade)
+
+
+# --- 보고서 HTML ---
+def report_title(record, index):
+    for column in NAME_COLUMNS:
+        value = record.get(column)
+        if value is not None and str(value).strip() and str(value) != "nan":
+            return str(value).strip()
+    return f"#{index + 1}"
+
+
+def _trend_html(record):
+    rows = trend_rows(str(record["market_trend"]), str(record["forecast_trend"]),
+                      split_factors(record.get("risk_factors")), split_factors(record.get("opp_factors")))
+    head = "".join(f"<th>{escape(c)}</th>" for c in rows)
+    body = "".join("<tr>" + "".join(f"<td>{escape(str(v))}</td>" for v in values) + "</tr>"
+                   for values in zip(*rows.values()))
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+def offer_report(record, index=0):
+    """analyze_offers 결과 한 행 → Tool 1 보고서 HTML."""
+    case = record["case"]
+    market, offer = float(record["market_avg_price"]), float(record["offer_price"])
+    fair, gap, gap_pct = float(record["fair_price"]), float(record["gap"]), float(record["gap_pct"])
+    parts = [
+        _verdict_card(case).substitute(target=f"{float(record['target_price']):.2f}"),
+        "<h2>📊 3D 트렌드 매트릭스 (Trend Matrix)</h2>", _trend_html(record),
+        "<h2>💰 가격 포지셔닝 (Price Positioning)</h2>", waterfall_svg(market, offer, fair, gap),
+    ]
+    if gap > 0:
+        parts.append(f"<p>💡 제안가에는 인정 프리미엄 외에도 <strong>${gap:.2f}/kg ({gap_pct:.1f}%)</strong>의 "
+                     "설명되지 않는 추가 마진(Bubble)이 포함되어 있습니다.</p>")
+    what_if = ""
+    forecast = record.get("forecast_price")
+    if forecast is not None and forecast == forecast:  # NaN 제외
+        what_if = f"<div><strong>🔮 왓 이프 (What-If)</strong><br>Wait: 2주 대기 시 예상가 <strong>${float(forecast):.2f}</strong></div>"
+    parts.append(f'<h2>📝 전략 가이드 (Strategy Action)</h2><div class="columns"><div><strong>🔥 핵심 협상 포인트</strong>'
+                 f'<br>{escape(VERDICTS[case]["strategy"])}</div>{what_if}</div>')
+    return page_template().substitute(
+        title=escape(report_title(record, index)),
+        meta=f"Tool 1 협상 진단 · 시장 평균가 ${market:.2f} · 제안가 ${offer:.2f} · {case}",
+        body="".join(parts),
+    )
+
+
+def supplier_report(record, index=0):
+    """validate_suppliers 결과 한 행 → Tool 2 보고서 HTML."""
+    dependency = str(record["dependency"])
+    risk = "risk-high" if "높음" in dependency else "risk-low"
+    body = (
+        _grade_card(record["grade"]).substitute(score=int(record["score"]))
+        + '<h2>✅ 입체 분석 (Audit Details)</h2><div class="columns">'
+        f'<div><strong>📈 성장성</strong><br>{escape(str(record["volume_trend"]))}</div>'
+        f'<div><strong>🏆 평판</strong><br>{escape(str(record["buyer_tier"]))}</div>'
+        f'<div class="{risk}"><strong>🛡️ 리스크</strong><br>의존도 {escape(dependency)}</div></div>'
+        f'<p>주요 수출 대상국: {escape(", ".join(split_factors(record.get("destinations"))) or "-")} · '
+        f'내 국가 수출 이력: {escape(str(record["export_history"]))}</p>'
+    )
+    return page_template().substitute(title=escape(report_title(record, index)),
+                                      meta=f"Tool 2 파트너 검증 · {record['grade']}", body=body)
+
+
+RENDERERS = {"offers": offer_report, "suppliers": supplier_report}
+
+
+def pdf_available():
+    """PDF 변환기(weasyprint)가 설치되어 있는지."""
+    import importlib.util
+
+    return importlib.util.find_spec("weasyprint") is not None
+
+
+def _to_pdf(html):
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        raise ValueError("PDF 내보내기에는 weasyprint 가 필요합니다 (pip install weasyprint)") from None
+    return HTML(string=html).write_pdf()
+
+
+def _file_name(title, index, fmt):
+    slug = re.sub(r"[^\w.-]+", "_", title).strip("_")[:60] or "report"
+    return f"{index + 1:05d}_{slug}.{fmt}"
+
+
+def render_chunk(args):
+    """프로세스 풀 작업 단위: (종류, 형식, 시작 번호, 레코드 목록) → [(파일명, bytes)]."""
+    kind, fmt, start, records = args
+    render = RENDERERS[kind]
+    out = []
+    for i, record in enumerate(records, start):
+        html = render(record, i)
+        data = _to_pdf(html) if fmt == "pdf" else html.encode("utf-8")
+        out.append((_file_name(report_title(record, i), i, fmt), data))
+    return out
+
+
+# --- 일괄 내보내기 ---
+def report_records(kind, df):
+    """일괄 결과(또는 원본 입력) DataFrame → 보고서 레코드 목록. 판정/채점 컬럼이 없으면 먼저 계산합니다."""
+    if kind not in RENDERERS:
+        raise ValueError(f"보고서 종류는 {', '.join(REPORT_KINDS)} 중 하나여야 합니다: {kind}")
+    if kind == "offers" and "case" not in df.columns:
+        from eyekit.negotiation import analyze_offers
+
+        df = analyze_offers(df)
+    elif kind == "suppliers" and "grade" not in df.columns:
+        from eyekit.partner import validate_suppliers
+
+        df = validate_suppliers(df)
+    return df.to_dict("records")
+
+
+def export_reports(kind, records, dest, fmt="html", workers=None, chunk=REPORT_CHUNK, compress=False,
+                   on_progress=None):
+    """레코드마다 보고서를 만들어 zip(dest: 경로 또는 바이너리 파일 객체)에 이어 씁니다.
+
+    workers 가 1 이면 현재 프로세스에서, 그 외에는 프로세스 풀에서 chunk 개씩 렌더링합니다.
+    zip 기록은 메인 프로세스 한 곳에서 일어나므로 기본은 무압축 저장이고(렌더링의 1/5 정도),
+    compress=True 면 deflate 로 크기를 절반쯤 줄이는 대신 코어를 늘려도 그만큼 빨라지지 않습니다.
+    on_progress(완료 수, 전체 수) 가 묶음마다 호출됩니다. 보고서 수, 소요 시간, zip 크기를 반환합니다.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"보고서 형식은 {', '.join(REPORT_FORMATS)} 중 하나여야 합니다: {fmt}")
+    if fmt == "pdf" and not pdf_available():
+        _to_pdf("")  # 설치 안내 오류
+    started = time.perf_counter()
+    jobs = [(kind, fmt, start, records[start:start + chunk]) for start in range(0, len(records), chunk)]
+    workers = max(1, min(default_workers() if workers is None else workers, len(jobs)))
+    done = 0
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(dest, "w", compression=compression, compresslevel=1 if compress else None) as archive:
+        if workers == 1:
+            warm_assets()
+            results = map(render_chunk, jobs)
+            pool = None
+        else:
+            pool = process_pool(workers, initializer=warm_assets)
+            results = pool.map(render_chunk, jobs)
+        try:
+            for files in results:
+                for name, data in files:
+                    archive.writestr(name, data)
+                done += len(files)
+                if on_progress is not None:
+                    on_progress(done, len(records))
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(dest) if isinstance(dest, (str, os.PathLike)) else dest.tell()
+    return {"reports": done, "seconds": elapsed, "reports_per_sec": done / elapsed if elapsed > 0 else 0.0,
+            "bytes": size, "workers": workers}
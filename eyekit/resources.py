@@ -0,0 +1,127 @@
+"""한 서버 프로세스를 여러 사용자가 함께 쓸 때의 메모리 관리.
+
+공유 참조 데이터(판정 규칙 표, 시세 저장소, 공급사 디렉터리 등)는 프로세스에 한 벌만
+두고 모든 세션이 같은 객체를 읽습니다 (st.cache_resource 는 복사하지 않고 같은 객체를
+돌려줍니다). freeze() 는 그 안의 NumPy 배열을 쓰기 금지로 바꿔, 어느 세션이 실수로
+고쳐 쓰면 다른 세션을 오염시키기 전에 오류가 나게 합니다.
+
+MemoryLedger 는 컴포넌트별 객체를 약한 참조로 모아 크기를 집계합니다. 캐시에서 빠지거나
+세션이 닫혀 객체가 사라지면 집계에서도 저절로 빠집니다. 세션이 쌓아 둘 수 있는 일괄
+결과의 크기는 EYEKIT_SESSION_MB 로 제한합니다.
+"""
+import os
+import sys
+import threading
+import types
+import weakref
+from collections import deque
+
+import numpy as np
+
+DEFAULT_SESSION_MB = float(os.environ.get("EYEKIT_SESSION_MB", "256"))
+# sizeof() 가 따라가지 않는 객체: 클래스/모듈/함수는 모든 인스턴스가 공유하는 코드입니다
+_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+         weakref.ref, threading.Thread)
+
+
+def freeze(obj):
+    """obj(배열, 또는 배열 속성을 가진 객체) 안의 NumPy 배열을 쓰기 금지로 바꾸고 obj 를 돌려줍니다."""
+    arrays = [obj] if isinstance(obj, np.ndarray) else [v for v in vars(obj).values() if isinstance(v, np.ndarray)]
+    for array in arrays:
+        array.setflags(write=False)
+    return obj
+
+
+def sizeof(obj):
+    """obj 가 잡고 있는 메모리 추정 (bytes).
+
+    컨테이너와 객체 속성을 끝까지 따라가며 같은 객체는 한 번만 셉니다. NumPy/Arrow 는
+    nbytes, pandas 는 memory_usage(deep=True), Plotly 그림은 to_plotly_json() 내용으로
+    셉니다. memmap 은 파일 매핑(페이지 캐시)이라 0 으로 셉니다.
+    """
+    seen = {}  # id → 객체 (임시로 만든 객체의 id 가 재사용되지 않게 붙잡아 둡니다)
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SKIP):
+            continue
+        seen[id(item)] = item
+        if isinstance(item, np.memmap):
+            continue
+        if isinstance(item, (str, bytes, bytearray, int, float, complex, bool)):
+            total += sys.getsizeof(item)
+        elif hasattr(item, "memory_usage") and hasattr(item, "dtypes"):  # pandas DataFrame/Series
+            total += int(np.sum(item.memory_usage(index=True, deep=True)))
+        elif getattr(item, "nbytes", None) is not None:
+            nbytes = item.nbytes
+            total += int(nbytes() if callable(nbytes) else nbytes)
+        elif hasattr(item, "to_plotly_json"):
+            total += sys.getsizeof(item)
+            stack.append(item.to_plotly_json())
+        else:
+            total += sys.getsizeof(item)
+            if isinstance(item, dict):
+                stack.extend(v for kv in list(item.items()) for v in kv)  # list() 로 한 번에 떠서 순회
+            elif isinstance(item, (list, tuple, set, frozenset, deque)):
+                stack.extend(list(item))
+            elif hasattr(item, "__dict__"):
+                stack.extend(list(vars(item).values()))
+    return total
+
+
+def process_memory():
+    """현재 프로세스 메모리 (bytes): rss 현재 상주, peak 최대 상주."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return {"rss": int(fields["VmRSS"].split()[0]) * 1024, "peak": int(fields["VmHWM"].split()[0]) * 1024}
+    except (OSError, KeyError, ValueError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # macOS 는 bytes, Linux 는 KB
+        return {"rss": peak, "peak": peak}
+
+
+class MemoryLedger:
+    """컴포넌트 이름 → 객체 (약한 참조) 목록. owner 는 세션 등 소유자 구분용입니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items = {}  # id(obj) -> (컴포넌트, 소유자, weakref)
+
+    def track(self, component, obj, owner=None):
+        """obj 를 집계 대상으로 등록하고 그대로 돌려줍니다."""
+        with self._lock:
+            self._prune()
+            self._items[id(obj)] = (component, owner, weakref.ref(obj))
+        return obj
+
+    def _live(self):
+        with self._lock:
+            self._prune()
+            return [(component, owner, ref()) for component, owner, ref in self._items.values()]
+
+    def _prune(self):
+        for key in [k for k, (_, _, ref) in self._items.items() if ref() is None]:
+            del self._items[key]
+
+    def usage(self):
+        """컴포넌트 → {"objects", "owners", "bytes"} (살아 있는 객체만)."""
+        summary = {}
+        for component, owner, obj in self._live():
+            if obj is None:
+                continue
+            entry = summary.setdefault(component, {"objects": 0, "owners": set(), "bytes": 0})
+            entry["objects"] += 1
+            entry["bytes"] += sizeof(obj)
+            if owner is not None:
+                entry["owners"].add(owner)
+        for entry in summary.values():
+            entry["owners"] = len(entry["owners"])
+        return summary
+
+    def owner_bytes(self, owner):
+        """소유자 하나가 잡고 있는 객체 크기 합."""
+        return sum(sizeof(obj) for _, o, obj in self._live() if o == owner and obj is not None)
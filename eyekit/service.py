@@ -0,0 +1,268 @@
+"""로컬 JSON 채점 서비스 (Streamlit 없이 Tool 1 판정 / Tool 2 등급).
+
+asyncio 만으로 HTTP/1.1 (keep-alive) 을 처리하는 작은 서버입니다.
+
+    POST /negotiate   analyze_offer 인자 객체 또는 그 배열 → 판정 결과 (같은 모양)
+    POST /validate    validate_supplier 인자 객체 또는 그 배열 → 등급 결과
+    GET  /health      {"status": "ok"}
+    GET  /stats       엔드포인트별 배치 수, 평균 배치 크기
+
+엔드포인트마다 MicroBatcher 가 있어, window 초 안에 도착한 요청들을 모아
+analyze_offer_records / validate_supplier_records 한 번으로 평가합니다. 동시 요청이
+많을수록 요청당 파이썬 오버헤드가 줄고, 한가할 때 추가 지연은 최대 window 입니다.
+
+    python -m eyekit serve --port 8765 --window-ms 2
+"""
+import asyncio
+import json
+import math
+import time
+from http import HTTPStatus
+
+from eyekit.negotiation import analyze_offer_records
+from eyekit.partner import SUPPLIER_COLUMNS, validate_supplier_records
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WINDOW_MS = 2.0
+MAX_BATCH = 1_024        # 이만큼 모이면 window 를 기다리지 않고 바로 평가
+MAX_BODY = 1 << 20       # 요청 본문 상한 (bytes)
+
+OFFER_NUMBERS = ["market_avg_price", "offer_price", "supplier_avg_margin"]
+OFFER_LABELS = ["market_trend", "forecast_trend"]
+OFFER_FACTORS = ["risk_factors", "opp_factors"]
+
+
+class RequestError(ValueError):
+    """클라이언트 잘못 (4xx). status 로 응답 코드를 지정합니다."""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+# --- 입력 검증: 엔진 인자 dict 로 정리 ---
+def _factors(value, field):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+    raise RequestError(f"{field} 는 문자열 배열 또는 ';' 구분 문자열이어야 합니다")
+
+
+def offer_args(item):
+    """/negotiate 요청 객체 → analyze_offer 인자."""
+    if not isinstance(item, dict):
+        raise RequestError("요청 항목은 JSON 객체여야 합니다")
+    missing = [c for c in OFFER_NUMBERS + OFFER_LABELS if c not in item]
+    if missing:
+        raise RequestError(f"필수 필드가 없습니다: {', '.join(missing)}")
+    args = {}
+    for field in OFFER_NUMBERS:
+        value = item[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise RequestError(f"{field} 는 숫자여야 합니다")
+        try:
+            value = float(value)
+        except OverflowError:
+            value = math.inf
+        if not math.isfinite(value):  # 10**400, NaN, Infinity 는 같은 배치의 다른 요청까지 깨뜨립니다
+            raise RequestError(f"{field} 는 유한한 숫자여야 합니다")
+        args[field] = value
+    for field in OFFER_LABELS:
+        args[field] = str(item[field])
+    for field in OFFER_FACTORS:
+        args[field] = _factors(item.get(field), field)
+    return args
+
+
+def supplier_args(item):
+    """/validate 요청 객체 → validate_supplier 인자."""
+    if not isinstance(item, dict):
+        raise RequestError("요청 항목은 JSON 객체여야 합니다")
+    missing = [c for c in SUPPLIER_COLUMNS if c not in item]
+    if missing:
+        raise RequestError(f"필수 필드가 없습니다: {', '.join(missing)}")
+    args = {c: str(item[c]) for c in SUPPLIER_COLUMNS}
+    args["destinations"] = _factors(item["destinations"], "destinations")
+    return args
+
+
+# --- 마이크로 배치 ---
+class MicroBatcher:
+    """window 초 동안 들어온 요청을 모아 evaluate(레코드 목록) 한 번으로 처리합니다."""
+
+    def __init__(self, evaluate, window=DEFAULT_WINDOW_MS / 1000, max_batch=MAX_BATCH):
+        self.evaluate = evaluate
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+        self._pending = []   # (레코드 목록, future)
+        self._size = 0
+        self._timer = None
+
+    async def submit(self, records):
+        """레코드 목록을 다음 배치에 넣고, 같은 순서의 결과 목록을 기다립니다."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((records, future))
+        self._size += len(records)
+        if self._size >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._size = self._pending, [], 0
+        if not pending:
+            return
+        records = [r for batch, _ in pending for r in batch]
+        try:
+            results = self.evaluate(records)
+        except Exception:  # 배치 실패 → 요청별로 다시 평가해 잘못된 요청만 실패시킵니다
+            self._settle_each(pending)
+            return
+        self.batches += 1
+        self.items += len(records)
+        self.largest = max(self.largest, len(records))
+        start = 0
+        for batch, future in pending:
+            if not future.done():
+                future.set_result(results[start:start + len(batch)])
+            start += len(batch)
+
+    def _settle_each(self, pending):
+        for batch, future in pending:
+            if future.done():
+                continue
+            try:
+                results = self.evaluate(batch)
+            except Exception as exc:
+                future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            self.largest = max(self.largest, len(batch))
+            future.set_result(results)
+
+    def stats(self):
+        return {"batches": self.batches, "items": self.items, "largest": self.largest,
+                "mean_batch": self.items / self.batches if self.batches else 0.0}
+
+
+# --- HTTP ---
+class ScoringService:
+    """엔드포인트 → (입력 정리 함수, MicroBatcher)."""
+
+    def __init__(self, window_ms=DEFAULT_WINDOW_MS, max_batch=MAX_BATCH):
+        window = window_ms / 1000
+        self.routes = {
+            "/negotiate": (offer_args, MicroBatcher(analyze_offer_records, window, max_batch)),
+            "/validate": (supplier_args, MicroBatcher(validate_supplier_records, window, max_batch)),
+        }
+        self.started = time.time()
+        self.requests = 0
+
+    async def handle(self, method, path, body):
+        """(상태 코드, 응답 객체). 입력 오류는 RequestError 로 올립니다."""
+        path = path.split("?", 1)[0]
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return HTTPStatus.OK, {"uptime": time.time() - self.started, "requests": self.requests,
+                                   **{p: b.stats() for p, (_, b) in self.routes.items()}}
+        if path not in self.routes:
+            raise RequestError(f"없는 경로입니다: {path}", HTTPStatus.NOT_FOUND)
+        if method != "POST":
+            raise RequestError("POST 만 지원합니다", HTTPStatus.METHOD_NOT_ALLOWED)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise RequestError("본문이 올바른 JSON 이 아닙니다") from None
+
+        parse, batcher = self.routes[path]
+        single = not isinstance(payload, list)
+        records = [parse(item) for item in ([payload] if single else payload)]
+        self.requests += 1
+        results = await batcher.submit(records) if records else []
+        return HTTPStatus.OK, results[0] if single else results
+
+    async def serve_client(self, reader, writer):
+        """연결 하나에서 keep-alive 로 요청을 차례로 처리합니다."""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, payload = await self.handle(method, path, body)
+                except RequestError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except Exception as exc:  # 엔진 오류는 연결을 끊지 않고 500 으로 알립니다
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except RequestError as exc:  # 요청 자체를 읽지 못함 → 응답 후 연결 종료
+            writer.write(_response(exc.status, {"error": str(exc)}, keep_alive=False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    """(메서드, 경로, 헤더 dict, 본문 bytes). 연결이 닫혔으면 None."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise RequestError("잘못된 요청 줄입니다") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise RequestError("Content-Length 가 올바르지 않습니다") from None
+    if length > MAX_BODY:
+        raise RequestError(f"본문이 너무 큽니다 (최대 {MAX_BODY:,} bytes)", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, window_ms=DEFAULT_WINDOW_MS, max_batch=MAX_BATCH,
+                ready=None):
+    """서비스를 띄우고 끝날 때까지 실행합니다. ready(주소) 는 바인딩 직후 호출됩니다."""
+    service = ScoringService(window_ms, max_batch)
+    server = await asyncio.start_server(service.serve_client, host, port, backlog=1024)
+    if ready is not None:
+        ready(server.sockets[0].getsockname())
+    async with server:
+        await server.serve_forever()
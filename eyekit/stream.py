@@ -0,0 +1,396 @@
+"""감시 폴더 스트리밍 (Tool 1 판정 증분 재평가).
+
+데이터팀이 하루 동안 폴더에 떨구는 제안/시세 스냅샷 파일을 폴링으로 감시합니다.
+새로 생기거나 바뀐 파일만 읽고, 그 파일 때문에 입력이 달라진 제안만 다시 판정해
+판정이 바뀐 제안(예: Case 4 '골든 타임' 신규 진입)을 변경 이벤트로 내보냅니다.
+
+파이프라인은 제너레이터 단계로 이어집니다.
+
+    scan_changes(폴더)    → (경로, 파일 상태)        새로 생기거나 바뀌거나 지워진 파일만
+    read_snapshots(...)   → (경로, 상태, 종류, 내용)  종류: offers / market / removed / error
+    VerdictStream.poll()  → 판정 변경 이벤트 목록
+
+파일 종류는 컬럼으로 구분합니다.
+
+- 제안 파일: offer_id + OFFER_COLUMNS. product, country 가 있으면 시세 스냅샷과
+  연결되어, 스냅샷 값이 파일의 market_avg_price / market_trend 보다 우선합니다
+  (연결된 제안은 두 컬럼을 비워 둬도 됩니다).
+- 시세 스냅샷: MARKET_COLUMNS (product, country, market_avg_price, market_trend)
+
+제안 파일이 바뀌면 이전 내용과 비교해 입력이 달라진 행만, 시세 스냅샷이 들어오면
+값이 바뀐 품목/국가에 연결된 제안만 다시 판정합니다. 읽는 양은 바뀐 파일 크기,
+판정하는 양은 실제로 달라진 제안 수에 비례합니다.
+
+같은 offer_id / 품목·국가가 여러 파일에 있으면 가장 나중에 읽은 파일 값을 씁니다.
+파일이 지워지면 그 파일이 주던 값은 남은 파일 값으로 돌아가고, 남은 파일에도 없으면
+제안(과 연결된 시세)이 빠집니다. 숫자가 아니거나 빈 값이 있는 행은 건너뛰고 errors 에
+남깁니다.
+"""
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from eyekit.negotiation import CASE_CODES, OFFER_COLUMNS, VERDICTS, analyze_offers
+
+DEFAULT_WATCH_FOLDER = os.environ.get("EYEKIT_WATCH_FOLDER", os.path.join("data", "inbox"))
+DEFAULT_INTERVAL = 2.0  # 폴링 간격 (초)
+SETTLE_SECONDS = 1.0    # 마지막 수정 후 이 시간이 지난 파일만 읽음 (쓰는 중인 파일 제외)
+EVENT_LOG = 1_000       # 보관할 최근 변경 이벤트 수
+
+OFFER_KEY = "offer_id"
+MARKET_KEY = ["product", "country"]
+MARKET_FIELDS = ["market_avg_price", "market_trend"]
+MARKET_COLUMNS = MARKET_KEY + MARKET_FIELDS
+INPUT_COLUMNS = OFFER_COLUMNS + MARKET_KEY  # 제안별로 보관하는 입력 (튜플 순서)
+NUMBER_COLUMNS = ["market_avg_price", "offer_price", "supplier_avg_margin"]
+SNAPSHOT_SUFFIXES = (".csv", ".parquet", ".pq")
+
+
+# --- 파이프라인 단계 ---
+def scan_changes(folder, seen, settle=SETTLE_SECONDS):
+    """폴더를 한 번 훑어 seen 과 다른 파일의 (경로, 상태) 를 내보냅니다.
+
+    상태는 (수정 시각 ns, 크기), 지워진 파일은 None 입니다. 숨김/임시 파일과
+    settle 초 안에 수정된 파일(아직 쓰는 중일 수 있음)은 다음 폴링으로 미룹니다.
+    """
+    now = time.time_ns()
+    present = set()
+    with os.scandir(folder) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.name.startswith((".", "~")) or not entry.name.lower().endswith(SNAPSHOT_SUFFIXES):
+                continue
+            if not entry.is_file():
+                continue
+            present.add(entry.path)
+            stat = entry.stat()
+            state = (stat.st_mtime_ns, stat.st_size)
+            if seen.get(entry.path) != state and now - stat.st_mtime_ns >= settle * 1e9:
+                yield entry.path, state
+    for path in sorted(set(seen) - present):
+        yield path, None
+
+
+def read_table(path):
+    """CSV/Parquet 파일 → DataFrame (offer_id 는 문자열로 읽음)."""
+    import pandas as pd
+
+    if path.lower().endswith((".parquet", ".pq")):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype={OFFER_KEY: str})
+    if OFFER_KEY in df.columns:
+        df[OFFER_KEY] = df[OFFER_KEY].astype(str)
+    return df
+
+
+def snapshot_kind(df):
+    """컬럼으로 파일 종류를 정합니다 (offers / market)."""
+    if OFFER_KEY in df.columns:
+        linked = all(c in df.columns for c in MARKET_KEY)
+        required = [c for c in OFFER_COLUMNS if not (linked and c in MARKET_FIELDS)]
+        missing = [c for c in required if c not in df.columns]
+        if missing:
+            raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+        return "offers"
+    missing = [c for c in MARKET_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"제안({OFFER_KEY}) 또는 시세 스냅샷 파일이 아닙니다. 필수 컬럼이 없습니다: {', '.join(missing)}")
+    return "market"
+
+
+def coerce_numbers(df):
+    """숫자 컬럼(NUMBER_COLUMNS)을 숫자로 바꿉니다. 숫자가 아닌 값은 NaN 이 됩니다."""
+    import pandas as pd
+
+    columns = [c for c in NUMBER_COLUMNS if c in df.columns]
+    return df.assign(**{c: pd.to_numeric(df[c], errors="coerce") for c in columns}) if columns else df
+
+
+def read_snapshots(changes):
+    """(경로, 상태) 마다 파일을 읽어 (경로, 상태, 종류, DataFrame 또는 예외) 를 내보냅니다.
+
+    읽기에 실패한 파일은 종류 "error" 로 내보내고 다음 파일로 넘어갑니다. 숫자 컬럼은
+    coerce_numbers() 를 거치므로 'abc' 같은 값은 NaN 으로 들어옵니다.
+    """
+    for path, state in changes:
+        if state is None:
+            yield path, state, "removed", None
+            continue
+        try:
+            df = read_table(path)
+            yield path, state, snapshot_kind(df), coerce_numbers(df)
+        except (OSError, ValueError) as exc:
+            yield path, state, "error", exc
+
+
+# --- 증분 판정 ---
+class VerdictStream:
+    """감시 폴더의 제안별 최신 판정과 변경 이벤트.
+
+    poll() 을 여러 스레드(세션)에서 불러도 되도록 잠금으로 감쌉니다. 이벤트에는
+    증가하는 seq 가 붙으므로 구독자는 events_since(마지막 seq) 로 새 변경만 받습니다.
+    첫 poll() 은 기준선이라 이벤트를 남기지 않습니다.
+    """
+
+    def __init__(self, folder=DEFAULT_WATCH_FOLDER, settle=SETTLE_SECONDS, max_events=EVENT_LOG):
+        self.folder = folder
+        self.settle = settle
+        self.seen = {}          # 경로 → (mtime_ns, size)
+        self.frames = {}        # 제안 파일 경로 → offer_id 인덱스 DataFrame (다음 버전과 비교용)
+        self.owner = {}         # offer_id → 제안 파일 경로 (나중에 읽은 파일이 우선)
+        self.inputs = {}        # offer_id → INPUT_COLUMNS 순서의 입력 튜플
+        self.market = {}        # (product, country) → (market_avg_price, market_trend)
+        self.market_owner = {}  # (product, country) → 시세 파일 경로 (나중에 읽은 파일이 우선)
+        self.market_files = {}  # 시세 파일 경로 → {(product, country): (가격, 추세)}
+        self.loaded = {}        # 파일 경로 → 읽은 순번 (지운 파일의 값을 넘겨받을 파일 고르기)
+        self.linked = {}        # (product, country) → {offer_id}
+        self.verdicts = {}      # offer_id → 케이스 ID (시세가 아직 없으면 없음)
+        self.counts = Counter()
+        self.events = deque(maxlen=max_events)
+        self.errors = deque(maxlen=50)
+        self.seq = 0
+        self.polls = 0
+        self.last_poll = {}
+        self._reads = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.owner)
+
+    def poll(self):
+        """폴더를 한 번 훑어 바뀐 파일을 반영하고, 이번에 생긴 변경 이벤트를 반환합니다."""
+        with self._lock:
+            started = time.perf_counter()
+            baseline = self.polls == 0
+            new_events, files, evaluated = [], 0, 0
+            for path, state, kind, payload in read_snapshots(scan_changes(self.folder, self.seen, self.settle)):
+                files += 1
+                if state is None:
+                    self.seen.pop(path, None)
+                else:
+                    self.seen[path] = state
+                if kind == "error":
+                    self._error(path, payload)
+                    continue
+                if kind == "removed":
+                    self.loaded.pop(path, None)
+                else:
+                    self._reads += 1
+                    self.loaded[path] = self._reads
+                # 같은 경로의 파일 종류가 바뀌었으면 이전 종류로 반영한 내용부터 걷어냅니다
+                if kind == "offers":
+                    affected = self._drop_market(path) | self._load_offers(path, payload)
+                elif kind == "market":
+                    affected = self._drop_offers(path) | self._load_market(path, payload)
+                else:
+                    affected = self._drop_offers(path) | self._drop_market(path)
+                evaluated += len(affected)
+                new_events += self._evaluate(affected, os.path.basename(path))
+
+            self.polls += 1
+            if not baseline:
+                self.events.extend(new_events)
+            self.last_poll = {"files": files, "evaluated": evaluated, "changes": len(new_events),
+                              "ms": (time.perf_counter() - started) * 1000, "baseline": baseline}
+            return [] if baseline else new_events
+
+    def follow(self, interval=DEFAULT_INTERVAL):
+        """interval 초마다 poll() 해 변경 이벤트 목록을 끝없이 내보냅니다."""
+        while True:
+            yield self.poll()
+            time.sleep(interval)
+
+    def events_since(self, seq):
+        """seq 이후의 이벤트 (보관 중인 것만)."""
+        with self._lock:
+            return [e for e in self.events if e["seq"] > seq]
+
+    def summary(self):
+        """케이스별 제안 수 (CASE_CODES 순서) 와 시세 대기 중인 제안 수."""
+        with self._lock:
+            return {c: self.counts.get(c, 0) for c in CASE_CODES}, len(self.owner) - len(self.verdicts)
+
+    def _error(self, path, error):
+        self.errors.append({"time": time.strftime("%H:%M:%S"), "file": os.path.basename(path), "error": str(error)})
+
+    def _skip_rows(self, path, df, bad, label):
+        """bad 행을 errors 에 알리고 뺀 DataFrame 을 돌려줍니다."""
+        if bad.any():
+            examples = ", ".join(str(v) for v in df.loc[bad, label].head(3).tolist())
+            self._error(path, f"숫자가 아니거나 빈 값이 있는 {int(bad.sum()):,}행을 건너뜁니다 (예: {examples})")
+        return df[~bad]
+
+    # --- 파일 반영: 다시 판정할 offer_id 집합을 돌려줍니다 ---
+    # 같은 offer_id / 품목·국가가 여러 파일에 있으면 가장 나중에 읽은 파일의 값을 씁니다.
+    # 그 파일에서 빠지거나 파일이 지워지면 남은 파일 중 가장 나중에 읽은 파일 값으로 돌아갑니다.
+    def _load_offers(self, path, df):
+        df = df.drop_duplicates(OFFER_KEY, keep="last")
+        df = self._skip_rows(path, df, df["offer_price"].isna() | df["supplier_avg_margin"].isna(), OFFER_KEY)
+        df = df.set_index(OFFER_KEY)
+        frame = df[[c for c in INPUT_COLUMNS if c in df.columns]]
+        old = self.frames.get(path)
+        if old is None or list(old.columns) != list(frame.columns):
+            changed = list(frame.index)
+            removed = [] if old is None else list(old.index.difference(frame.index))
+        else:
+            common = frame.index.intersection(old.index)
+            a, b = frame.loc[common], old.loc[common]
+            same = ((a == b) | (a.isna() & b.isna())).all(axis=1).to_numpy()
+            changed = list(frame.index.difference(old.index)) + list(common[~same])
+            removed = list(old.index.difference(frame.index))
+        # 다른 파일이 갖고 있던 행은 내용이 같아도 이 파일(방금 읽음)로 넘겨받습니다
+        changed += [oid for oid in frame.index.difference(changed) if self.owner.get(oid) != path]
+        self.frames[path] = frame
+
+        for oid, values in zip(changed, _records(frame.loc[changed])):
+            self._adopt(oid, path, values)
+        gone = [oid for oid in removed if self.owner.get(oid) == path]
+        for oid in gone:
+            self._fallback_offer(oid)
+        return set(changed) | set(gone)
+
+    def _drop_offers(self, path):
+        old = self.frames.pop(path, None)
+        if old is None:
+            return set()
+        removed = [oid for oid in old.index if self.owner.get(oid) == path]
+        for oid in removed:
+            self._fallback_offer(oid)
+        return set(removed)
+
+    def _adopt(self, oid, path, values):
+        self._forget(oid)  # 이전 버전 / 다른 파일에서의 연결 해제
+        self.owner[oid] = path
+        self.inputs[oid] = values
+        key = _market_key(values)
+        if key is not None:
+            self.linked.setdefault(key, set()).add(oid)
+
+    def _fallback_offer(self, oid):
+        """oid 를 가진 남은 제안 파일 중 가장 나중에 읽은 파일 값으로, 없으면 잊습니다."""
+        holders = [p for p, frame in self.frames.items() if oid in frame.index]
+        if not holders:
+            self._forget(oid)
+            return
+        path = max(holders, key=lambda p: self.loaded.get(p, -1))
+        frame = self.frames[path]
+        self._adopt(oid, path, _records(frame.loc[[oid]])[0])
+
+    def _load_market(self, path, df):
+        df = df[MARKET_COLUMNS]
+        df = self._skip_rows(path, df, df.isna().any(axis=1), "product")
+        values = {(product, country): (float(price), str(trend))
+                  for product, country, price, trend in df.itertuples(index=False, name=None)}
+        old = self.market_files.get(path, {})
+        self.market_files[path] = values
+        affected = set()
+        for key, value in values.items():
+            affected |= self._set_market(key, path, value)
+        return affected | self._release_market(path, set(old) - set(values))
+
+    def _drop_market(self, path):
+        return self._release_market(path, set(self.market_files.pop(path, {})))
+
+    def _set_market(self, key, path, value):
+        self.market_owner[key] = path
+        if self.market.get(key) == value:
+            return set()
+        self.market[key] = value
+        return set(self.linked.get(key, set()))
+
+    def _release_market(self, path, keys):
+        """path 가 주던 시세 키를 남은 시세 파일 값으로 바꾸거나 (없으면) 지우고, 연결된 제안을 돌려줍니다."""
+        affected = set()
+        for key in keys:
+            if self.market_owner.get(key) != path:
+                continue
+            holders = [p for p, values in self.market_files.items() if key in values]
+            if holders:
+                source = max(holders, key=lambda p: self.loaded.get(p, -1))
+                affected |= self._set_market(key, source, self.market_files[source][key])
+            else:
+                del self.market_owner[key]
+                self.market.pop(key, None)
+                affected |= self.linked.get(key, set())
+        return affected
+
+    def _forget(self, oid):
+        values = self.inputs.pop(oid, None)
+        self.owner.pop(oid, None)
+        key = None if values is None else _market_key(values)
+        if key is not None:
+            self.linked.get(key, set()).discard(oid)
+
+    # --- 판정 ---
+    def _inputs(self, ids):
+        """offer_id 들의 판정 입력 DataFrame (시세 스냅샷 반영, 시세가 없는 행은 제외)."""
+        import pandas as pd
+
+        kept = [oid for oid in ids if oid in self.inputs]
+        if not kept:
+            return None
+        records = [self.inputs[oid] for oid in kept]
+        rows = pd.DataFrame.from_records(records, columns=INPUT_COLUMNS, index=kept)
+        if self.market:
+            snap = [self.market.get(_market_key(v)) for v in records]
+            if any(snap):
+                price, trend = INPUT_COLUMNS.index("market_avg_price"), INPUT_COLUMNS.index("market_trend")
+                rows["market_avg_price"] = [s[0] if s else v[price] for s, v in zip(snap, records)]
+                rows["market_trend"] = [s[1] if s else v[trend] for s, v in zip(snap, records)]
+        rows["market_avg_price"] = pd.to_numeric(rows["market_avg_price"], errors="coerce")
+        return rows[rows["market_avg_price"].notna() & rows["market_trend"].notna()]
+
+    def _evaluate(self, ids, source):
+        if not ids:
+            return []
+        rows = self._inputs(ids)
+        scored = analyze_offers(rows) if rows is not None and len(rows) else None
+        after = {} if scored is None else {
+            oid: values for oid, *values in zip(
+                scored.index.tolist(), scored["case"].tolist(), scored["gap_pct"].tolist(),
+                scored["target_price"].tolist(), scored["product"].tolist(), scored["country"].tolist())
+        }
+
+        now = time.strftime("%H:%M:%S")
+        events = []
+        for oid in sorted(ids):
+            before = self.verdicts.get(oid)
+            case, gap_pct, target, product, country = after.get(oid, (None, None, None, None, None))
+            if case == before:
+                continue
+            if before is not None:
+                self.counts[before] -= 1
+            if case is None:
+                self.verdicts.pop(oid, None)
+            else:
+                self.verdicts[oid] = case
+                self.counts[case] += 1
+            self.seq += 1
+            events.append({
+                "seq": self.seq, "time": now, "offer_id": oid, "product": product, "country": country,
+                "before": before, "after": case,
+                "verdict": VERDICTS[case]["title"] if case else None,
+                "gap_pct": gap_pct, "target_price": target, "source": source,
+            })
+        return events
+
+
+def _records(frame):
+    """제안 DataFrame → INPUT_COLUMNS 순서 튜플 목록 (없는 컬럼은 None)."""
+    columns = [frame[c].tolist() if c in frame.columns else [None] * len(frame) for c in INPUT_COLUMNS]
+    return list(zip(*columns))
+
+
+def _market_key(values):
+    """입력 튜플의 (product, country). 연결 정보가 없으면 None."""
+    key = values[-2:]
+    return None if any(v is None or v != v for v in key) else key
+
+
+def describe_event(event):
+    """이벤트 한 줄 설명 (CLI/화면 공통)."""
+    def label(case):
+        return f"{VERDICTS[case]['icon']} {case}" if case else "—"
+    where = " / ".join(str(v) for v in (event["product"], event["country"]) if v is not None)
+    return f"{event['offer_id']}{f' ({where})' if where else ''}: {label(event['before'])} → {label(event['after'])}"
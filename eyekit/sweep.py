@@ -0,0 +1,78 @@
+"""Tool 1 What-If 민감도 스윕.
+
+현재 범주형 입력(추세/요인)을 고정하고 offer_price × supplier_avg_margin ×
+market_avg_price 격자 전체에서 판정과 gap_pct 를 계산합니다. 격자는 청크 단위로
+평가하고, 화면에는 블록 집계로 줄인 2D 격자만 보냅니다.
+"""
+import numpy as np
+
+from eyekit.negotiation import CASE_CODES, GREED_GAP_PCT, case_pair
+
+DEFAULT_CHUNK = 1 << 18  # 청크당 격자점 수
+MARGIN_RANGE = (0, 20)   # 공급사 인정 프리미엄 슬라이더 범위 (%)
+MAX_CELLS = 80           # 화면용 격자 한 변의 최대 칸 수
+
+
+def sweep_axes(offer_price, market_avg_price, span_pct=50, points=100):
+    """현재 제안가/시장가 ±span_pct% 와 프리미엄 전 구간을 points 개씩 나눈 축."""
+    lo, hi = 1 - span_pct / 100, 1 + span_pct / 100
+    offers = np.linspace(max(offer_price * lo, 0.0), offer_price * hi, points)
+    margins = np.linspace(MARGIN_RANGE[0], MARGIN_RANGE[1], points)
+    markets = np.linspace(max(market_avg_price * lo, 0.0), market_avg_price * hi, points)
+    return offers, margins, markets
+
+
+def sweep_verdicts(offers, margins, markets, market_trend, forecast_trend,
+                   risk_factors=(), opp_factors=(), chunk=DEFAULT_CHUNK):
+    """격자 전체의 케이스 코드(CASE_CODES 인덱스)와 gap_pct 를 계산합니다.
+
+    반환 배열의 모양은 (len(offers), len(margins), len(markets)) 입니다.
+    범주형 입력은 고정이므로 격자점마다 남는 것은 gap_pct 임계값 비교뿐입니다.
+    """
+    shape = (len(offers), len(margins), len(markets))
+    pair = case_pair(market_trend, forecast_trend, risk_factors, opp_factors)
+
+    codes = np.empty(np.prod(shape), dtype=np.uint8)
+    gap_pct = np.empty(np.prod(shape), dtype=np.float32)
+    for start in range(0, codes.size, chunk):
+        flat = np.arange(start, min(start + chunk, codes.size))
+        io, ip, im = np.unravel_index(flat, shape)
+        fair = markets[im] * (1 + margins[ip] / 100)
+        gap = offers[io] - fair
+        pct = np.divide(gap, fair, out=np.zeros_like(gap), where=fair > 0) * 100
+        codes[flat] = pair[(pct > GREED_GAP_PCT).astype(np.intp)]
+        gap_pct[flat] = pct
+    return codes.reshape(shape), gap_pct.reshape(shape)
+
+
+def _bins(n, max_cells):
+    """길이 n 축을 최대 max_cells 개의 연속 블록으로 나눈 블록 번호."""
+    cells = min(n, max_cells)
+    return np.arange(n) * cells // n, cells
+
+
+def downsample(z, x, y, max_cells=MAX_CELLS, categorical=False):
+    """2D 격자 z (len(y) × len(x)) 를 블록 집계해 최대 max_cells × max_cells 로 줄입니다.
+
+    수치 격자는 블록 평균, 범주형(케이스 코드) 격자는 블록 최빈값을 씁니다.
+    (줄인 z, 블록 중심 x, 블록 중심 y) 를 반환합니다.
+    """
+    ry, ny = _bins(len(y), max_cells)
+    rx, nx = _bins(len(x), max_cells)
+    cell = (ry[:, None] * nx + rx[None, :]).ravel()
+    x_out = np.bincount(rx, weights=x) / np.bincount(rx)
+    y_out = np.bincount(ry, weights=y) / np.bincount(ry)
+    if categorical:
+        n_codes = len(CASE_CODES)
+        counts = np.bincount(cell * n_codes + z.ravel().astype(np.intp), minlength=ny * nx * n_codes)
+        z_out = counts.reshape(ny, nx, n_codes).argmax(axis=2)
+    else:
+        z_out = (np.bincount(cell, weights=z.ravel(), minlength=ny * nx)
+                 / np.bincount(cell, minlength=ny * nx)).reshape(ny, nx)
+    return z_out, x_out, y_out
+
+
+def verdict_shares(codes):
+    """격자 전체에서 케이스별 비율 (CASE_CODES 순서)."""
+    return np.bincount(codes.ravel(), minlength=len(CASE_CODES)) / codes.size
+
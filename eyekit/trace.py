@@ -0,0 +1,138 @@
+"""재실행 단위 성능 계측.
+
+화면 재실행 1회를 RerunTrace 하나로 보고, 구간(span)마다 소요 시간과 화면으로
+보내는 페이로드 크기를 기록합니다. 기록은 JSON-lines 로그(크기 기준 회전)로
+남겨 오프라인에서 분석할 수 있고, cProfile 결과는 .prof 바이트로 꺼낼 수 있습니다.
+"""
+import cProfile
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_LOG_PATH = os.environ.get("EYEKIT_TRACE_LOG", os.path.join(tempfile.gettempdir(), "eyekit_trace.jsonl"))
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+FRAGMENT_SPANS = 200  # 전체 재실행 뒤 fragment 단독 재실행 구간을 세션에 남겨 둘 개수
+
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+
+def trace_logger(path=DEFAULT_LOG_PATH):
+    """path 에 한 줄씩 JSON 을 쓰는 회전 로거 (경로별로 하나만 만듭니다)."""
+    with _loggers_lock:
+        logger = _loggers.get(path)
+        if logger is None:
+            logger = logging.getLogger(f"eyekit.trace.{len(_loggers)}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _loggers[path] = logger
+        return logger
+
+
+class RerunTrace:
+    """재실행 1회의 구간별 소요 시간(ms)과 페이로드 크기(bytes).
+
+    spans 는 전체 재실행의 구간만 담습니다. 그 뒤 fragment 단독 재실행 구간은 바로 로그에
+    쓰고 최근 FRAGMENT_SPANS 개만 fragment_spans 에 남기므로 긴 세션에서도 늘어나지 않습니다.
+    """
+
+    def __init__(self, session, rerun, page=None, log_path=DEFAULT_LOG_PATH):
+        self.session = session
+        self.rerun = rerun
+        self.page = page
+        self.log_path = log_path
+        self.started = time.time()
+        self.spans = []
+        self.fragment_spans = deque(maxlen=FRAGMENT_SPANS)
+        self.finished = False
+
+    @contextmanager
+    def span(self, name, size=None):
+        """with 블록의 소요 시간을 name 으로 기록합니다.
+
+        size 는 바이트 수, 문자열/바이트 값, 또는 이를 돌려주는 함수입니다.
+        함수는 시간 측정이 끝난 뒤에 호출하므로 크기 계산 비용은 구간에 들어가지 않습니다.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            record = {"span": name, "ms": round(ms, 3), "bytes": payload_bytes(size)}
+            if self.finished:
+                # fragment 단독 재실행: 전체 재실행이 끝난 뒤라 바로 로그에 씁니다
+                self.fragment_spans.append(record)
+                self._write([record], fragment=True)
+            else:
+                self.spans.append(record)
+
+    def total_ms(self):
+        """전체 재실행 구간의 합 (이후 fragment 재실행은 포함하지 않음)."""
+        return sum(s["ms"] for s in self.spans)
+
+    def finish(self):
+        """재실행이 끝나면 기록한 구간을 로그에 씁니다."""
+        self._write(self.spans, fragment=False)
+        self.finished = True
+
+    def _write(self, spans, fragment):
+        logger = trace_logger(self.log_path)
+        ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started))
+        for s in spans:
+            logger.info(json.dumps({"ts": ts, "session": self.session, "rerun": self.rerun, "page": self.page,
+                                    "fragment": fragment, **s}, ensure_ascii=False))
+
+
+class _NullTrace:
+    """계측이 꺼져 있을 때 쓰는 빈 구현 (구간을 기록하지 않음)."""
+
+    spans = ()
+
+    @contextmanager
+    def span(self, name, size=None):
+        yield
+
+
+NULL_TRACE = _NullTrace()
+
+
+def payload_bytes(size):
+    if callable(size):
+        size = size()
+    if isinstance(size, str):
+        return len(size.encode("utf-8"))
+    if isinstance(size, (bytes, bytearray)):
+        return len(size)
+    return size
+
+
+# --- cProfile ---
+def start_profile():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def profile_report(profiler, limit=25):
+    """프로파일러를 멈추고 (.prof 바이트, 누적 시간 상위 limit 개 텍스트) 를 반환합니다.
+
+    .prof 바이트는 pstats.Stats / snakeviz 로 바로 열 수 있는 형식입니다.
+    """
+    profiler.disable()
+    profiler.create_stats()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    return marshal.dumps(profiler.stats), out.getvalue()
@@ -0,0 +1,58 @@
+from eyekit.cache import LRUCache, normalize
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_order():
+    cache = LRUCache(max_entries=2, ttl=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a 가 최근 사용으로 → b 가 먼저 빠짐
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = LRUCache(ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 10
+    assert cache.get("a") == 1
+    clock.now = 10.5
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["expirations"], stats["size"]) == (1, 0)
+
+
+def test_configure_shrink_evicts_oldest():
+    cache = LRUCache(max_entries=4, ttl=0)
+    for key in "abcd":
+        cache.put(key, key)
+    cache.configure(max_entries=2)
+    assert [cache.get(k) for k in "abcd"] == [None, None, "c", "d"]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_get_or_compute_stats():
+    cache = LRUCache(ttl=0)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"result": len(calls)}
+
+    key = normalize({"offer_price": 0.1 + 0.2, "risk_factors": ["b", "a"]})
+    assert cache.get_or_compute(key, compute) == {"result": 1}
+    same = normalize({"risk_factors": ["a", "b"], "offer_price": 0.3})
+    assert cache.get_or_compute(same, compute) == {"result": 1}
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
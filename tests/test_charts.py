@@ -0,0 +1,37 @@
+import re
+
+import pytest
+
+from eyekit.charts import waterfall_bars, waterfall_figure, waterfall_svg
+
+CASES = [(0.50, 0.62, 0.525, 0.095), (0.50, 0.51, 0.525, -0.015)]  # 버블 있음 / 없음
+
+
+@pytest.mark.parametrize("args", CASES)
+def test_figure_matches_bars(args):
+    bars = waterfall_bars(*args)
+    fig = waterfall_figure(*args)
+    assert len(fig.data) == len(bars)
+    for trace, (label, base, height, color, text, name) in zip(fig.data, bars):
+        assert trace.name == name and trace.marker.color == color and trace.text == text
+        assert list(trace.x) == [label]
+        assert list(trace.y) == pytest.approx([height])
+        assert (trace.base[0] if trace.base is not None else 0.0) == pytest.approx(base)
+    assert fig.layout.showlegend is False
+
+
+@pytest.mark.parametrize("args", CASES)
+def test_svg_matches_bars(args):
+    bars = waterfall_bars(*args)
+    svg = waterfall_svg(*args)
+    rects = [tuple(map(float, m)) for m in re.findall(r'<rect x="[\d.]+" y="([\d.]+)" width="[\d.]+" height="([\d.]+)"', svg)]
+    assert len(rects) == len(bars)
+    for label, *_, text, _ in bars:
+        assert f">{text}<" in svg.replace("&#x27;", "'") and f">{label}<" in svg
+
+    # 막대 높이와 아래 끝이 값에 비례: 시장 평균가 막대(0 부터)로 축척을 구합니다
+    scale = rects[0][1] / bars[0][2]
+    zero = rects[0][0] + rects[0][1]
+    for (top, px), (_, base, height, *_) in zip(rects, bars):
+        assert px == pytest.approx(max(height * scale, 0.5), abs=0.15)
+        assert zero - (top + px) == pytest.approx(base * scale, abs=0.15)
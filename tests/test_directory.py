@@ -0,0 +1,44 @@
+import pytest
+
+from eyekit.directory import DIRECTORY_COLUMNS, SupplierDirectory
+
+HEADER = ",".join(DIRECTORY_COLUMNS)
+
+
+def _write(tmp_path, text, name="directory.csv"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_blank_cells(tmp_path):
+    path = _write(tmp_path, HEADER + "\n"
+                  "Pacific Fresh Co.,↗️ 성장세 (Growth),,Global Tier 1 (대기업),✅ 최근 1년 내 있음,🟢 낮음 (분산됨)\n"
+                  "Andes Fruit Ltd.,,High-Standard (미국/유럽/일본);Low (기타),,,\n")
+    directory = SupplierDirectory.load(path)
+    assert len(directory) == 2
+    first, second = directory.record(0), directory.record(1)
+    assert first["destinations"] == []
+    assert first["buyer_tier"] == "Global Tier 1 (대기업)"
+    assert second["destinations"] == ["High-Standard (미국/유럽/일본)", "Low (기타)"]
+    assert second["volume_trend"] is None
+    assert directory.search("pacific")[0][0] == 0
+
+
+def test_empty_file(tmp_path):
+    directory = SupplierDirectory.load(_write(tmp_path, HEADER + "\n"))
+    assert len(directory) == 0
+    assert directory.search("pacific") == []
+
+    saved = tmp_path / "empty.npz"
+    directory.save(str(saved))
+    assert SupplierDirectory.load(str(saved)).search("pacific") == []
+
+
+def test_bad_file(tmp_path):
+    with pytest.raises(ValueError):
+        SupplierDirectory.load(_write(tmp_path, ""))
+    with pytest.raises(ValueError):
+        SupplierDirectory.load(_write(tmp_path, "name,volume_trend\nA,B\n"))
+    with pytest.raises(ValueError):
+        SupplierDirectory.load(_write(tmp_path, "not a zip", name="directory.npz"))
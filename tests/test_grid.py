@@ -0,0 +1,29 @@
+import numpy as np
+import pyarrow as pa
+
+from eyekit.grid import ResultGrid
+
+
+def _grid(n=10_000):
+    rng = np.random.default_rng(0)
+    return ResultGrid(pa.table({"case": rng.choice(["A", "B", "C"], n), "x": rng.random(n)}))
+
+
+def test_view_cache_stays_within_max_bytes():
+    grid = _grid()
+    grid.limit(grid.min_bytes + 8 * len(grid))  # 전체 행 view 두 개 분량
+    for i, sort in enumerate(["x", "case", None, "x", "case"]):
+        rows = grid.view(sort=sort, descending=bool(i % 2))
+        grid.summarize(rows, "case", ["x"])
+        assert grid.nbytes <= grid.max_bytes
+    assert len(grid._views) <= 2
+    assert all(any(rows is r for r in grid._views.values()) for rows, _ in grid._summaries.values())
+
+
+def test_limit_trims_existing_views():
+    grid = _grid()
+    for sort in ("x", "case", None):
+        grid.view(sort=sort)
+    grid.limit(grid.min_bytes)
+    assert len(grid._views) == 1
+    assert grid.nbytes <= grid.min_bytes
@@ -0,0 +1,59 @@
+import os
+
+from eyekit.history import HistoryWriter, analysis_row, connect, day_bounds, query_history
+
+
+def _row(created, supplier="Acme"):
+    return analysis_row("tool1", {"offer_price": 0.5}, supplier=supplier, product="Mango", country="VN",
+                        verdict="Case 4", target_price=0.5, created=created)
+
+
+def test_writer_flushes_on_close(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    writer = HistoryWriter(path, batch_size=4, flush_interval=0.01)
+    for i in range(10):
+        assert writer.record(_row(1000.0 + i))
+    writer.close()
+    assert writer.written == 10 and writer.errors == 0 and writer.batches >= 3
+    with connect(path, readonly=True) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0] == 10
+
+
+def test_keyset_pages_cover_ties(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    writer = HistoryWriter(path)
+    created = [1000.0, 1000.0, 1000.0, 1001.0, 1001.0, 1002.0, 1003.0, 1003.0, 1003.0, 1003.0, 1004.0]
+    for t in created:
+        writer.record(_row(t, supplier="Acme" if t != 1002.0 else "Other"))
+    writer.flush()
+
+    conn = connect(path, readonly=True)
+    seen, after = [], None
+    while True:
+        rows, after = query_history(conn, supplier="Acme", after=after, limit=3)
+        assert len(rows) <= 3
+        seen += rows
+        if after is None:
+            break
+    conn.close()
+    writer.close()
+
+    ids = [r["id"] for r in seen]
+    assert len(ids) == len(set(ids)) == len(created) - 1  # 겹치지 않고 빠짐없이
+    keys = [(r["created"], r["id"]) for r in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_day_bounds_is_whole_local_days():
+    start, end = day_bounds("2026-03-01", "2026-03-02")
+    assert end - start == 2 * 86400
+    assert day_bounds() == (None, None)
+    assert day_bounds(end="2026-03-01")[0] is None
+
+
+def test_open_history_writer_without_db(tmp_path):
+    import views
+
+    blocker = tmp_path / "file"
+    blocker.write_text("")  # 디렉터리 자리에 파일이 있어 DB 를 만들 수 없음
+    assert views.open_history_writer(os.path.join(str(blocker), "history.sqlite3")) is None
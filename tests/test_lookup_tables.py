@@ -0,0 +1,84 @@
+"""조회 테이블 경로가 원래 if/elif 분기(classify_offer, score_supplier/grade_for)와 같은지 전수 대조."""
+from itertools import product
+
+import pandas as pd
+import pytest
+
+from eyekit.factors import FACTOR_SEP
+from eyekit.negotiation import (
+    FORECAST_TRENDS, MARKET_TRENDS, OPP_FACTORS, RISK_FACTORS, analyze_offer, analyze_offer_records,
+    analyze_offers, classify_offer, price_gap,
+)
+from eyekit.partner import (
+    BUYER_TIERS, DEPENDENCIES, DESTINATIONS, EXPORT_HISTORIES, SUPPLIER_COLUMNS, VOLUME_TRENDS, grade_for,
+    score_supplier, validate_supplier, validate_supplier_records, validate_suppliers,
+)
+
+
+def _subsets(labels):
+    return [[l for i, l in enumerate(labels) if mask >> i & 1] for mask in range(1 << len(labels))]
+
+
+# 선택지 밖 라벨("기타", 짧은 표기)도 포함. offer_price 0.50/0.60 → gap_pct 0%/20% (임계 양쪽)
+OFFER_ROWS = list(product(MARKET_TRENDS + ["▼ 하락", "기타"], FORECAST_TRENDS + ["↗️ 상승", "기타"],
+                          _subsets(RISK_FACTORS), _subsets(OPP_FACTORS), (0.50, 0.60)))
+SUPPLIER_ROWS = list(product(VOLUME_TRENDS + ["기타"], _subsets(DESTINATIONS), BUYER_TIERS + ["기타"],
+                             EXPORT_HISTORIES + ["기타"], DEPENDENCIES + ["기타"]))
+
+
+@pytest.fixture(scope="module")
+def expected_cases():
+    return [classify_offer(mt, ft, risks, opps, price_gap(0.50, offer_price, 0)[2])
+            for mt, ft, risks, opps, offer_price in OFFER_ROWS]
+
+
+def _grade(row):
+    score = score_supplier(*row)
+    return score, grade_for(score, row[-1])
+
+
+@pytest.fixture(scope="module")
+def expected_grades():
+    return [_grade(row) for row in SUPPLIER_ROWS]
+
+
+def test_analyze_offer_matches_chain(expected_cases):
+    got = [analyze_offer(0.50, offer_price, 0, mt, ft, risks, opps)["case"]
+           for mt, ft, risks, opps, offer_price in OFFER_ROWS]
+    assert got == expected_cases
+
+
+def test_analyze_offers_matches_chain(expected_cases):
+    df = pd.DataFrame(OFFER_ROWS, columns=["market_trend", "forecast_trend", "risk_factors", "opp_factors",
+                                           "offer_price"])
+    df["market_avg_price"] = 0.50
+    df["supplier_avg_margin"] = 0
+    df["risk_factors"] = df["risk_factors"].map(FACTOR_SEP.join)
+    df["opp_factors"] = df["opp_factors"].map(FACTOR_SEP.join)
+    assert analyze_offers(df)["case"].tolist() == expected_cases
+
+
+def test_analyze_offer_records_matches_chain(expected_cases):
+    records = analyze_offer_records([
+        dict(market_avg_price=0.50, offer_price=offer_price, supplier_avg_margin=0, market_trend=mt,
+             forecast_trend=ft, risk_factors=risks, opp_factors=opps)
+        for mt, ft, risks, opps, offer_price in OFFER_ROWS
+    ])
+    assert [r["case"] for r in records] == expected_cases
+
+
+def test_validate_supplier_matches_chain(expected_grades):
+    got = [(r["score"], r["grade"]) for r in (validate_supplier(*row) for row in SUPPLIER_ROWS)]
+    assert got == expected_grades
+
+
+def test_validate_suppliers_matches_chain(expected_grades):
+    df = pd.DataFrame(SUPPLIER_ROWS, columns=SUPPLIER_COLUMNS)
+    df["destinations"] = df["destinations"].map(FACTOR_SEP.join)
+    batch = validate_suppliers(df)
+    assert list(zip(batch["score"].tolist(), batch["grade"].tolist())) == expected_grades
+
+
+def test_validate_supplier_records_matches_chain(expected_grades):
+    records = validate_supplier_records([dict(zip(SUPPLIER_COLUMNS, row)) for row in SUPPLIER_ROWS])
+    assert [(r["score"], r["grade"]) for r in records] == expected_grades
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from eyekit.factors import FACTOR_SEP
+from eyekit.grid import read_results
+from eyekit.partner import (
+    BUYER_TIERS, DEPENDENCIES, DESTINATIONS, EXPORT_HISTORIES, VOLUME_TRENDS, grade_supplier_file,
+    validate_suppliers,
+)
+
+
+def _suppliers(n=2_500):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "name": [f"S{i:05d}" for i in range(n)],
+        "volume_trend": rng.choice(VOLUME_TRENDS, n),
+        "destinations": rng.choice(DESTINATIONS + [FACTOR_SEP.join(DESTINATIONS[:2])], n),
+        "buyer_tier": rng.choice(BUYER_TIERS, n),
+        "export_history": rng.choice(EXPORT_HISTORIES, n),
+        "dependency": rng.choice(DEPENDENCIES, n),
+        "note": None,
+    })
+    df.loc[n - 10:, "note"] = "late"  # 첫 청크에는 빈 값만 있는 컬럼
+    return df
+
+
+@pytest.mark.parametrize("source_ext", ["csv", "parquet"])
+@pytest.mark.parametrize("out_ext", ["csv", "parquet"])
+def test_chunked_output_matches_whole_frame(tmp_path, source_ext, out_ext):
+    df = _suppliers()
+    source = tmp_path / f"suppliers.{source_ext}"
+    if source_ext == "csv":
+        df.to_csv(source, index=False)
+    else:
+        df.to_parquet(source, index=False)
+    dest = tmp_path / f"graded.{out_ext}"
+
+    summary = grade_supplier_file(str(source), str(dest), chunksize=1_000)
+    expected = validate_suppliers(df)
+    assert summary["rows"] == len(df)
+    assert summary["grade_counts"] == expected["grade"].value_counts().to_dict()
+
+    out = pd.read_csv(dest) if out_ext == "csv" else pd.read_parquet(dest)
+    assert list(out.columns) == list(expected.columns)
+    assert out["name"].tolist() == expected["name"].tolist()
+    assert out["score"].tolist() == expected["score"].tolist()
+    assert out["grade"].tolist() == expected["grade"].tolist()
+    assert out["strategy"].astype(str).tolist() == expected["strategy"].astype(str).tolist()
+    assert out["note"].fillna("").tolist() == expected["note"].fillna("").tolist()
+
+
+@pytest.mark.parametrize("ext", ["csv", "parquet"])
+def test_read_results_max_rows(tmp_path, ext):
+    dest = tmp_path / f"graded.{ext}"
+    source = tmp_path / "suppliers.csv"
+    _suppliers().to_csv(source, index=False)
+    grade_supplier_file(str(source), str(dest), chunksize=1_000)
+    assert len(read_results(str(dest))) == 2_500
+    grid = read_results(str(dest), max_rows=1_200)
+    assert len(grid) == 1_200
+    assert grid.table.column("name").to_pylist()[-1] == "S01199"
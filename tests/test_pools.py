@@ -0,0 +1,36 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eyekit.montecarlo import simulate_offer
+from eyekit.reports import export_reports, report_records
+
+OFFER = dict(market_avg_price=0.50, offer_price=0.58, supplier_avg_margin=5, market_trend="▼ 하락 (Drop)",
+             forecast_trend="↗️ 상승 (Rise)", risk_factors=[], opp_factors=["환율 호재"])
+
+
+def test_simulation_pool_matches_single_process():
+    single = simulate_offer(**OFFER, n=200_000, workers=1)
+    pooled = simulate_offer(**OFFER, n=200_000, workers=2)
+    for key in single:
+        np.testing.assert_array_equal(single[key], pooled[key])
+
+
+@pytest.mark.parametrize("n", [0, -5])
+def test_simulation_rejects_empty_run(n):
+    with pytest.raises(ValueError):
+        simulate_offer(**OFFER, n=n)
+
+
+def test_report_pool_writes_every_report(tmp_path):
+    records = report_records("offers", pd.DataFrame([dict(OFFER, offer_id=f"A{i}", opp_factors="환율 호재")
+                                                     for i in range(40)]))
+    single = export_reports("offers", records, str(tmp_path / "one.zip"), workers=1, chunk=8)
+    pooled = export_reports("offers", records, str(tmp_path / "two.zip"), workers=2, chunk=8)
+    assert single["reports"] == pooled["reports"] == 40
+    assert pooled["workers"] == 2
+    with zipfile.ZipFile(tmp_path / "one.zip") as one, zipfile.ZipFile(tmp_path / "two.zip") as two:
+        assert one.namelist() == two.namelist()
+        assert [one.read(n) for n in one.namelist()] == [two.read(n) for n in two.namelist()]
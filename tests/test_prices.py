@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eyekit.prices import PriceStore
+
+
+def _weekly(prices, start="2026-01-05"):
+    weeks = pd.date_range(start, periods=len(prices), freq="7D").strftime("%Y-%m-%d")
+    return pd.DataFrame({"product": "Banana", "country": "EC", "week": weeks, "price": prices})
+
+
+def test_nan_price_is_skipped(tmp_path):
+    store = PriceStore.open(str(tmp_path / "prices"))
+    store.import_frame(_weekly([1.3, 1.4, np.nan, 1.5, 1.55, 1.6]))
+    summary = store.summary("Banana", "EC")
+    assert np.isfinite(summary["window_mean"])
+    assert summary["market_trend"] == "▲ 급등 (Surge)"
+    assert summary["weeks"] == 6  # 빈 주는 직전 가격으로 채움
+    assert store.check_window_stats() < 1e-6
+
+    store.append("2026-02-16", [("Banana", "EC")], [float("nan")])
+    store.append("2026-02-23", [("Banana", "EC")], [1.7])
+    assert np.isfinite(store.summary("Banana", "EC")["window_mean"])
+    assert store.check_window_stats() < 1e-6
+
+
+def test_check_window_stats_fails_on_non_finite(tmp_path):
+    store = PriceStore.open(str(tmp_path / "prices"))
+    store.import_frame(_weekly([1.3, 1.4, 1.5]))
+    store.s0[0] = np.nan
+    with pytest.raises(ValueError):
+        store.check_window_stats()
+
+
+def test_flush_replaces_files(tmp_path):
+    root = str(tmp_path / "prices")
+    store = PriceStore.open(root)
+    store.import_frame(_weekly([1.3, 1.4, 1.5]))
+    store.flush()
+    assert sorted(p.name for p in (tmp_path / "prices").iterdir()) == ["prices.npy", "series.json", "state.npz"]
+
+    # series.json 만 새로 쓰인 상태 (flush 도중): state.npz 에 없는 시리즈는 잘라 냅니다
+    store.append("2026-01-26", [("Banana", "EC"), ("Mango", "VN")], [1.6, 0.5])
+    with open(store._series_path, "w", encoding="utf-8") as f:
+        json.dump(store.keys, f)
+    reader = PriceStore.open(root, readonly=True)
+    assert reader.keys == [("Banana", "EC")]
+    assert reader.summary("Banana", "EC")["weeks"] == 3
+
+    store.flush()
+    reader = PriceStore.open(root, readonly=True)
+    assert len(reader) == 2 and reader.summary("Banana", "EC")["weeks"] == 4
+
+
+def test_view_skips_unreadable_store(tmp_path):
+    import views
+
+    root = str(tmp_path / "prices")
+    store = PriceStore.open(root)
+    store.import_frame(_weekly([1.3, 1.4, 1.5]))
+    store.flush()
+    with open(store._series_path, "w", encoding="utf-8") as f:
+        f.write("[[")  # 깨진 JSON
+    assert views.price_store(root) is None
+    assert views.price_store(str(tmp_path / "missing")) is None
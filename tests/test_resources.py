@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from eyekit.cache import LRUCache
+from eyekit.resources import MemoryLedger, freeze, sizeof
+
+
+def test_sizeof_reaches_nested_frames_and_figures():
+    frame = pd.DataFrame({"label": [f"row {i}" for i in range(10_000)], "value": np.arange(10_000.0)})
+    figure = go.Figure(go.Bar(x=list(range(5_000)), y=list(range(5_000))))
+    cache = LRUCache()
+    cache.put(("analyze", 1), {"trend_table": frame, "figure": figure})
+    assert sizeof(cache) >= frame.memory_usage(deep=True).sum() + sizeof(figure.to_plotly_json())
+    assert sizeof(cache) > sizeof(figure) > 5_000 * 2 * 8
+
+
+def test_sizeof_skips_memmap(tmp_path):
+    mapped = np.lib.format.open_memmap(str(tmp_path / "a.npy"), mode="w+", dtype=np.float64, shape=(1_000,))
+    assert sizeof(mapped) == 0
+    assert sizeof(np.zeros(1_000)) == 8_000
+
+
+def test_ledger_forgets_released_objects():
+    ledger = MemoryLedger()
+    array = freeze(np.zeros(1_000))
+    with pytest.raises(ValueError):
+        array[0] = 1
+    ledger.track("batch", array, owner="s1")
+    assert ledger.usage()["batch"] == {"objects": 1, "owners": 1, "bytes": 8_000}
+    assert ledger.owner_bytes("s1") == 8_000
+    del array
+    assert ledger.usage() == {}
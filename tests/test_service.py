@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+from eyekit.service import MicroBatcher, RequestError, ScoringService, offer_args
+
+OFFER = {
+    "market_avg_price": 0.50, "offer_price": 0.58, "supplier_avg_margin": 5,
+    "market_trend": "▼ 하락 (Drop)", "forecast_trend": "↗️ 상승 (Rise)",
+    "risk_factors": [], "opp_factors": ["환율 호재"],
+}
+
+
+@pytest.mark.parametrize("value", [10**400, float("nan"), float("inf"), -float("inf")])
+def test_offer_args_rejects_non_finite(value):
+    with pytest.raises(RequestError):
+        offer_args(dict(OFFER, market_avg_price=value))
+
+
+def test_offer_args_converts_to_float():
+    assert offer_args(dict(OFFER, supplier_avg_margin=5))["supplier_avg_margin"] == 5.0
+
+
+def test_bad_request_does_not_fail_its_batch():
+    def evaluate(records):
+        if any(r == "bad" for r in records):
+            raise OverflowError("bad record")
+        return [r.upper() for r in records]
+
+    async def run():
+        batcher = MicroBatcher(evaluate, window=0.01)
+        return await asyncio.gather(batcher.submit(["a", "b"]), batcher.submit(["bad"]), batcher.submit(["c"]),
+                                    return_exceptions=True)
+
+    good, bad, other = asyncio.run(run())
+    assert good == ["A", "B"] and other == ["C"]
+    assert isinstance(bad, OverflowError)
+
+
+def test_overflow_request_fails_alone():
+    async def run():
+        service = ScoringService(window_ms=5)
+        valid = service.handle("POST", "/negotiate", json.dumps(OFFER))
+        invalid = service.handle("POST", "/negotiate", json.dumps(dict(OFFER, market_avg_price=10**400)))
+        return await asyncio.gather(valid, invalid, return_exceptions=True)
+
+    (status, result), error = asyncio.run(run())
+    assert status == 200 and result["case"]
+    assert isinstance(error, RequestError) and error.status == 400
+
+
+def test_requests_in_window_share_one_batch():
+    calls = []
+
+    def evaluate(records):
+        calls.append(list(records))
+        return [r * 2 for r in records]
+
+    async def run():
+        batcher = MicroBatcher(evaluate, window=0.01, max_batch=4)
+        first = await asyncio.gather(*(batcher.submit([i]) for i in range(3)))
+        second = await asyncio.gather(*(batcher.submit([i, i]) for i in range(3)))  # 4건 넘으면 바로 비움
+        return batcher, first, second
+
+    batcher, first, second = asyncio.run(run())
+    assert first == [[0], [2], [4]] and second == [[0, 0], [2, 2], [4, 4]]
+    assert calls == [[0, 1, 2], [0, 0, 1, 1], [2, 2]]
+    assert (batcher.batches, batcher.items, batcher.largest) == (3, 9, 4)
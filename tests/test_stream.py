@@ -0,0 +1,177 @@
+import os
+import time
+
+import pandas as pd
+
+from eyekit.negotiation import analyze_offers
+from eyekit.stream import VerdictStream, scan_changes
+
+STABLE = "➖ 보합 (Stable)"
+RISE = "↗️ 상승 (Rise)"
+DROP = "▼ 하락 (Drop)"
+
+
+def _offers(rows):
+    """(offer_id, product, country, offer_price) 목록 → 시세 연결 제안 DataFrame."""
+    return pd.DataFrame({
+        "offer_id": [r[0] for r in rows], "product": [r[1] for r in rows], "country": [r[2] for r in rows],
+        "market_avg_price": None, "market_trend": None,
+        "offer_price": [r[3] for r in rows], "supplier_avg_margin": 5.0,
+        "forecast_trend": RISE, "risk_factors": "", "opp_factors": "",
+    })
+
+
+def _market(rows):
+    """(product, country, market_avg_price, market_trend) 목록 → 시세 스냅샷 DataFrame."""
+    return pd.DataFrame(rows, columns=["product", "country", "market_avg_price", "market_trend"])
+
+
+class Inbox:
+    """임시 감시 폴더. 폴링 결과를 폴더 전체를 처음부터 판정한 결과와 비교합니다."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.stream = VerdictStream(str(folder), settle=0)
+        self.order = []    # 파일 이름 (스트림이 읽은 순서)
+        self.pending = set()
+        self.tick = time.time_ns() - 10**12
+
+    def write(self, name, df):
+        path = os.path.join(self.folder, name)
+        df.to_csv(path, index=False)
+        self.tick += 10**9
+        os.utime(path, ns=(self.tick, self.tick))
+        self.pending.add(name)
+
+    def remove(self, name):
+        os.remove(os.path.join(self.folder, name))
+        self.order.remove(name)
+
+    def poll(self):
+        events = self.stream.poll()
+        for name in sorted(self.pending):  # scan_changes 는 이름 순으로 읽습니다
+            if name in self.order:
+                self.order.remove(name)
+            self.order.append(name)
+        self.pending.clear()
+        return events
+
+    def expected(self):
+        """남은 파일을 읽은 순서대로 합쳐 (나중 파일 우선) 한꺼번에 판정한 offer_id → 케이스."""
+        offers, market = [], []
+        for name in self.order:
+            df = pd.read_csv(os.path.join(self.folder, name), dtype={"offer_id": str})
+            if "offer_id" in df.columns:
+                offers.append(df.drop_duplicates("offer_id", keep="last"))
+            else:
+                df["market_avg_price"] = pd.to_numeric(df["market_avg_price"], errors="coerce")
+                market.append(df.dropna())
+        if not offers:
+            return {}
+        merged = pd.concat(offers).drop_duplicates("offer_id", keep="last").set_index("offer_id")
+        if market:
+            snap = pd.concat(market).drop_duplicates(["product", "country"], keep="last")
+            snap = snap.set_index(["product", "country"])
+            keys = list(zip(merged["product"], merged["country"]))
+            for column in ("market_avg_price", "market_trend"):
+                values = [snap[column].get(k) for k in keys]
+                merged[column] = [v if v is not None else old for v, old in zip(values, merged[column])]
+        merged["market_avg_price"] = pd.to_numeric(merged["market_avg_price"], errors="coerce")
+        merged = merged[merged["market_avg_price"].notna() & merged["market_trend"].notna()]
+        if merged.empty:
+            return {}
+        return analyze_offers(merged)["case"].astype(str).to_dict()
+
+    def check(self):
+        expected = self.expected()
+        assert self.stream.verdicts == expected
+        counts = {case: n for case, n in self.stream.counts.items() if n}
+        assert counts == pd.Series(list(expected.values()), dtype=object).value_counts().to_dict()
+
+
+def test_incremental_matches_full_recompute(tmp_path):
+    inbox = Inbox(tmp_path)
+    inbox.write("a_offers.csv", _offers([("A1", "Mango", "VN", 0.55), ("A2", "Mango", "VN", 0.70),
+                                         ("A3", "Kiwi", "NZ", 0.50)]))
+    assert inbox.poll() == []  # 첫 폴링은 기준선
+    inbox.check()
+    assert inbox.stream.verdicts == {}  # 시세가 아직 없음
+
+    inbox.write("m1.csv", _market([("Mango", "VN", 0.52, DROP), ("Kiwi", "NZ", 0.50, STABLE)]))
+    events = inbox.poll()
+    inbox.check()
+    assert {e["offer_id"] for e in events} == {"A1", "A2", "A3"}
+
+    # 제안 파일 변경: A2 가격만 바뀌고 A3 이 빠지고 A4 가 들어옴
+    inbox.write("a_offers.csv", _offers([("A1", "Mango", "VN", 0.55), ("A2", "Mango", "VN", 0.52),
+                                         ("A4", "Kiwi", "NZ", 0.80)]))
+    inbox.poll()
+    inbox.check()
+    assert "A3" not in inbox.stream.inputs
+
+    # 같은 품목·국가를 다른 시세 파일이 덮어씀 → 그 파일이 지워지면 m1 값으로 돌아감
+    inbox.write("m2.csv", _market([("Mango", "VN", 0.80, "▲ 급등 (Surge)")]))
+    inbox.poll()
+    inbox.check()
+    assert inbox.stream.market_owner[("Mango", "VN")].endswith("m2.csv")
+    inbox.remove("m2.csv")
+    inbox.poll()
+    inbox.check()
+    assert inbox.stream.market[("Mango", "VN")] == (0.52, DROP)
+
+    # 두 제안 파일에 같은 offer_id: 나중 파일이 우선, 지우면 남은 파일 값으로
+    inbox.write("b_offers.csv", _offers([("A1", "Mango", "VN", 0.90), ("B1", "Kiwi", "NZ", 0.45)]))
+    inbox.poll()
+    inbox.check()
+    assert inbox.stream.owner["A1"].endswith("b_offers.csv")
+    inbox.remove("b_offers.csv")
+    inbox.poll()
+    inbox.check()
+    assert inbox.stream.owner["A1"].endswith("a_offers.csv")
+    assert "B1" not in inbox.stream.inputs
+
+    # 시세 파일 삭제: 연결된 판정이 빠짐
+    inbox.remove("m1.csv")
+    inbox.poll()
+    inbox.check()
+    assert inbox.stream.verdicts == {} and inbox.stream.market == {}
+
+
+def test_event_seq_increases(tmp_path):
+    inbox = Inbox(tmp_path)
+    inbox.write("a_offers.csv", _offers([("A1", "Mango", "VN", 0.55), ("A2", "Mango", "VN", 0.70)]))
+    inbox.poll()
+    seqs = []
+    for price, trend in [(0.52, DROP), (0.80, "▲ 급등 (Surge)"), (0.52, DROP)]:
+        inbox.write("m1.csv", _market([("Mango", "VN", price, trend)]))
+        seqs += [e["seq"] for e in inbox.poll()]
+        inbox.check()
+    assert seqs == list(range(1, len(seqs) + 1))
+    assert [e["seq"] for e in inbox.stream.events_since(seqs[0])] == seqs[1:]
+
+
+def test_malformed_market_value_is_reported(tmp_path):
+    inbox = Inbox(tmp_path)
+    inbox.write("a_offers.csv", _offers([("A1", "Mango", "VN", 0.55), ("A2", "Kiwi", "NZ", 0.50)]))
+    inbox.poll()
+    inbox.write("m1.csv", _market([("Mango", "VN", "abc", DROP), ("Kiwi", "NZ", 0.50, STABLE)]))
+    inbox.poll()
+    inbox.check()
+    assert set(inbox.stream.verdicts) == {"A2"}
+    assert "Mango" in inbox.stream.errors[-1]["error"]
+
+    inbox.write("a_offers.csv", _offers([("A1", "Mango", "VN", "n/a"), ("A2", "Kiwi", "NZ", 0.50)]))
+    inbox.poll()
+    assert "A1" not in inbox.stream.inputs
+    assert "A1" in inbox.stream.errors[-1]["error"]
+
+
+def test_scan_changes_waits_for_settle(tmp_path):
+    path = tmp_path / "m1.csv"
+    _market([("Mango", "VN", 0.52, DROP)]).to_csv(path, index=False)
+    assert list(scan_changes(str(tmp_path), {}, settle=60)) == []  # 방금 쓴 파일은 미룸
+    [(found, state)] = scan_changes(str(tmp_path), {}, settle=0)
+    assert found == str(path)
+    assert list(scan_changes(str(tmp_path), {found: state}, settle=0)) == []
+    os.remove(path)
+    assert list(scan_changes(str(tmp_path), {found: state}, settle=0)) == [(found, None)]
@@ -0,0 +1,46 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from eyekit.negotiation import CASE_CODES, FORECAST_TRENDS, GREED_GAP_PCT, MARKET_TRENDS, lookup_case, price_gap
+from eyekit.sweep import MAX_CELLS, downsample, sweep_axes, sweep_verdicts, verdict_shares
+
+CONTEXTS = [
+    ("▲ 급등 (Surge)", "↗️ 상승 (Rise)", ["작황 부진/기상 악화"], []),
+    ("▼ 하락 (Drop)", "↗️ 상승 (Rise)", [], []),
+    ("▼ 하락 (Drop)", "↘️ 하락 (Fall)", [], ["풍작 (Bumper Crop)"]),
+    (MARKET_TRENDS[2], FORECAST_TRENDS[1], ["물류 대란/항만 적체"], ["환율 호재"]),
+]
+
+
+@pytest.mark.parametrize("context", CONTEXTS)
+def test_sweep_matches_lookup_case(context):
+    offers, margins, markets = sweep_axes(0.62, 0.50, span_pct=60, points=9)
+    codes, gap_pct = sweep_verdicts(offers, margins, markets, *context, chunk=50)  # 청크 경계를 여러 번 넘김
+    assert codes.shape == gap_pct.shape == (9, 9, 9)
+    for i, j, k in itertools.product(range(9), repeat=3):
+        _, _, expected_pct = price_gap(markets[k], offers[i], margins[j])
+        assert gap_pct[i, j, k] == pytest.approx(expected_pct, abs=1e-3)
+        if abs(expected_pct - GREED_GAP_PCT) > 1e-6:  # 임계값 바로 위아래는 반올림 차이로 건너뜀
+            assert CASE_CODES[codes[i, j, k]] == lookup_case(*context, expected_pct)
+
+
+def test_downsample_shape_and_shares():
+    offers, margins, markets = sweep_axes(0.62, 0.50, points=2 * MAX_CELLS)
+    codes, gap_pct = sweep_verdicts(offers, margins, markets, *CONTEXTS[1])  # 두 케이스가 섞이는 조건
+    z = codes[:, 0, :].T
+    case_z, x, y = downsample(z, offers, markets, categorical=True)
+    gap_z, _, _ = downsample(gap_pct[:, 0, :].T, offers, markets)
+    assert case_z.shape == gap_z.shape == (MAX_CELLS, MAX_CELLS)
+    assert len(x) == len(y) == MAX_CELLS
+    assert np.all(np.diff(x) > 0) and offers[0] <= x[0] and x[-1] <= offers[-1]
+
+    # 2×2 블록 평균이라 전체 평균이 그대로, 최빈값 격자의 케이스 비율은 경계 칸만큼만 달라짐
+    assert gap_z.mean() == pytest.approx(gap_pct[:, 0, :].mean(), rel=1e-5)
+    assert np.count_nonzero(verdict_shares(z)) == 2
+    assert np.abs(verdict_shares(case_z) - verdict_shares(z)).max() < 0.02
+
+    small, sx, sy = downsample(z[:30, :40], offers[:40], markets[:30], categorical=True)
+    assert small.shape == (30, 40)
+    assert np.array_equal(small, z[:30, :40]) and np.allclose(sx, offers[:40]) and np.allclose(sy, markets[:30])
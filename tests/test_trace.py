@@ -0,0 +1,18 @@
+from eyekit.trace import FRAGMENT_SPANS, RerunTrace
+
+
+def test_fragment_spans_are_bounded(tmp_path):
+    trace = RerunTrace("s1", 1, log_path=str(tmp_path / "trace.jsonl"))
+    with trace.span("page"):
+        pass
+    trace.finish()
+    full_ms = trace.total_ms()
+
+    for _ in range(FRAGMENT_SPANS * 3):
+        with trace.span("watch_poll"):
+            pass
+    assert [s["span"] for s in trace.spans] == ["page"]
+    assert trace.total_ms() == full_ms
+    assert len(trace.fragment_spans) == FRAGMENT_SPANS
+    lines = (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1 + FRAGMENT_SPANS * 3
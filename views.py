@@ -0,0 +1,841 @@
+"""Streamlit 결과 화면 섹션.
+
+각 섹션은 st.fragment 로 감싸 두어, 섹션 안의 폼/위젯 조작은 해당 섹션만 다시
+실행합니다 (CSS 주입·페이지 설정·입력 패널은 다시 실행되지 않음). 입력값은
+app.py 에서 폼 제출 시점에 확정되어 인자로 전달됩니다.
+"""
+import datetime
+import hmac
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from contextlib import closing
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from eyekit.cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, LRUCache, normalize
+from eyekit.charts import trend_table, waterfall_figure, waterfall_svg
+from eyekit.directory import DEFAULT_DIRECTORY, SupplierDirectory
+from eyekit.grid import DEFAULT_PAGE_SIZE as DEFAULT_GRID_PAGE_SIZE
+from eyekit.history import (
+    DEFAULT_HISTORY, DEFAULT_PAGE_SIZE, HistoryWriter, analysis_row, connect, day_bounds, query_history,
+)
+from eyekit.montecarlo import DEFAULT_SEED, default_workers, simulate_offer, summarize_simulation
+from eyekit.negotiation import CASE_CODES, CASE_TABLE, GREED_GAP_PCT, VERDICTS, analyze_offer
+from eyekit.partner import GRADE_TABLE, SCORE_TABLE, validate_supplier
+from eyekit.prices import DEFAULT_STORE, PriceStore
+from eyekit.reports import export_reports, pdf_available
+from eyekit.resources import DEFAULT_SESSION_MB, MemoryLedger, freeze, process_memory
+from eyekit.stream import DEFAULT_INTERVAL, VerdictStream
+from eyekit.sweep import downsample, sweep_axes, sweep_verdicts, verdict_shares
+from eyekit.trace import NULL_TRACE, RerunTrace, profile_report, start_profile
+
+_log = logging.getLogger(__name__)
+
+# What-If 스윕 히트맵의 케이스별 색상 (판정 카드 배경색보다 진하게)
+SWEEP_COLORS = {
+    "Case 3": "#4dabf7",  # Blue
+    "Case 2": "#fcc419",  # Yellow
+    "Case 1": "#ff6b6b",  # Red
+    "Case 4": "#51cf66",  # Green
+    "Case 5": "#adb5bd",  # Gray
+    "Default": "#66d9e8",  # Teal
+}
+
+
+# --- 재실행 계측 (Debug) ---
+# 사이드바 디버그 패널에서 켜면 재실행마다 RerunTrace 를 만들어 세션에 두고,
+# 각 섹션이 span() 으로 소요 시간과 화면 페이로드 크기를 남깁니다.
+def current_trace():
+    """이번 재실행의 계측기 (계측이 꺼져 있으면 NULL_TRACE)."""
+    if not st.session_state.get("debug_trace"):
+        return NULL_TRACE
+    return st.session_state.get("rerun_trace", NULL_TRACE)
+
+
+def span(name, size=None):
+    return current_trace().span(name, size)
+
+
+def start_trace():
+    """스크립트 맨 앞에서 호출합니다. 프로파일 요청이 있으면 이번 재실행 전체를 cProfile 로 잽니다."""
+    if not st.session_state.get("debug_trace"):
+        st.session_state.pop("rerun_trace", None)
+        return NULL_TRACE
+    session = st.session_state.setdefault("trace_session", uuid.uuid4().hex[:8])
+    rerun = st.session_state["trace_rerun"] = st.session_state.get("trace_rerun", 0) + 1
+    trace = st.session_state["rerun_trace"] = RerunTrace(session, rerun)
+    if st.session_state.pop("profile_next", False):
+        st.session_state["rerun_profiler"] = start_profile()
+    return trace
+
+
+def finish_trace(trace, page):
+    """스크립트 맨 끝에서 호출합니다. 구간을 로그에 쓰고 프로파일을 보관합니다."""
+    profiler = st.session_state.pop("rerun_profiler", None)
+    if profiler is not None:
+        st.session_state["rerun_profile"] = profile_report(profiler)
+    if trace is not NULL_TRACE:
+        trace.page = page
+        trace.finish()
+
+
+def table_bytes(df):
+    """st.table 이 보내는 Arrow 직렬화 크기."""
+    from streamlit.dataframe_util import convert_anything_to_arrow_bytes
+
+    return len(convert_anything_to_arrow_bytes(df))
+
+
+# 분석 결과 캐시: 정규화한 입력 튜플 → 판정 + 표 + 차트.
+# 서버 프로세스 안의 모든 세션이 공유하므로 같은 시장 스냅샷은 한 번만 계산합니다.
+ANALYSIS_CACHE = LRUCache(max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL)
+# 캐시 설정 변경/비우기는 모든 세션에 영향을 주므로 이 토큰을 입력한 세션만 허용합니다 (없으면 조회만)
+ADMIN_TOKEN = os.environ.get("EYEKIT_ADMIN_TOKEN", "")
+
+
+@st.cache_resource(show_spinner=False)
+def memory_ledger():
+    """프로세스 공유 메모리 집계 (컴포넌트별 객체 약한 참조)."""
+    ledger = MemoryLedger()
+    for table in (CASE_TABLE, SCORE_TABLE, GRADE_TABLE):  # import 시 쓰기 금지로 만들어 둔 규칙 표
+        ledger.track("판정 규칙 표", table)
+    ledger.track("분석 캐시", ANALYSIS_CACHE)
+    return ledger
+
+
+def analysis_bundle(offer):
+    """Tool 1 입력 → {result, trend_table, figure} (캐시 경유)."""
+    def compute():
+        with span("logic"):
+            result = analyze_offer(**offer)
+        with span("trend_table_build"):
+            table = trend_table(offer["market_trend"], offer["forecast_trend"],
+                                offer["risk_factors"], offer["opp_factors"])
+        with span("chart_build"):
+            fig = waterfall_figure(offer["market_avg_price"], offer["offer_price"],
+                                   result["fair_price"], result["gap"])
+            svg = waterfall_svg(offer["market_avg_price"], offer["offer_price"], result["fair_price"], result["gap"])
+        return {"result": result, "trend_table": table, "figure": fig, "svg": svg}
+    with span("analysis_bundle"):
+        return ANALYSIS_CACHE.get_or_compute(("analyze", normalize(offer)), compute)
+
+
+def validation_bundle(supplier):
+    """Tool 2 입력 → {result} (캐시 경유)."""
+    def compute():
+        with span("logic"):
+            return {"result": validate_supplier(**supplier)}
+    with span("validation_bundle"):
+        return ANALYSIS_CACHE.get_or_compute(("validate", normalize(supplier)), compute)
+
+
+# --- 시세 저장소 (Price Store) ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _open_price_store(root, mtime):
+    return memory_ledger().track("시세 저장소", freeze(PriceStore.open(root, readonly=True)))
+
+
+def price_store(root=DEFAULT_STORE):
+    """프로세스 공유 시세 저장소 (읽기 전용). 저장소가 갱신되면 다시 엽니다. 없으면 None."""
+    try:
+        mtime = os.path.getmtime(os.path.join(root, "state.npz"))
+        return _open_price_store(root, mtime)
+    except (OSError, ValueError) as exc:  # 없는 저장소, 깨진 파일
+        if not isinstance(exc, FileNotFoundError):
+            _log.warning("시세 저장소를 열 수 없습니다 (%s): %s", root, exc)
+        return None
+
+
+def market_autofill():
+    """품목/국가를 고르면 시세 저장소의 시장 평균가와 추세 요약을 돌려줍니다 (저장소가 없으면 None)."""
+    store = price_store()
+    if store is None or not len(store):
+        return None
+    with st.expander("📈 시세 자동 입력 (Price Store)", expanded=True):
+        c1, c2 = st.columns(2)
+        product = c1.selectbox("품목 (Product)", store.products())
+        country = c2.selectbox("국가 (Country)", store.countries(product))
+        market = dict(store.summary(product, country), product=product, country=country)
+        st.caption(
+            f"최신 주차 {market['last_week']} · ${market['market_avg_price']:.2f}/kg · "
+            f"최근 {store.window}주 기울기 {market['slope_pct']:+.1f}%/주 → {market['market_trend']}"
+        )
+    return market
+
+
+# --- 공급사 디렉터리 (Supplier Directory) ---
+@st.cache_resource(show_spinner="공급사 디렉터리를 불러오는 중...", max_entries=1)
+def _load_directory(path, mtime):
+    return memory_ledger().track("공급사 디렉터리", freeze(SupplierDirectory.load(path)))
+
+
+def supplier_directory(path=DEFAULT_DIRECTORY):
+    """프로세스 공유 공급사 디렉터리 (파일이 바뀌면 다시 읽음). 파일이 없으면 None."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return _load_directory(path, mtime)
+
+
+def supplier_search():
+    """공급사명을 검색해 고른 공급사의 진단 입력(record)을 돌려줍니다. 고르지 않았으면 None."""
+    try:
+        directory = supplier_directory()
+    except ValueError as e:
+        st.warning(str(e))
+        return None
+    if directory is None:
+        return None
+    with st.expander("🔎 공급사 디렉터리 검색", expanded=True):
+        query = st.text_input("공급사명 검색", key="supplier_query", placeholder="이름 일부를 입력하고 Enter")
+        if not query:
+            st.caption(f"등록 공급사 {len(directory):,}곳")
+            return None
+        started = time.perf_counter()
+        matches = directory.search(query)
+        elapsed = (time.perf_counter() - started) * 1000
+        if not matches:
+            st.caption(f"일치하는 공급사가 없습니다 ({elapsed:.1f}ms)")
+            return None
+        choice = st.selectbox("검색 결과", matches, format_func=lambda m: f"{directory.name(m[0])}  ·  {m[1]:.2f}")
+        st.caption(f"{len(directory):,}곳 중 상위 {len(matches)}건 · {elapsed:.1f}ms")
+    return directory.record(choice[0])
+
+
+def choice_index(options, value):
+    """라디오/셀렉트박스 기본 선택 순번 (값이 선택지에 없으면 첫 항목)."""
+    return options.index(value) if value in options else 0
+
+
+# --- 분석 이력 (History) ---
+@st.cache_resource(show_spinner=False)
+def history_writer(path):
+    """프로세스 공유 이력 쓰기 스레드 (모든 세션의 기록을 모아 일괄 기록)."""
+    return memory_ledger().track("이력 쓰기 대기열", HistoryWriter(path))
+
+
+def open_history_writer(path=DEFAULT_HISTORY):
+    """이력 쓰기 스레드. 이력 DB 를 열 수 없으면 로그만 남기고 None (분석은 그대로 진행)."""
+    try:
+        return history_writer(path)
+    except (OSError, sqlite3.Error) as e:
+        _log.warning("분석 이력 DB 를 열 수 없어 기록을 건너뜁니다 (%s): %s", path, e)
+        return None
+
+
+def record_analysis(inputs):
+    """Tool 1 확정 입력과 판정을 이력 큐에 넣습니다 (디스크를 기다리지 않음)."""
+    result = analysis_bundle(inputs["offer"])["result"]
+    writer = open_history_writer()
+    if writer is None:
+        return
+    with span("history_record"):
+        writer.record(analysis_row(
+            "tool1", dict(inputs["offer"], forecast_price=inputs["forecast_price"], target_date=inputs["target_date"]),
+            supplier=inputs["supplier_name"], product=inputs["product"], country=inputs["country"],
+            verdict=result["case"], target_price=result["target_price"],
+        ))
+
+
+def record_validation(inputs):
+    """Tool 2 확정 입력과 등급을 이력 큐에 넣습니다."""
+    result = validation_bundle(inputs["supplier"])["result"]
+    writer = open_history_writer()
+    if writer is None:
+        return
+    with span("history_record"):
+        writer.record(analysis_row(
+            "tool2", dict(inputs["supplier"], target_spec=inputs["target_spec"]),
+            supplier=inputs["supplier_name"], product=inputs["target_spec"],
+            score=result["score"], grade=result["grade"],
+        ))
+
+
+def _history_pages(key):
+    """필터별 페이지 커서 목록 (필터가 바뀌면 첫 페이지로)."""
+    pages = st.session_state.setdefault("history_pages", {"key": None, "cursors": [None]})
+    if pages["key"] != key:
+        pages.update(key=key, cursors=[None])
+    return pages
+
+
+@st.fragment
+def history_view(path=DEFAULT_HISTORY):
+    """분석 이력 조회. 조건과 페이지는 SQL 에서 처리하고 화면에는 한 페이지만 보냅니다."""
+    with st.form("history_filters", border=False):
+        f1, f2, f3, f4, f5 = st.columns([0.8, 1.2, 1.2, 1.6, 0.8])
+        tool = f1.selectbox("도구", ["전체", "Tool 1", "Tool 2"])
+        supplier = f2.text_input("공급사명 (정확히 일치)")
+        product = f3.text_input("품목 / 타겟 스펙 (정확히 일치)")
+        today = datetime.date.today()
+        days = f4.date_input("기간", (today - datetime.timedelta(days=30), today))
+        page_size = f5.selectbox("페이지당", [25, DEFAULT_PAGE_SIZE, 100, 200], index=1)
+        st.form_submit_button("🔎 조회")
+
+    days = tuple(days) if isinstance(days, (tuple, list)) else (days,)
+    since, until = day_bounds(days[0] if days else None, days[-1] if days else None)
+    filters = dict(tool={"Tool 1": "tool1", "Tool 2": "tool2"}.get(tool), supplier=supplier.strip() or None,
+                   product=product.strip() or None, since=since, until=until)
+    pages = _history_pages(normalize((filters, page_size)))
+
+    try:
+        conn = connect(path, readonly=True)
+    except OSError:
+        st.info("아직 기록된 분석 이력이 없습니다. Tool 1 '분석 실행' / Tool 2 '검증 실행' 결과가 자동으로 쌓입니다.")
+        return
+    with closing(conn), span("history_query"):
+        started = time.perf_counter()
+        rows, next_after = query_history(conn, after=pages["cursors"][-1], limit=page_size, **filters)
+        elapsed = (time.perf_counter() - started) * 1000
+
+    if rows:
+        table = [{
+            "시각": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["created"])),
+            "도구": "Tool 1" if r["tool"] == "tool1" else "Tool 2",
+            "공급사": r["supplier"], "품목": r["product"], "국가": r["country"],
+            "판정": f"{VERDICTS[r['verdict']]['icon']} {r['verdict']}" if r["verdict"] in VERDICTS else r["grade"],
+            "목표가": r["target_price"], "점수": r["score"], "입력값": r["inputs"],
+        } for r in rows]
+        with span("history_table"):
+            st.dataframe(table, hide_index=True, width="stretch")
+    else:
+        st.info("조건에 맞는 이력이 없습니다.")
+
+    p1, p2, p3 = st.columns([1, 2, 1])
+    p1.button("◀ 이전", disabled=len(pages["cursors"]) == 1, key="history_prev",
+              on_click=lambda: pages["cursors"].pop())
+    p3.button("다음 ▶", disabled=next_after is None, key="history_next",
+              on_click=lambda: pages["cursors"].append(next_after))
+    writer = open_history_writer(path)
+    status = ("기록 중지 (이력 DB 를 열 수 없음)" if writer is None else
+              "기록 {written:,}건 (대기 {pending}, 버림 {dropped})".format(**writer.stats()))
+    p2.caption(f"{len(pages['cursors'])}페이지 · {len(rows)}건 · 조회 {elapsed:.1f}ms · {status}")
+
+
+# --- 감시 폴더 스트리밍 (Watch Folder) ---
+LIVE_ROWS = 200  # 라이브 표에 보여 줄 최근 변경 수
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def verdict_stream(folder):
+    """폴더별 증분 판정 상태 (프로세스 공유). 같은 폴더를 보는 세션은 파일을 한 번만 읽습니다."""
+    return memory_ledger().track("감시 폴더 판정", VerdictStream(folder))
+
+
+def _case_label(case):
+    return f"{VERDICTS[case]['icon']} {case}" if case else "—"
+
+
+@st.fragment(run_every=DEFAULT_INTERVAL)
+def watch_panel(folder):
+    """감시 폴더의 판정 변경 라이브 표. DEFAULT_INTERVAL 초마다 이 섹션만 다시 실행합니다."""
+    if not os.path.isdir(folder):
+        st.warning(f"감시 폴더가 없습니다: `{folder}`")
+        return
+    stream = verdict_stream(folder)
+    with span("watch_poll"):
+        stream.poll()
+
+    # 세션마다 마지막으로 본 seq 를 두고, 그 뒤의 골든 타임 진입만 알림으로 띄웁니다
+    cursors = st.session_state.setdefault("watch_seq", {})
+    if folder in cursors:
+        for event in stream.events_since(cursors[folder]):
+            if event["after"] == "Case 4":
+                st.toast(f"🟢 골든 타임: {event['offer_id']} ({event['source']})")
+    cursors[folder] = stream.seq
+
+    counts, pending = stream.summary()
+    metric_cols = st.columns(len(counts))
+    for col, (case_id, count) in zip(metric_cols, counts.items()):
+        col.metric(_case_label(case_id), f"{count:,}")
+    poll = stream.last_poll
+    st.caption(
+        f"제안 {len(stream):,}건 · 시세 대기 {pending:,}건 · 마지막 폴링 {time.strftime('%H:%M:%S')} "
+        f"(파일 {poll['files']}개 · 재판정 {poll['evaluated']:,}건 · {poll['ms']:.1f}ms)"
+    )
+
+    recent = stream.events_since(0)[-LIVE_ROWS:][::-1]
+    if recent:
+        rows = [{
+            "시각": e["time"], "제안": e["offer_id"], "품목": e["product"], "국가": e["country"],
+            "이전": _case_label(e["before"]), "이후": _case_label(e["after"]),
+            "gap %": None if e["gap_pct"] is None else round(float(e["gap_pct"]), 1),
+            "목표가": None if e["target_price"] is None else round(float(e["target_price"]), 3),
+            "파일": e["source"],
+        } for e in recent]
+        with span("watch_table"):
+            st.dataframe(rows, hide_index=True, width="stretch")
+    else:
+        st.info("아직 판정 변경이 없습니다. 폴더에 새 제안/시세 파일이 들어오면 여기에 표시됩니다.")
+    for error in list(stream.errors)[-3:]:
+        st.warning(f"{error['time']} `{error['file']}` 건너뜀: {error['error']}")
+
+
+# --- 일괄 결과 그리드 (Batch Results) ---
+GRID_PAGE_SIZES = [50, DEFAULT_GRID_PAGE_SIZE, 250, 500]
+UNSORTED = "(원래 순서)"
+MAX_REPORTS = 5_000  # 한 번에 내보낼 보고서 상한
+GRID_KEYS = ("tool1_grid", "tool2_grid")  # 세션이 들고 있는 일괄 결과
+SESSION_LIMIT = int(DEFAULT_SESSION_MB * 2**20)  # 세션당 일괄 결과 메모리 상한 (bytes)
+GRID_MAX_ROWS = 200_000  # 파일로 받은 일괄 결과 중 화면 표에 올리는 행 수
+DOWNLOAD_MAX_BYTES = 200 * 2**20  # 이보다 큰 결과 파일은 다운로드 버튼으로 보내지 않음 (메모리에 통째로 올라감)
+
+
+def session_owner():
+    """메모리 집계용 세션 구분자."""
+    return st.session_state.setdefault("session_owner", uuid.uuid4().hex[:8])
+
+
+def batch_grid(key, source, build):
+    """세션에 둔 일괄 결과 그리드. source(업로드 file_id 등) 가 바뀔 때만 build() 로 다시 만듭니다.
+
+    새 결과를 만들기 전에 이전 결과부터 놓아 두 벌이 동시에 잡히지 않게 하고,
+    세션 한도(SESSION_LIMIT)를 넘으면 이 세션의 다른 일괄 결과를 비웁니다.
+    결과 하나가 한도보다 크면 ValueError. 그리드마다 한도를 나눠 주므로 정렬/필터
+    view 가 쌓여도 세션 합계는 한도를 넘지 않습니다.
+    """
+    entry = st.session_state.get(key)
+    if entry is None or entry["source"] != source:
+        st.session_state.pop(key, None)
+        grid = build()
+        if grid.min_bytes > SESSION_LIMIT:
+            raise ValueError(f"일괄 결과({grid.min_bytes / 2**20:,.0f}MB)가 세션 메모리 한도"
+                             f"({SESSION_LIMIT / 2**20:,.0f}MB)를 넘습니다. 파일을 나눠 올려 주세요.")
+        others = [k for k in GRID_KEYS if k != key and current_grid(k) is not None]
+        while others and grid.min_bytes + sum(current_grid(k).min_bytes for k in others) > SESSION_LIMIT:
+            st.session_state.pop(others.pop(0))
+            st.toast("세션 메모리 한도로 이전 일괄 결과를 비웠습니다")
+        _share_limit([grid] + [current_grid(k) for k in others])
+        memory_ledger().track("세션 일괄 결과", grid, session_owner())
+        entry = st.session_state[key] = {"source": source, "grid": grid}
+    return entry["grid"]
+
+
+def _share_limit(grids):
+    """세션 한도를 그리드별 최소 크기 + 남는 몫의 균등 분배로 나눠 줍니다."""
+    spare = (SESSION_LIMIT - sum(g.min_bytes for g in grids)) // len(grids)
+    for grid in grids:
+        grid.limit(grid.min_bytes + spare)
+
+
+def current_grid(key):
+    """세션에 남아 있는 일괄 결과 그리드 (없으면 None)."""
+    entry = st.session_state.get(key)
+    return None if entry is None else entry["grid"]
+
+
+@st.fragment
+def results_grid(key, grid, filter_column, mean_columns=(), label=str, file_name="results.csv", report_kind=None):
+    """일괄 결과 페이지 표. 필터/정렬/집계는 Arrow 로 서버에서 처리하고 화면에는 한 페이지만 보냅니다.
+
+    filter_column 값(케이스, 등급)으로 거르고 같은 컬럼 기준으로 건수와 mean_columns 평균을 집계합니다.
+    report_kind("offers"/"suppliers") 를 주면 현재 조건의 행으로 보고서를 일괄 내보낼 수 있습니다.
+    """
+    with st.form(f"{key}_controls", border=False):
+        f1, f2, f3, f4 = st.columns([2, 1.4, 0.8, 0.8])
+        picked = f1.multiselect("필터", grid.choices(filter_column), format_func=label,
+                                placeholder=f"{filter_column} 전체")
+        sort = f2.selectbox("정렬", [UNSORTED] + grid.columns)
+        descending = f3.toggle("내림차순")
+        page_size = f4.selectbox("페이지당", GRID_PAGE_SIZES, index=1)
+        st.form_submit_button("적용")
+
+    sort = None if sort == UNSORTED else sort
+    with span("grid_view"):
+        rows = grid.view({filter_column: picked}, sort, descending)
+    state = st.session_state.setdefault(f"{key}_page", {"key": None, "page": 0})
+    view_key = normalize((picked, sort, descending, page_size))
+    if state["key"] != view_key:
+        state.update(key=view_key, page=0)
+    pages = max(1, -(-len(rows) // page_size))
+    state["page"] = min(state["page"], pages - 1)
+
+    with span("grid_summary"):
+        summary = grid.summarize(rows, filter_column, mean_columns)
+    metric_cols = st.columns(max(len(summary), 1))
+    for col, row in zip(metric_cols, summary):
+        means = " · ".join(f"{c} {row[f'{c}_mean']:,.2f}" for c in mean_columns if row[f"{c}_mean"] is not None)
+        col.metric(label(row[filter_column]), f"{row['count']:,}", means or None, delta_color="off")
+
+    page = grid.page(rows, state["page"], page_size)
+    with span("grid_page", lambda: table_bytes(page)):
+        st.dataframe(page, hide_index=True, width="stretch")
+
+    p1, p2, p3, p4 = st.columns([1, 2, 1, 1.4])
+    p1.button("◀ 이전", disabled=state["page"] == 0, key=f"{key}_prev",
+              on_click=lambda: state.update(page=state["page"] - 1))
+    p3.button("다음 ▶", disabled=state["page"] >= pages - 1, key=f"{key}_next",
+              on_click=lambda: state.update(page=state["page"] + 1))
+    p2.caption(f"{state['page'] + 1:,} / {pages:,}페이지 · {len(rows):,}건 (전체 {len(grid):,}건)")
+    p4.download_button("⬇️ 현재 조건 CSV", lambda: grid.to_csv(rows), file_name=file_name, mime="text/csv",
+                       key=f"{key}_download", on_click="ignore")
+    if report_kind is not None:
+        report_export(key, grid, rows, report_kind)
+
+
+def report_export(key, grid, rows, kind):
+    """현재 조건(필터·정렬 순) 상위 행마다 1페이지 보고서를 프로세스 풀에서 만들어 zip 으로 내려받습니다."""
+    with st.expander("📦 보고서 일괄 내보내기 (공급사별 1페이지)"):
+        r1, r2, r3 = st.columns(3)
+        fmt = r1.radio("형식", ["html", "pdf"] if pdf_available() else ["html"], horizontal=True,
+                       key=f"{key}_report_format")
+        limit = r2.number_input("보고서 수 (현재 조건 상위)", min_value=1, max_value=max(min(len(rows), MAX_REPORTS), 1),
+                                value=max(min(len(rows), 500), 1), key=f"{key}_report_limit")
+        workers = r3.number_input("프로세스 수", min_value=1, max_value=default_workers(), value=default_workers(),
+                                  key=f"{key}_report_workers")
+        if not st.button("📦 보고서 만들기", key=f"{key}_report", disabled=not len(rows)):
+            return
+        progress = st.progress(0.0, text="보고서 준비 중...")
+        out_path = os.path.join(tempfile.gettempdir(), f"reports_{uuid.uuid4().hex}.zip")
+        try:
+            with span("report_export"):
+                summary = export_reports(
+                    kind, grid.records(rows[:int(limit)]), out_path, fmt=fmt, workers=int(workers),
+                    on_progress=lambda done, total: progress.progress(done / total, text=f"{done:,} / {total:,}건"),
+                )
+            progress.progress(1.0, text=f"완료: {summary['reports']:,}건 · {summary['seconds']:.1f}초 · "
+                                        f"{summary['reports_per_sec']:,.0f}건/초 (프로세스 {summary['workers']}개)")
+            with open(out_path, "rb") as f:
+                st.download_button(f"⬇️ 보고서 zip ({summary['bytes'] / 1e6:,.1f}MB)", f,
+                                   file_name=f"{kind}_reports.zip", mime="application/zip",
+                                   key=f"{key}_report_download", on_click="ignore")
+        except ValueError as e:
+            st.error(str(e))
+        finally:
+            if os.path.exists(out_path):
+                os.remove(out_path)
+
+
+# --- Tool 1 결과 섹션 ---
+@st.fragment
+def verdict_card(result):
+    """1. 종합 진단 (The Verdict) 카드."""
+    target_price = result["target_price"]
+    verdict_icon = result["icon"]
+    verdict_title = result["title"]
+    verdict_desc = result["desc"]
+    verdict_color = result["color"]
+    timing = result["timing"]
+    leverage = result["leverage"]
+
+    html = f"""
+    <div class="result-card" style="background-color: {verdict_color};">
+        <div class="verdict-header" style="color: #333;">{verdict_icon} {verdict_title}</div>
+        <div class="verdict-sub">{verdict_desc}</div>
+        <div style="display: flex; justify-content: space-between; margin-top: 15px; border-top: 1px solid rgba(0,0,0,0.1); padding-top: 15px;">
+            <div style="text-align: center;">
+                <div class="metric-label">🎯 적정 목표가</div>
+                <div class="metric-value">${target_price:.2f}</div>
+            </div>
+            <div style="text-align: center;">
+                <div class="metric-label">⏱️ 구매 타이밍</div>
+                <div class="metric-value" style="font-size: 1.2em; margin-top:5px;">{timing}</div>
+            </div>
+            <div style="text-align: center;">
+                <div class="metric-label">⚖️ 협상 우위</div>
+                <div class="metric-value" style="font-size: 1.2em; margin-top:5px;">{leverage}</div>
+            </div>
+        </div>
+    </div>
+    """
+    with span("verdict_card", html):
+        st.markdown(html, unsafe_allow_html=True)
+
+
+@st.fragment
+def trend_matrix(table):
+    """2. 3D 트렌드 매트릭스 (Trend Matrix)."""
+    st.markdown("#### 📊 3D 트렌드 매트릭스 (Trend Matrix)")
+    st.info("시장의 '결'을 읽어 협상 논리를 구성하세요.")
+    with span("trend_matrix", lambda: table_bytes(table)):
+        st.table(table)
+
+
+@st.fragment
+def price_waterfall(fig, gap, gap_pct, svg=None):
+    """3. 가격 포지셔닝 (Price Positioning). svg 가 있으면 정적 이미지로 바꿔 볼 수 있습니다."""
+    head, switch = st.columns([3, 1])
+    head.markdown("#### 💰 가격 포지셔닝 (Price Positioning)")
+    if svg is not None and switch.toggle("정적 SVG", key="waterfall_svg", help="plotly.js 없이 가벼운 이미지로 표시"):
+        with span("chart_svg", svg):
+            st.image(svg, width="stretch")
+    else:
+        with span("chart_serialize", fig.to_json):
+            st.plotly_chart(fig, width="stretch")
+
+    if gap > 0:
+        st.caption(f"💡 **분석:** 제안가에는 귀사가 인정한 프리미엄 외에도 **${gap:.2f}/kg ({gap_pct:.1f}%)**의 설명되지 않는 추가 마진(Bubble)이 포함되어 있습니다. 이를 제거하는 것이 협상 목표입니다.")
+
+
+@st.fragment
+def strategy_guide(strategy_point, forecast_price):
+    """4. 전략 가이드 (Strategy Action)."""
+    st.markdown("---")
+    st.markdown("#### 📝 전략 가이드 (Strategy Action)")
+
+    point_md = f"""
+        **🔥 핵심 협상 포인트**
+        * {strategy_point}
+        """
+    what_if_md = f"""
+        **🔮 왓 이프 (What-If: 대안)**
+        * **Wait:** 2주 대기 시 예상가 **${forecast_price:.2f}**
+        * **BATNA:** 대체 국가 소싱 시세 확인 필요
+        """
+    with span("strategy_guide", point_md + what_if_md):
+        col_act1, col_act2 = st.columns(2)
+        with col_act1:
+            st.markdown(point_md)
+        with col_act2:
+            st.markdown(what_if_md)
+
+
+@st.fragment
+def sweep_panel(market_avg_price, offer_price, supplier_avg_margin, market_trend, forecast_trend,
+                risk_factors, opp_factors):
+    """5. What-If 민감도 스윕. 스윕 폼 제출은 이 섹션만 다시 실행합니다."""
+    with st.expander("🧭 What-If 민감도 스윕 (Sensitivity Sweep)"):
+        st.caption("현재 추세·뉴스 요인을 고정하고 제안가 × 인정 프리미엄 × 시장가 격자 전체에서 판정이 바뀌는 지점을 찾습니다.")
+        with st.form("sweep_form"):
+            sw1, sw2, sw3 = st.columns(3)
+            span_pct = sw1.slider("제안가/시장가 탐색 범위 (±%)", 10, 90, 50, step=10)
+            points = sw2.select_slider("축당 격자점 수", [25, 50, 100], value=100, help="100 → 100³ = 1,000,000점")
+            slice_margin = sw3.slider("표시할 인정 프리미엄 (%)", 0, 20, supplier_avg_margin)
+            sweep_btn = st.form_submit_button("🧭 스윕 실행 (Sweep)")
+
+        if sweep_btn:
+            offers, margins, markets = sweep_axes(offer_price, market_avg_price, span_pct, points)
+            codes, gap_grid = sweep_verdicts(offers, margins, markets, market_trend, forecast_trend,
+                                             risk_factors, opp_factors)
+            # 3D 격자에서 선택한 프리미엄 단면만 집계해 보냅니다 (y: 시장가, x: 제안가)
+            j = int(np.abs(margins - slice_margin).argmin())
+            case_z, sx, sy = downsample(codes[:, j, :].T, offers, markets, categorical=True)
+            gap_z, _, _ = downsample(gap_grid[:, j, :].T, offers, markets)
+            # Plotly 는 numpy 배열을 dtype 그대로 전송하므로 좁은 dtype 으로 줄여 보냅니다.
+            case_z, gap_z = case_z.astype(np.uint8), gap_z.astype(np.float32)
+
+            n_cases = len(CASE_CODES)
+            colorscale = []
+            for i, case_id in enumerate(CASE_CODES):
+                colorscale += [[i / n_cases, SWEEP_COLORS[case_id]], [(i + 1) / n_cases, SWEEP_COLORS[case_id]]]
+
+            hm1, hm2 = st.columns(2)
+            with hm1:
+                case_fig = go.Figure(go.Heatmap(
+                    z=case_z, x=sx, y=sy, zmin=-0.5, zmax=n_cases - 0.5, colorscale=colorscale,
+                    colorbar=dict(tickvals=list(range(n_cases)),
+                                  ticktext=[f"{VERDICTS[c]['icon']} {c}" for c in CASE_CODES]),
+                    hovertemplate="제안가 $%{x:.2f}<br>시장가 $%{y:.2f}<extra></extra>",
+                ))
+                case_fig.add_trace(go.Scatter(x=[offer_price], y=[market_avg_price], mode="markers",
+                                              marker=dict(symbol="x", size=12, color="#212529"), name="현재"))
+                case_fig.update_layout(title=f"판정 영역 (프리미엄 {margins[j]:.1f}%)", showlegend=False, height=380,
+                                       margin=dict(l=20, r=20, t=40, b=20),
+                                       xaxis=dict(title="제안가 ($/kg)"), yaxis=dict(title="시장 평균가 ($/kg)"))
+                st.plotly_chart(case_fig, width="stretch")
+            with hm2:
+                gap_fig = go.Figure(go.Heatmap(
+                    z=gap_z, x=sx, y=sy, colorscale="RdYlGn_r", zmid=GREED_GAP_PCT,
+                    colorbar=dict(title="gap %"),
+                    hovertemplate="제안가 $%{x:.2f}<br>시장가 $%{y:.2f}<br>gap %{z:.1f}%<extra></extra>",
+                ))
+                gap_fig.add_trace(go.Scatter(x=[offer_price], y=[market_avg_price], mode="markers",
+                                             marker=dict(symbol="x", size=12, color="#212529"), name="현재"))
+                gap_fig.update_layout(title="설명 안되는 마진 (gap_pct)", showlegend=False, height=380,
+                                      margin=dict(l=20, r=20, t=40, b=20),
+                                      xaxis=dict(title="제안가 ($/kg)"), yaxis=dict(title="시장 평균가 ($/kg)"))
+                st.plotly_chart(gap_fig, width="stretch")
+
+            shares = verdict_shares(codes)
+            st.caption(
+                f"전체 {codes.size:,}개 격자점 · "
+                + " · ".join(f"{VERDICTS[c]['icon']} {c} {share:.0%}" for c, share in zip(CASE_CODES, shares) if share > 0)
+                + f" · 화면 격자 {case_z.shape[1]}×{case_z.shape[0]}"
+            )
+
+
+@st.fragment
+def montecarlo_panel(market_avg_price, offer_price, supplier_avg_margin, market_trend, forecast_trend,
+                     risk_factors, opp_factors, forecast_price):
+    """6. 목표가 몬테카를로 시뮬레이션. 시뮬레이션 폼 제출은 이 섹션만 다시 실행합니다."""
+    with st.expander("🎲 목표가 몬테카를로 시뮬레이션 (Monte Carlo)"):
+        st.caption("시장 평균가와 예상 단가의 불확실성을 반영해 시나리오별 판정·목표가·절감액 분포를 봅니다.")
+        with st.form("mc_form"):
+            mc1, mc2, mc3 = st.columns(3)
+            market_vol = mc1.slider("시장가 변동성 (%)", 0, 50, 10)
+            forecast_vol = mc2.slider("예상 단가 변동성 (%)", 0, 50, 15)
+            n_scenarios = mc3.select_slider("시나리오 수", [100_000, 500_000, 1_000_000, 5_000_000],
+                                            value=100_000, format_func=lambda n: f"{n:,}")
+            mc4, mc5 = st.columns(2)
+            mc_seed = mc4.number_input("난수 시드 (Seed)", min_value=0, value=DEFAULT_SEED, step=1)
+            mc_workers = mc5.number_input("프로세스 수", min_value=1, max_value=default_workers(), value=1,
+                                          help="시나리오가 매우 많을 때 여러 프로세스로 나눠 계산합니다. 시드가 같으면 결과도 같습니다.")
+            mc_btn = st.form_submit_button("🎲 시뮬레이션 실행 (Simulate)")
+
+        if mc_btn:
+            mc_start = time.perf_counter()
+            sim = simulate_offer(market_avg_price, offer_price, supplier_avg_margin, market_trend, forecast_trend,
+                                 risk_factors, opp_factors, market_vol_pct=market_vol, forecast_price=forecast_price,
+                                 forecast_vol_pct=forecast_vol, n=n_scenarios, seed=int(mc_seed),
+                                 workers=int(mc_workers))
+            summary = summarize_simulation(sim, offer_price)
+            mc_elapsed = time.perf_counter() - mc_start
+
+            m1, m2, m3 = st.columns(3)
+            m1.metric("🎯 기대 목표가", f"${summary['target_mean']:.3f}")
+            m2.metric("💰 기대 절감액 (vs 제안가)", f"${summary['expected_savings']:.3f}/kg")
+            m3.metric("📉 절감 확률", f"{summary['p_savings']:.0%}")
+            st.caption(
+                f"목표가 5% / 50% / 95% 분위: ${summary['target_p5']:.3f} / ${summary['target_p50']:.3f} / "
+                f"${summary['target_p95']:.3f} · {summary['n']:,}개 시나리오 · {mc_elapsed * 1000:.0f} ms"
+            )
+            if forecast_price > 0:
+                st.caption(
+                    f"⏳ 대기(Wait) 시 기대 절감액 ${summary['wait_expected_savings']:.3f}/kg · "
+                    f"협상 목표가보다 대기가 유리할 확률 {summary['p_wait_better']:.0%}"
+                )
+
+            mc_col1, mc_col2 = st.columns(2)
+            with mc_col1:
+                shares = {c: v for c, v in summary["case_shares"].items() if v > 0}
+                share_fig = go.Figure(go.Bar(
+                    x=[f"{VERDICTS[c]['icon']} {c}" for c in shares], y=list(shares.values()),
+                    marker_color=[SWEEP_COLORS[c] for c in shares],
+                    text=[f"{v:.0%}" for v in shares.values()], textposition="auto",
+                ))
+                share_fig.update_layout(title="판정 분포", showlegend=False, height=320,
+                                        margin=dict(l=20, r=20, t=40, b=20), yaxis=dict(tickformat=".0%"))
+                st.plotly_chart(share_fig, width="stretch")
+            with mc_col2:
+                counts, edges = summary["target_hist"]
+                hist_fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                                            marker_color="#004e66"))
+                hist_fig.add_vline(x=offer_price, line_dash="dash", line_color="#dc3545",
+                                   annotation_text="제안가")
+                hist_fig.update_layout(title="목표가 분포", showlegend=False, height=320,
+                                       margin=dict(l=20, r=20, t=40, b=20),
+                                       xaxis=dict(title="목표가 ($/kg)"), yaxis=dict(title="시나리오 수"))
+                st.plotly_chart(hist_fig, width="stretch")
+
+
+# --- Tool 2 결과 섹션 ---
+@st.fragment
+def grade_card(result):
+    """종합 등급 카드."""
+    grade_title = result["title"]
+    grade_color = result["color"]
+    text_color = result["text_color"]
+    score = result["score"]
+
+    html = f"""
+    <div class="result-card" style="background-color: {grade_color}; border-left: 5px solid {text_color};">
+        <div class="verdict-header" style="color: {text_color};">{grade_title}</div>
+        <div class="verdict-sub" style="margin-bottom: 0;">종합 점수: <strong>{score} / 100</strong></div>
+    </div>
+    """
+    with span("grade_card", html):
+        st.markdown(html, unsafe_allow_html=True)
+
+
+@st.fragment
+def audit_details(volume_trend, buyer_tier, dependency):
+    """입체 분석 (Audit Details)."""
+    st.markdown("#### ✅ 입체 분석 (Audit Details)")
+    with span("audit_details", volume_trend + buyer_tier + dependency):
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.info(f"**📈 성장성**\n\n{volume_trend}")
+        with c2:
+            st.info(f"**🏆 평판**\n\n{buyer_tier}")
+        with c3:
+            risk_bg = "error" if "높음" in dependency else "success"
+            if risk_bg == "error":
+                st.error(f"**⚠️ 리스크**\n\n의존도 {dependency}")
+            else:
+                st.success(f"**🛡️ 리스크**\n\n의존도 {dependency}")
+
+
+@st.fragment
+def grade_strategy(strategy_title, strategy_desc):
+    """등급별 전략."""
+    st.markdown("---")
+    with span("grade_strategy", strategy_title + strategy_desc):
+        st.markdown(f"#### 🎯 전략: {strategy_title}")
+        st.write(strategy_desc)
+
+
+# --- 관리자 (Admin) ---
+def cache_admin():
+    """사이드바 관리자 섹션: 분석 캐시 적중/미스 현황과 (관리자 토큰 입력 시) 설정."""
+    with st.sidebar.expander("🛠️ 관리자 (Admin)"):
+        stats = ANALYSIS_CACHE.stats()
+        a1, a2 = st.columns(2)
+        a1.metric("캐시 적중", f"{stats['hits']:,}")
+        a2.metric("캐시 미스", f"{stats['misses']:,}")
+        st.caption(
+            f"적중률 {stats['hit_rate']:.0%} · 항목 {stats['size']}/{stats['max_entries']} · "
+            f"LRU 제거 {stats['evictions']:,} · 만료 {stats['expirations']:,}"
+        )
+        if not ADMIN_TOKEN:
+            st.caption("설정 변경은 EYEKIT_ADMIN_TOKEN 을 지정한 서버에서만 할 수 있습니다.")
+            return
+        token = st.text_input("관리자 토큰", type="password", key="admin_token")
+        if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+            return
+        max_entries = st.number_input("최대 항목 수", min_value=1, value=stats["max_entries"], step=64)
+        ttl = st.number_input("TTL (초, 0 = 무제한)", min_value=0, value=stats["ttl"], step=60)
+        if max_entries != stats["max_entries"] or ttl != stats["ttl"]:
+            ANALYSIS_CACHE.configure(max_entries=int(max_entries), ttl=int(ttl))
+        if st.button("캐시 비우기"):
+            ANALYSIS_CACHE.clear()
+
+
+def memory_admin():
+    """사이드바 메모리 섹션: 프로세스 상주 메모리와 컴포넌트별 크기 (켰을 때만 집계)."""
+    with st.sidebar.expander("🧠 메모리 (Memory)"):
+        memory = process_memory()
+        m1, m2 = st.columns(2)
+        m1.metric("프로세스 RSS", f"{memory['rss'] / 2**20:,.0f}MB")
+        m2.metric("최대 RSS", f"{memory['peak'] / 2**20:,.0f}MB")
+        if not st.toggle("컴포넌트별 집계", key="memory_admin",
+                         help="공유 객체와 세션별 일괄 결과의 크기를 추정합니다 (켜 둔 동안 재실행마다 계산)."):
+            return
+        usage = memory_ledger().usage()
+        rows = [{"컴포넌트": name, "객체": u["objects"], "세션": str(u["owners"]) if u["owners"] else "공유",
+                 "MB": round(u["bytes"] / 2**20, 2)} for name, u in usage.items()]
+        st.dataframe(rows, hide_index=True, width="stretch")
+        store = price_store()
+        if store is not None:
+            st.caption(f"시세 저장소 가격 배열은 파일 매핑(memmap, {store.prices.nbytes / 2**20:,.1f}MB)이라 "
+                       "프로세스 간에도 OS 페이지 캐시를 공유합니다.")
+        mine = memory_ledger().owner_bytes(session_owner())
+        st.caption(f"이 세션 일괄 결과 {mine / 2**20:,.1f}MB / 한도 {SESSION_LIMIT / 2**20:,.0f}MB "
+                   "(EYEKIT_SESSION_MB)")
+
+
+def debug_panel(trace):
+    """사이드바 디버그 섹션: 재실행 구간 계측 켜기, 구간표, cProfile 다운로드."""
+    with st.sidebar.expander("🐞 디버그 (Debug)"):
+        st.toggle("재실행 구간 계측", key="debug_trace",
+                  help="켜면 재실행마다 섹션별 소요 시간과 페이로드 크기를 기록합니다.")
+        if trace.spans:
+            st.dataframe(trace.spans, hide_index=True, width="stretch")
+            payload = sum(s["bytes"] or 0 for s in trace.spans)
+            st.caption(f"재실행 #{trace.rerun} · 합계 {trace.total_ms():.1f}ms · "
+                       f"페이로드 {payload:,} bytes · 로그 `{trace.log_path}`")
+
+        st.button("다음 재실행 프로파일링 (cProfile)",
+                  on_click=lambda: st.session_state.update(profile_next=True))
+        profile = st.session_state.get("rerun_profile")
+        if profile is not None:
+            prof_bytes, report = profile
+            st.download_button("⬇️ 프로파일 (.prof)", prof_bytes, file_name="rerun.prof",
+                               mime="application/octet-stream")
+            st.code(report, language=None)